@@ -0,0 +1,90 @@
+import argparse
+import logging
+import os
+import sys
+from os import path
+
+from src.classes.default_cam.MotionDetector import MotionDetector
+from src.classes.default_cam.VideoProcessor import VideoProcessor
+from src.classes.general.SyntheticSource import SyntheticSource
+from src.helpers.benchmark.BackgroundBenchmark import BackgroundBenchmark
+from src.helpers.benchmark.StageBenchmark import StageBenchmark, DEFAULT_RESOLUTIONS, DEFAULT_BLOB_COUNTS
+from src.helpers.evaluation.GroundTruth import GroundTruth
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def parse_resolution(value: str):
+    width, height = value.lower().split('x')
+    return int(width), int(height)
+
+
+def run_background(args):
+    """Сравнение моделей фона на видео или синтетических кадрах"""
+    benchmark = BackgroundBenchmark(args.engines, args.learning)
+
+    if args.video:
+        ground_truth = GroundTruth(args.ground_truth) if args.ground_truth else None
+        benchmark.run(lambda: VideoProcessor(args.video), ground_truth, args.frames)
+    else:
+        synthetic = SyntheticSource(frame_total=args.frames or 300)
+        output_dir = path.dirname(path.abspath(args.output))
+        os.makedirs(output_dir, exist_ok=True)
+        gt_path = path.join(output_dir, 'background_ground_truth.csv')
+        synthetic.write_ground_truth(gt_path)
+        benchmark.run(lambda: SyntheticSource(frame_total=args.frames or 300), GroundTruth(gt_path))
+
+    benchmark.save(args.output)
+    print(benchmark.format_table())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк стадий обработки")
+    parser.add_argument('--stages', nargs='+', choices=StageBenchmark.STAGES,
+                        default=list(StageBenchmark.STAGES))
+    parser.add_argument('--resolutions', nargs='+', type=parse_resolution,
+                        default=DEFAULT_RESOLUTIONS, help="Например: 848x480 1280x720")
+    parser.add_argument('--blobs', nargs='+', type=int, default=DEFAULT_BLOB_COUNTS)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--output', default=None,
+                        help="По умолчанию data/output/benchmarks/stages.json "
+                             "(background.json для --background)")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="Сравнить с предыдущим результатом и вернуть код 1 при регрессии")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Допустимый рост медианы при сравнении (доля)")
+    parser.add_argument('--background', action='store_true',
+                        help="Сравнить модели фона MotionDetector (время против качества маски)")
+    parser.add_argument('--engines', nargs='+', choices=MotionDetector.ENGINES, default=None)
+    parser.add_argument('--learning', nargs='+', choices=BackgroundBenchmark.LEARNING, default=None)
+    parser.add_argument('--video', help="Видео для --background (по умолчанию синтетика)")
+    parser.add_argument('--ground-truth', help="Разметка мяча для --video (CSV)")
+    parser.add_argument('--frames', type=int, default=None, help="Ограничение числа кадров")
+    args = parser.parse_args()
+
+    if args.background:
+        args.output = args.output or 'data/output/benchmarks/background.json'
+        run_background(args)
+        return
+
+    args.output = args.output or 'data/output/benchmarks/stages.json'
+    benchmark = StageBenchmark(iterations=args.iterations)
+    benchmark.run(args.stages, args.resolutions, args.blobs)
+    benchmark.save(args.output)
+
+    if args.compare:
+        rows = StageBenchmark.compare(args.compare, args.output, args.threshold)
+        regressions = [row for row in rows if row['regression']]
+        for row in rows:
+            mark = 'РЕГРЕССИЯ' if row['regression'] else ''
+            print(f"{row['stage']:9s} {row['resolution']:>9s} blobs={row['blobs']:3d} "
+                  f"{row['baseline_ms']:8.3f} -> {row['current_ms']:8.3f} ms "
+                  f"(x{row['ratio']:.2f}) {mark}")
+        if regressions:
+            logger.error(f"Обнаружено регрессий: {len(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+import argparse
+import logging
+
+from src.classes.depth_cam.FrameCacheBuilder import FrameCacheBuilder
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Конвертация bag-файла в кэш кадров (memmap)")
+    parser.add_argument('bag_file', help="Путь к bag-файлу")
+    parser.add_argument('--cache-dir', default='data/cache/frames',
+                        help="Корневой каталог кэша кадров")
+    args = parser.parse_args()
+
+    cache_dir = FrameCacheBuilder(args.cache_dir).build(args.bag_file)
+    logger.info(f"Готово. Укажите 'frame_cache_dir': '{args.cache_dir}' в конфигурации BagFileProcessor")
+    print(cache_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import logging
+import sys
+
+from src.classes.DepthCam import BagFileProcessor
+from src.classes.default_cam.VideoProcessor import VideoProcessor
+from src.classes.general.SyntheticSource import SyntheticSource
+from src.default_configs.default_cam_config import DEFAULT_CONFIG as DEFAULT_CAM_CONFIG
+from src.default_configs.depth_cam_config import DEFAULT_CONFIG as DEPTH_CAM_CONFIG
+from src.helpers.sync.ClockOffsetEstimator import ClockOffsetEstimator
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Оценка сдвига и дрейфа часов обычной камеры относительно камеры глубины")
+    parser.add_argument('--video', help="Видео обычной камеры")
+    parser.add_argument('--timestamps', default=DEFAULT_CAM_CONFIG['csv_file'],
+                        help="CSV временных меток видео (rs_hw_time)")
+    parser.add_argument('--bag', help="bag-файл камеры глубины")
+    parser.add_argument('--depth-roi', action='store_true',
+                        help="Считать слой дальностей только в ROI стола (по умолчанию весь кадр)")
+    parser.add_argument('--synthetic', type=int, default=0, metavar='FRAMES',
+                        help="Проверка на синтетике: часы камеры глубины сдвинуты на --synthetic-offset")
+    parser.add_argument('--synthetic-offset', type=float, default=250.0, help="Сдвиг синтетики, мс")
+    parser.add_argument('--tolerance', type=float, default=5.0,
+                        help="Допуск проверки на синтетике: ошибка поправки на всей записи, мс")
+    parser.add_argument('--step', type=float, default=5.0, help="Шаг общей сетки, мс")
+    parser.add_argument('--max-lag', type=float, default=2000.0, help="Максимальный сдвиг, мс")
+    parser.add_argument('--segment', type=float, default=30000.0, help="Длина сегмента для дрейфа, мс")
+    parser.add_argument('--output', default='data/output/clock_correction.json')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        default_source = SyntheticSource(frame_total=args.synthetic)
+        depth_source = SyntheticSource(frame_total=args.synthetic, start_timestamp=args.synthetic_offset)
+        timestamps_csv = None
+    elif args.video and args.bag:
+        default_source = VideoProcessor(args.video)
+        # Источник кадров глубины как у конвейера (кэш кадров или bag-файл)
+        depth_source = BagFileProcessor(args.bag).pipeline
+        timestamps_csv = args.timestamps
+    else:
+        parser.error("Нужны --video и --bag либо --synthetic")
+
+    estimator = ClockOffsetEstimator(args.step, args.max_lag, args.segment)
+    default_energy = estimator.motion_energy(default_source, DEFAULT_CAM_CONFIG,
+                                             timestamps_csv=timestamps_csv)
+    depth_energy = estimator.depth_slab_energy(
+        depth_source,
+        DEPTH_CAM_CONFIG['distance_min'],
+        DEPTH_CAM_CONFIG['distance_max'],
+        BagFileProcessor.DEFAULT_ROI_POLYGON if args.depth_roi else None
+    )
+
+    correction = estimator.estimate(depth_energy, default_energy)
+    correction.save(args.output)
+    print(f"Сдвиг: {correction.offset_ms:.1f} ms, дрейф: {correction.drift * 1e6:.1f} ppm")
+    print(f"Для применения: 'clock_correction': '{args.output}' в конфигах камер")
+
+    if args.synthetic:
+        # Регрессионная проверка: истинный сдвиг известен, дрейфа нет -
+        # ошибка поправки на первом и последнем кадре не больше допуска
+        timestamps = default_energy[0][[0, -1]]
+        errors = [correction.apply(correction.corrected, t) - (t + args.synthetic_offset)
+                  for t in timestamps]
+        error = max(abs(e) for e in errors)
+        print(f"Ошибка на синтетике: {error:.1f} ms (допуск {args.tolerance:.1f} ms)")
+        if error > args.tolerance:
+            logger.error(f"Ошибка поправки больше допуска: {error:.1f} > {args.tolerance:.1f} ms")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import logging
+import tempfile
+from os import path
+
+from src.classes.DefaultCam import DefaultCamProcessor
+from src.classes.DepthCam import BagFileProcessor
+from src.classes.general.SyntheticSource import SyntheticSource
+from src.default_configs.depth_cam_config import DEFAULT_CONFIG as DEPTH_DEFAULT_CONFIG
+from src.helpers.evaluation.Evaluator import Evaluator
+from src.helpers.evaluation.GroundTruth import GroundTruth
+from src.helpers.state.ThreadSafeSingleton import ThreadSafeSingleton
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Оценка точности и скорости по эталонной разметке")
+    parser.add_argument('--synthetic', type=int, default=0, metavar='FRAMES',
+                        help="Оценка на синтетических данных (разметка генерируется)")
+    parser.add_argument('--video', help="Видео обычной камеры")
+    parser.add_argument('--default-gt', help="Разметка для видео обычной камеры (CSV)")
+    parser.add_argument('--bag', help="bag-файл камеры глубины")
+    parser.add_argument('--depth-gt', help="Разметка для камеры глубины (CSV)")
+    parser.add_argument('--match-radius', type=float, default=15.0, help="Радиус совпадения, px")
+    parser.add_argument('--bounce-tolerance', type=float, default=100.0, help="Допуск касания, мс")
+    parser.add_argument('--output', default='data/output/evaluation/report.json')
+    args = parser.parse_args()
+
+    evaluator = Evaluator(args.match_radius, args.bounce_tolerance)
+    state = ThreadSafeSingleton()
+    report = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        default_config = {'display': False}
+        depth_config = {
+            'display': False,
+            'debug_video': path.join(workdir, 'depth_debug.mp4'),
+        }
+
+        default_source = depth_source = None
+        default_gt_path, depth_gt_path = args.default_gt, args.depth_gt
+        if args.synthetic:
+            default_source = SyntheticSource(frame_total=args.synthetic)
+            depth_source = SyntheticSource(frame_total=args.synthetic)
+            default_gt_path = depth_gt_path = path.join(workdir, 'ground_truth.csv')
+            # depth_visible - мяч в ROI и диапазоне расстояний камеры глубины
+            default_source.write_ground_truth(
+                default_gt_path, BagFileProcessor.DEFAULT_ROI_POLYGON,
+                (DEPTH_DEFAULT_CONFIG['distance_min'], DEPTH_DEFAULT_CONFIG['distance_max']))
+
+        if default_source is not None or (args.video and default_gt_path):
+            processor = DefaultCamProcessor(
+                args.video or 'synthetic',
+                path.join(workdir, 'default.mp4'),
+                path.join(workdir, 'default_mask.mp4'),
+                config=default_config,
+                source=default_source
+            )
+            report['default_cam'] = evaluator.evaluate_default_cam(
+                processor, GroundTruth(default_gt_path), state)
+
+        if depth_source is not None or (args.bag and depth_gt_path):
+            processor = BagFileProcessor(
+                args.bag or 'synthetic',
+                path.join(workdir, 'depth.mp4'),
+                path.join(workdir, 'detections.csv'),
+                config=depth_config,
+                source=depth_source
+            )
+            report['depth_cam'] = evaluator.evaluate_depth_cam(
+                processor, GroundTruth(depth_gt_path), state)
+
+    if not report:
+        parser.error("Укажите --synthetic или пары --video/--default-gt, --bag/--depth-gt")
+
+    Evaluator.save(report, args.output)
+    print(Evaluator.format_report(report))
+
+
+if __name__ == '__main__':
+    main()
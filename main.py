@@ -1,28 +1,86 @@
 import os
+import argparse
 from threading import Thread
 from src.classes.DefaultCam import *
 from src.classes.DepthCam import *
+from src.classes.general.DisplayCompositor import DisplayCompositor
+from src.classes.general.PreviewServer import PreviewServer
+from src.classes.general.SyntheticSource import SyntheticSource
 from src.helpers.state.ThreadSafeSingleton import *
+from src.helpers.metrics.MetricsRegistry import MetricsRegistry
 global test
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Трекинг мяча в настольном теннисе")
+    parser.add_argument('--synthetic', type=int, default=0, metavar='FRAMES',
+                        help="Использовать синтетический источник с заданным числом кадров "
+                             "вместо видео и bag-файла")
+    parser.add_argument('--live', action='store_true',
+                        help="Живой режим обычной камеры: захват в отдельном потоке, "
+                             "обрабатывается последний кадр")
+    parser.add_argument('--camera', default=None, metavar='INDEX',
+                        help="Индекс камеры вместо видеофайла (вместе с --live)")
+    parser.add_argument('--preview-port', type=int, default=None,
+                        help="Порт HTTP-сервера предпросмотра (MJPEG) для просмотра по сети")
+    parser.add_argument('--preview-fps', type=float, default=10.0,
+                        help="Частота кадров предпросмотра")
+    parser.add_argument('--preview-width', type=int, default=640,
+                        help="Максимальная ширина кадров предпросмотра, px")
+    parser.add_argument('--metrics-dir', default=None,
+                        help="Каталог для периодического экспорта метрик стадий "
+                             "(metrics.jsonl и metrics.prom)")
+    parser.add_argument('--metrics-interval', type=float, default=10.0,
+                        help="Период экспорта метрик, с")
+    parser.add_argument('--checkpoint-dir', default=None,
+                        help="Каталог контрольных точек (периодическое сохранение состояния, "
+                             "видео пишется сегментами)")
+    parser.add_argument('--checkpoint-interval', type=int, default=9000,
+                        help="Кадров между контрольными точками")
+    parser.add_argument('--resume', action='store_true',
+                        help="Продолжить с последних контрольных точек (--checkpoint-dir)")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     state = ThreadSafeSingleton()
-    # Проверяем наличие файла
 
+    metrics = MetricsRegistry()
+    if args.metrics_dir:
+        metrics.start_exporter(args.metrics_dir, args.metrics_interval)
+
+    # Синтетические источники (без камеры и входных файлов)
+    depth_source = SyntheticSource(frame_total=args.synthetic) if args.synthetic else None
+    default_source = SyntheticSource(frame_total=args.synthetic) if args.synthetic else None
+
+    # Проверяем наличие файла
     bag_file_path = "data/input/bag/test.bag"
-    if not os.path.exists(bag_file_path):
+    if depth_source is None and not os.path.exists(bag_file_path):
         logger.error(f"Файл {bag_file_path} не найден!")
         return
 
+    # Контрольные точки и возобновление (общие для обеих камер)
+    checkpoint_config = {
+        'checkpoint_dir': args.checkpoint_dir,
+        'checkpoint_interval': args.checkpoint_interval,
+        'resume': args.resume
+    }
+    if args.resume and not args.checkpoint_dir:
+        logger.error("--resume требует --checkpoint-dir")
+        return
+
     # Создаем процессор с кастомной конфигурацией
     config = {
         'distance_min': 0.8,
-        'distance_max': 2.44
+        'distance_max': 2.44,
+        **checkpoint_config
     }
 
-    processor = BagFileProcessor(bag_file_path, config=config)
+    processor = BagFileProcessor(bag_file_path, config=config, source=depth_source)
     processor.initialize()
 
-    video_path = 'data/input/videos/default_cam.mp4'
+    video_path = args.camera or 'data/input/videos/default_cam.mp4'
     output_path = 'data/output/videos/result_optimized.mp4'
     mask_output_path = 'data/output/videos/result_mask.mp4'
 
@@ -31,25 +89,50 @@ def main():
         'min_area': 20,
         'max_area': 500,
         'min_speed': 25.0,
-        'max_speed': 300.0
+        'max_speed': 300.0,
+        'live_capture': args.live,
+        **checkpoint_config
     }
 
     default_cam_process = DefaultCamProcessor(
         video_path,
         output_path,
         mask_output_path,
-        config=config_default_cam_process
+        config=config_default_cam_process,
+        source=default_source
     )
     default_cam_process.initialize()
 
+    # Единое окно отображения и клавиатура - в главном потоке
+    compositor = DisplayCompositor()
+    processor.compositor = compositor
+    default_cam_process.compositor = compositor
+
+    # Предпросмотр по сети
+    preview = None
+    if args.preview_port is not None:
+        preview = PreviewServer(port=args.preview_port, max_fps=args.preview_fps,
+                                max_width=args.preview_width)
+        preview.start()
+        processor.preview = preview
+        default_cam_process.preview = preview
+
     thread2 = Thread(target=processor.run, args=([state]))
     thread1 = Thread(target=default_cam_process.run, args=([state]))
 
 
     thread1.start()
     thread2.start()
+    compositor.run(until=lambda: not (thread1.is_alive() or thread2.is_alive()))
+
+    # Остановка: обычная камера может ждать камеру глубины
+    compositor.stop()
+    state.resume_all()
     thread1.join()
     thread2.join()
+    if preview is not None:
+        preview.stop()
+    metrics.stop_exporter()
     cv2.destroyAllWindows()
 
 
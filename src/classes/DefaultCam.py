@@ -1,4 +1,5 @@
 import cv2
+import time
 import numpy as np
 from os import path
 import logging
@@ -6,13 +7,23 @@ import logging
 
 from src.classes.general.VideoWriterManager import VideoWriterManager
 from src.classes.default_cam.VisualizationManager import VisualizationManager
-from src.classes.general.data.CameraConfig import CameraConfig
 from src.classes.default_cam.DetectionFilter import DetectionFilter
+from src.classes.default_cam.FFmpegVideoSource import FFmpegVideoSource
 from src.classes.default_cam.MotionDetector import MotionDetector
 from src.classes.default_cam.TimestampReader import TimestampReader
 from src.classes.default_cam.Tracker import Tracker
 from src.classes.default_cam.VideoProcessor import VideoProcessor
+from src.classes.general.ActivityGate import ActivityGate
+from src.classes.general.AdaptiveQualityController import AdaptiveQualityController
+from src.classes.general.FrameSource import FrameSource
+from src.classes.general.LatestFrameSource import LatestFrameSource
+from src.classes.general.SharedFrameRing import SharedFrameRing
+from src.classes.general.data.DetectionBatch import DetectionBatch
 from src.default_configs.default_cam_config import DEFAULT_CONFIG
+from src.helpers.metrics.MetricsRegistry import MetricsRegistry
+from src.helpers.state.CameraRole import CameraRole
+from src.helpers.state.CheckpointManager import CheckpointManager
+from src.helpers.sync.ClockCorrection import ClockCorrection
 
 parent_dir = path.dirname(path.abspath(__file__))
 
@@ -25,100 +36,319 @@ class DefaultCamProcessor:
     """Основной класс для обработки видео с обычной камеры"""
 
     def __init__(self, video_path: str, output_path: str, mask_output_path: str,
-                 config: dict = None):
+                 config: dict = None, source: FrameSource = None):
         self.video_path = video_path
         self.output_path = output_path
         self.mask_output_path = mask_output_path
         self.config = {**DEFAULT_CONFIG, **(config or {})}
 
+        # Таймеры стадий
+        self.timers = MetricsRegistry().timers(self.config['camera_name'])
+
+        # Имена окон и потоков предпросмотра (свои у каждой камеры стола)
+        stream_prefix = f"{self.config['table']} {self.config['camera_name']}"
+        self.tracking_stream = f"{stream_prefix}: Tracking"
+        self.mask_stream = f"{stream_prefix}: Mask"
+
         # Инициализация компонентов
-        self.video_processor = VideoProcessor(video_path)
-        config = CameraConfig(
-            width=self.video_processor.width,
-            height=self.video_processor.height,
-            fps=self.video_processor.fps,
-            depth_scale=0.0
-        )
+        self.source = source or self._create_source(video_path)
+        if self.config['live_capture']:
+            self.source = LatestFrameSource(self.source, pace=self.config['live_pace'],
+                                            timers=self.timers)
+        self.camera_config = self.source.initialize()
 
         self.video_writer = VideoWriterManager(
             output_path, mask_output_path,
-            config
+            self.camera_config
         )
         self.timestamp_reader = TimestampReader(self.config['csv_file'])
+        # Поправка часов к часам опорной камеры (calibrate_clocks.py)
+        self.clock_correction = None
+        if self.config['clock_correction']:
+            self.clock_correction = ClockCorrection.load(self.config['clock_correction'])
         self.motion_detector = MotionDetector(self.config)
         self.detection_filter = DetectionFilter(self.config)
         self.tracker = Tracker(self.config)
         self.visualization = VisualizationManager(
-            self.video_processor.width, self.video_processor.height
+            self.camera_config.width, self.camera_config.height,
+            self.config['render_buffers']
         )
 
-        self.paused = False
+        # Адаптивное качество при нехватке времени на кадр
+        self.quality = None
+        if self.config['adaptive_quality']:
+            self.quality = AdaptiveQualityController(
+                self.config['camera_name'],
+                self.config['quality_degradations'],
+                self.config['frame_budget_ms'] or 1000 / (self.camera_config.fps or 30),
+                self.config['quality_window'],
+                self.config['quality_headroom']
+            )
+
+        # Пропуск простоя между розыгрышами
+        self.activity_gate = None
+        if self.config['idle_skip']:
+            self.activity_gate = ActivityGate(
+                grid=self.config['idle_grid'],
+                threshold=self.config['idle_threshold'],
+                idle_frames=self.config['idle_frames'],
+                background_interval=self.config['idle_background_interval']
+            )
+        self._empty_batch = DetectionBatch(capacity=1)
+
+        # Обратный вызов после обработки кадра (для оценки качества)
+        self.on_frame = None
+
+        # Общее окно отображения (DisplayCompositor) и сервер предпросмотра
+        # (PreviewServer), задаются снаружи
+        self.compositor = None
+        self.preview = None
+
+        # Кольцо кадров в разделяемой памяти (создается в initialize)
+        self.ring = None
+
+        # Контрольные точки для возобновления долгих сессий
+        self.checkpoints = None
+        if self.config['checkpoint_dir']:
+            self.checkpoints = CheckpointManager(
+                self.config['checkpoint_dir'],
+                self.config['camera_name'],
+                self.config['checkpoint_interval']
+            )
+
+        self.frame_count = 0
+        # Число кадров с прошлого обновления трекера
+        self._frame_step = 1
+        self._last_mask = None
         logger.info(f"DefaultCamProcessor инициализирован для видео: {video_path}")
 
+    def _create_source(self, video_path: str) -> FrameSource:
+        """Источник кадров видео: cv2.VideoCapture или процесс ffmpeg"""
+        if self.config['video_decoder'] != 'ffmpeg':
+            return VideoProcessor(video_path)
+
+        if self.config['ffmpeg_pixel_format'] == 'gray' and self.config['color_prior']:
+            logger.warning("color_prior не применяется к серым кадрам (ffmpeg_pixel_format='gray')")
+        return FFmpegVideoSource.create(
+            video_path,
+            pixel_format=self.config['ffmpeg_pixel_format'],
+            scale=self.config['ffmpeg_scale'],
+            threads=self.config['ffmpeg_threads'],
+            buffer_count=self.config['ffmpeg_buffers'],
+            ffmpeg=self.config['ffmpeg_path']
+        )
+
     def initialize(self):
         """Инициализация всех компонентов"""
-        self.video_writer.initialize()
+        # Возобновление с контрольной точки (один раз, до первого кадра)
+        if self.config['resume'] and self.checkpoints is not None and self.frame_count == 0:
+            checkpoint = self.checkpoints.load()
+            if checkpoint is not None:
+                self._restore_checkpoint(checkpoint)
+        self.video_writer.initialize(self.video_writer.segment)
+
+        if self.config['shared_ring_name'] and self.ring is None:
+            self.ring = SharedFrameRing(
+                self.config['shared_ring_name'],
+                self.camera_config.width, self.camera_config.height,
+                slot_count=self.config['shared_ring_slots'],
+                max_detections=self.config['shared_ring_max_detections']
+            )
         logger.info("Все компоненты инициализированы")
 
     def process_frame(self, state) -> bool:
         """Обработка одного кадра"""
+        timers = self.timers
+        timers.begin_frame()
+
         # Чтение кадра
-        ret, frame = self.video_processor.read_frame()
-        if not ret:
+        frames = self.source.get_frames()
+        if frames is None:
             return False
-
-        # Получение временной метки
-        timestamp = self.timestamp_reader.get_timestamp(self.video_processor.frame_count - 1)
+        _, frame, source_timestamp = frames
+        self.frame_count += 1
+        timers.lap('decode')
+
+        # Получение временной метки (из CSV, иначе из источника;
+        # в живом режиме - всегда время захвата)
+        if self.timestamp_reader.timestamps and not self.config['live_capture']:
+            timestamp = self.timestamp_reader.get_timestamp(self.frame_count - 1)
+        else:
+            timestamp = source_timestamp
+        if self.clock_correction is not None:
+            timestamp = self.clock_correction.apply(self.config['camera_name'], timestamp)
 
         # Обновление состояния
         self._update_state(state, timestamp)
+        timers.lap('state')
+
+        # Простой между розыгрышами: дорогие стадии пропускаются
+        if self.activity_gate is not None and not self.activity_gate.update(
+                frame, self.frame_count - 1, timestamp):
+            self._process_idle_frame(frame, timestamp)
+            return True
+
+        # Пропуск кадра: детекции не ищутся, трекер интерполирует точки
+        if self._degraded(AdaptiveQualityController.SKIP_ALTERNATE_FRAMES) and self.frame_count % 2 == 0:
+            self._frame_step += 1
+            self._write_and_display(frame, self._last_mask)
+            self._end_frame()
+            return True
 
         # Запуск таймера для измерения производительности
         self.visualization.start_frame_timer()
 
         # Детекция движения
-        motion_mask = self.motion_detector.process_frame(frame)
+        scale = 1.0
+        if self._degraded(AdaptiveQualityController.DOWNSCALE_MOTION):
+            scale = self.config['motion_downscale']
+        motion_mask = self.motion_detector.process_frame(frame, scale)
+        self._last_mask = motion_mask
+        timers.lap('motion')
 
         # Поиск контуров
         contours, _ = cv2.findContours(motion_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        timers.lap('contours')
 
         # Фильтрация детекций
         detections = self.detection_filter.filter_contours(contours)
         is_touched = self._get_touched_state(state)
+        timers.lap('filter')
 
         # Трекинг
-        trajectories = self.tracker.update(detections)
-
-        # Визуализация
-        debug_frame = self.visualization.draw_detections(frame, detections, is_touched)
-        debug_frame = self.visualization.draw_trajectories(
-            debug_frame, trajectories, self.tracker.colors,
-        )
+        trajectories = self.tracker.update(detections, self._frame_step)
+        self._frame_step = 1
+        timers.lap('tracking')
+
+        # Публикация для внешних процессов
+        if self.ring is not None:
+            self.ring.publish(self.frame_count - 1, timestamp, frame, motion_mask, detections)
+            timers.lap('ring')
+
+        if self._degraded(AdaptiveQualityController.SKIP_DEBUG_RENDER):
+            self.visualization.end_frame_timer()
+            debug_frame = frame
+        else:
+            # Визуализация
+            debug_frame = self.visualization.draw_detections(frame, detections, is_touched)
+            debug_frame = self.visualization.draw_trajectories(
+                debug_frame, trajectories, self.tracker.colors,
+            )
 
-        # Измерение производительности
-        frame_time, current_fps, avg_fps, avg_time = self.visualization.end_frame_timer()
+            # Измерение производительности
+            frame_time, current_fps, avg_fps, avg_time = self.visualization.end_frame_timer()
 
-        # Добавление информационной панели
-        debug_frame = self.visualization.draw_info_panel(
-            debug_frame, self.video_processor.frame_count, frame_time,
-            current_fps, avg_fps, timestamp, state
-        )
+            # Добавление информационной панели
+            debug_frame = self.visualization.draw_info_panel(
+                debug_frame, self.frame_count, frame_time,
+                current_fps, avg_fps, timestamp, state.partner(self.config['camera_name'])
+            )
+        timers.lap('drawing')
 
-        # Запись результатов
-        self.video_writer.write(debug_frame, motion_mask)
+        self._write_and_display(debug_frame, motion_mask)
+        self._end_frame()
 
-        # Отображение
-        cv2.imshow('Tracking', debug_frame)
-        cv2.imshow('Mask', motion_mask)
+        if self.on_frame is not None:
+            self.on_frame(self.frame_count - 1, timestamp, detections, trajectories)
 
         return True
 
+    def _process_idle_frame(self, frame, timestamp: float):
+        """Кадр простоя: фон обновляется изредка, в видео - исходный кадр (маска не кодируется)"""
+        if self.activity_gate.background_due:
+            self._last_mask = self.motion_detector.process_frame(frame)
+        self._empty_batch.reset(self.frame_count - 1, timestamp)
+        trajectories = self.tracker.update(self._empty_batch)
+        self.timers.lap('idle')
+
+        self._write_and_display(frame, None)
+        self._end_frame()
+
+        if self.on_frame is not None:
+            self.on_frame(self.frame_count - 1, timestamp, self._empty_batch, trajectories)
+
+    def _save_checkpoint(self):
+        """Контрольная точка: закрытие сегмента видео и сохранение состояния"""
+        self.video_writer.rotate()
+        self.checkpoints.save(self.frame_count, {
+            'frame_step': self._frame_step,
+            'segment': self.video_writer.segment,
+            'frames_written': self.video_writer.frames_written,
+            'tracker': self.tracker.checkpoint_state(),
+            'activity_gate': self.activity_gate.checkpoint_state() if self.activity_gate else None
+        })
+
+    def _restore_checkpoint(self, checkpoint: dict):
+        """
+        Переход источника к кадру контрольной точки и восстановление состояния.
+
+        Модель фона и буферы frame differencing не сохраняются: они
+        восстанавливаются прогоном resume_warmup_frames кадров перед
+        контрольной точкой через детектор движения.
+        """
+        if self.config['live_capture']:
+            logger.warning("Живой режим не возобновляется с контрольной точки")
+            return
+
+        frame_count = checkpoint['frame_count']
+        warmup_start = max(frame_count - self.config['resume_warmup_frames'], 0)
+        self.source.seek_frame(warmup_start)
+        for _ in range(frame_count - warmup_start):
+            frames = self.source.get_frames()
+            if frames is None:
+                break
+            self.motion_detector.process_frame(frames[1])
+
+        self.frame_count = frame_count
+        self._frame_step = checkpoint['frame_step']
+        self.tracker.restore_state(checkpoint['tracker'])
+        if self.activity_gate is not None and checkpoint.get('activity_gate'):
+            self.activity_gate.restore_state(checkpoint['activity_gate'])
+        self.video_writer.segment = checkpoint['segment']
+        self.video_writer.frames_written = checkpoint['frames_written']
+        logger.info(f"Возобновление с кадра {frame_count} "
+                    f"(прогрев модели фона: {frame_count - warmup_start} кадров)")
+
+    def _degraded(self, degradation: str) -> bool:
+        """Включена ли деградация адаптивного качества"""
+        return self.quality is not None and self.quality.active(degradation)
+
+    def _write_and_display(self, frame, motion_mask):
+        """Запись результатов и отображение"""
+        timers = self.timers
+        if self._degraded(AdaptiveQualityController.SKIP_MASK_ENCODE):
+            motion_mask = None
+
+        # Запись результатов
+        self.video_writer.write(frame, motion_mask)
+        timers.lap('encode')
+
+        # Отправка в окно отображения (без ожидания GUI)
+        if self.config['display'] and self.compositor is not None:
+            self.compositor.post(self.tracking_stream, frame)
+            self.compositor.post(self.mask_stream, motion_mask)
+        if self.preview is not None:
+            self.preview.post(self.tracking_stream, frame)
+        timers.lap('display')
+
+    def _end_frame(self):
+        """Завершение кадра: полное время и адаптация качества"""
+        frame_time = self.timers.end_frame()
+        if self.quality is not None:
+            self.quality.update(frame_time)
+
+    def _camera(self, state):
+        """Состояние этой камеры в реестре (регистрируется при первом обращении)"""
+        return state.register_camera(self.config['camera_name'], CameraRole.COLOR,
+                                     self.config['table'])
+
     def _get_touched_state(self, state):
-        return state.get_touched_state_depth_cam()
+        partner = state.partner(self.config['camera_name'])
+        return partner is not None and partner.touched_state()
 
     def _update_state(self, state, timestamp: float):
         """Обновление состояния синхронизации"""
-        state.set_timestamp_default_cam(timestamp)
+        self._camera(state).set_timestamp(timestamp)
 
         # if hasattr(state, 'get_timestamp_depth_cam'):
         #     if (timestamp - state.get_timestamp_depth_cam() < 0):
@@ -128,34 +358,27 @@ class DefaultCamProcessor:
         #         if hasattr(state, 'resume_depth_cam'):
         #             state.resume_depth_cam()
 
-    def handle_keyboard(self) -> bool:
-        """Обработка клавиатуры"""
-        key = cv2.waitKey(30) & 0xFF
-
-        if key == 27:  # ESC
-            return False
-        elif key == ord('p') or key == ord('P'):
-            self.paused = not self.paused
-            logger.info(f"Пауза: {'включена' if self.paused else 'выключена'}")
-
-        return True
-
     def run(self, state):
         """Основной цикл обработки"""
         try:
             self.initialize()
             logger.info("Запуск обработки видео...")
+            camera = self._camera(state)
 
-            while True:
-                state.get_event_default_cam().wait()
+            while not (self.compositor and self.compositor.stop_requested.is_set()):
+                camera.wait()
 
-                if not self.paused:
-                    if not self.process_frame(state):
-                        break
+                # Пауза (клавиша p в окне отображения)
+                if self.compositor and self.compositor.paused:
+                    time.sleep(0.03)
+                    continue
 
-                if not self.handle_keyboard():
+                if not self.process_frame(state):
                     break
 
+                if self.checkpoints is not None and self.checkpoints.due(self.frame_count):
+                    self._save_checkpoint()
+
         except KeyboardInterrupt:
             logger.info("Обработка прервана пользователем")
         except Exception as e:
@@ -168,8 +391,12 @@ class DefaultCamProcessor:
         """Очистка ресурсов"""
         logger.info("Очистка ресурсов...")
 
-        self.video_processor.release()
+        self.source.stop()
         self.video_writer.release()
+        if self.ring is not None:
+            self.ring.close()
+        if self.activity_gate is not None:
+            self.activity_gate.save(path.splitext(self.output_path)[0] + '_idle.csv')
         # cv2.destroyAllWindows()
 
         # Вывод статистики
@@ -183,7 +410,7 @@ class DefaultCamProcessor:
 
             print(f"\n{'=' * 50}")
             print("ОБРАБОТКА ЗАВЕРШЕНА")
-            print(f"Обработано кадров: {self.video_processor.frame_count}")
+            print(f"Обработано кадров: {self.frame_count}")
             print(f"Среднее время на кадр: {avg_frame_time:.2f} ms")
             print(f"Средний FPS обработки: {avg_fps:.1f}")
             print(f"Создано траекторий: {self.tracker.next_id}")
@@ -1,14 +1,25 @@
-import numpy as np
 import cv2
+import numpy as np
+import time
 from os import path
 import logging
 
-from src.classes.depth_cam.RealsensePipeline import RealsensePipeline
+from src.classes.depth_cam.CachedFramePipeline import CachedFramePipeline
+from src.classes.depth_cam.FrameCacheBuilder import FrameCacheBuilder
+from src.classes.general.ActivityGate import ActivityGate
+from src.classes.general.AdaptiveQualityController import AdaptiveQualityController
+from src.classes.general.FrameSource import FrameSource
+from src.classes.general.SharedFrameRing import SharedFrameRing
+from src.classes.general.data.DetectionBatch import DetectionBatch
 from src.classes.general.VideoWriterManager import VideoWriterManager
-from src.classes.depth_cam.CSVWriter import CSVWriter
+from src.classes.depth_cam.DetectionSink import DetectionSink
 from src.classes.depth_cam.DetectionProcessor import DetectionProcessor
 from src.classes.depth_cam.VisualizationOverlay import VisualizationOverlay
 from src.default_configs.depth_cam_config import DEFAULT_CONFIG
+from src.helpers.metrics.MetricsRegistry import MetricsRegistry
+from src.helpers.state.CameraRole import CameraRole
+from src.helpers.state.CheckpointManager import CheckpointManager
+from src.helpers.sync.ClockCorrection import ClockCorrection
 
 parent_dir = path.dirname(path.abspath(__file__))
 
@@ -20,8 +31,17 @@ logger = logging.getLogger(__name__)
 class BagFileProcessor:
     """Основной класс для обработки bag-файлов"""
 
+    # ROI полигон стола в координатах кадра глубины
+    DEFAULT_ROI_POLYGON = np.array([
+        [93, 298],
+        [306, 270],
+        [575, 270],
+        [785, 293]
+    ], dtype=np.int32)
+
     def __init__(self, bag_file_path: str, output_video_name: str = None,
-                 output_csv_name: str = None, config: dict = None):
+                 output_csv_name: str = None, config: dict = None,
+                 source: FrameSource = None):
         self.bag_file_path = bag_file_path
         self.config = {**DEFAULT_CONFIG, **(config or {})}
 
@@ -31,38 +51,115 @@ class BagFileProcessor:
         if output_csv_name:
             self.config['csv_file'] = output_csv_name
 
+        # Имена окон и потоков предпросмотра (свои у каждой камеры стола)
+        stream_prefix = f"{self.config['table']} {self.config['camera_name']}"
+        self.processed_stream = f"{stream_prefix}: Processed"
+        self.debug_stream = f"{stream_prefix}: Debug Mask"
+
         # ROI полигон (можно вынести в конфиг)
-        self.roi_polygon = np.array([
-            [93, 298],
-            [306, 270],
-            [575, 270],
-            [785, 293]
-        ], dtype=np.int32)
+        self.roi_polygon = self.DEFAULT_ROI_POLYGON.copy()
+
+        # Поправка часов (камера глубины - опорная, для нее поправка тождественная)
+        self.clock_correction = None
+        if self.config['clock_correction']:
+            self.clock_correction = ClockCorrection.load(self.config['clock_correction'])
 
         # Инициализация компонентов
-        self.pipeline = RealsensePipeline(bag_file_path)
+        self.pipeline = source or self._create_pipeline()
         self.detection_processor = DetectionProcessor(
             self.config['distance_min'],
             self.config['distance_max'],
             self.config['min_contour_area'],
-            self.config['min_valid_depth_points']
+            self.config['min_valid_depth_points'],
+            self.config['render_buffers']
         )
 
         # Будут инициализированы позже
         self.video_writer = None
-        self.csv_writer = None
+        self.detection_sink = None
         self.visualization = None
         self.camera_config = None
+        self.quality = None
+        self.ring = None
+
+        # Пропуск простоя между розыгрышами (по глубине в ROI)
+        self.activity_gate = None
+        if self.config['idle_skip']:
+            self.activity_gate = ActivityGate(
+                roi=cv2.boundingRect(self.roi_polygon),
+                grid=self.config['idle_grid'],
+                threshold=self.config['idle_threshold'],
+                sum_threshold=self.config['idle_sum_threshold'],
+                idle_frames=self.config['idle_frames'],
+                background_interval=self.config['idle_background_interval']
+            )
+        self._empty_batch = DetectionBatch(capacity=1)
+
+        # Таймеры стадий
+        self.timers = MetricsRegistry().timers(self.config['camera_name'])
+
+        # Контрольные точки для возобновления долгих сессий
+        self.checkpoints = None
+        if self.config['checkpoint_dir']:
+            self.checkpoints = CheckpointManager(
+                self.config['checkpoint_dir'],
+                self.config['camera_name'],
+                self.config['checkpoint_interval']
+            )
+
+        # Обратный вызов после обработки кадра (для оценки качества)
+        self.on_frame = None
+
+        # Общее окно отображения (DisplayCompositor) и сервер предпросмотра
+        # (PreviewServer), задаются снаружи
+        self.compositor = None
+        self.preview = None
 
         self.frame_count = 0
         self.total_detections = 0
 
+    def _create_pipeline(self) -> FrameSource:
+        """Выбор источника кадров: кэш кадров или bag-файл"""
+        cache_root = self.config['frame_cache_dir']
+        if cache_root:
+            builder = FrameCacheBuilder(cache_root)
+            if self.config['build_frame_cache']:
+                return CachedFramePipeline(builder.build(self.bag_file_path))
+
+            cache_dir = builder.find(self.bag_file_path)
+            if cache_dir is not None:
+                return CachedFramePipeline(cache_dir)
+            logger.info("Кэш кадров не найден, читаю bag-файл")
+
+        # Импорт здесь: при работе из кэша pyrealsense2 не нужен
+        from src.classes.depth_cam.BagReader import BagReader
+        return BagReader(self.bag_file_path)
+
     def initialize(self):
         """Инициализация всех компонентов"""
         logger.info(f"Начинаю обработку {self.bag_file_path}...")
 
         # Инициализация конвейера
         self.camera_config = self.pipeline.initialize()
+        self.detection_processor.set_intrinsics(self.camera_config.intrinsics)
+
+        # Переход к начальной позиции (для отладки отдельных розыгрышей)
+        if self.config['start_frame'] is not None:
+            self.frame_count = self.pipeline.seek_frame(self.config['start_frame'])
+        elif self.config['start_time'] is not None:
+            self.frame_count = self.pipeline.seek_time(self.config['start_time'])
+
+        # Возобновление с контрольной точки
+        checkpoint = None
+        if self.config['resume'] and self.checkpoints is not None:
+            checkpoint = self.checkpoints.load()
+        if checkpoint is not None:
+            self.frame_count = self.pipeline.seek_frame(checkpoint['frame_count'])
+            self.total_detections = checkpoint['total_detections']
+            self.detection_processor.restore_state(checkpoint['detection_processor'])
+            if self.activity_gate is not None and checkpoint.get('activity_gate'):
+                self.activity_gate.restore_state(checkpoint['activity_gate'])
+            logger.info(f"Возобновление с кадра {self.frame_count}")
 
         # Инициализация видеозаписи
         self.video_writer = VideoWriterManager(
@@ -70,11 +167,18 @@ class BagFileProcessor:
             self.config['debug_video'],
             self.camera_config
         )
-        self.video_writer.initialize()
-
-        # Инициализация CSV записи
-        self.csv_writer = CSVWriter(self.config['csv_file'])
-        self.csv_writer.initialize()
+        if checkpoint is not None:
+            self.video_writer.frames_written = checkpoint['frames_written']
+        self.video_writer.initialize(checkpoint['segment'] if checkpoint is not None else 0)
+
+        # Инициализация буферизованной записи детекций
+        self.detection_sink = DetectionSink(
+            self.config['csv_file'],
+            self.config['output_format'],
+            self.config['sink_block_size'],
+            self.config['sink_flush_interval']
+        )
+        self.detection_sink.initialize(checkpoint['sink'] if checkpoint is not None else None)
 
         # Инициализация визуализации
         self.visualization = VisualizationOverlay(
@@ -83,59 +187,135 @@ class BagFileProcessor:
             self.roi_polygon
         )
 
+        # Кольцо кадров в разделяемой памяти для внешних процессов
+        if self.config['shared_ring_name'] and self.ring is None:
+            self.ring = SharedFrameRing(
+                self.config['shared_ring_name'],
+                self.camera_config.width, self.camera_config.height,
+                has_depth=True,
+                slot_count=self.config['shared_ring_slots'],
+                max_detections=self.config['shared_ring_max_detections']
+            )
+
+        # Адаптивное качество при нехватке времени на кадр
+        if self.config['adaptive_quality']:
+            self.quality = AdaptiveQualityController(
+                self.config['camera_name'],
+                self.config['quality_degradations'],
+                self.config['frame_budget_ms'] or 1000 / (self.camera_config.fps or 30),
+                self.config['quality_window'],
+                self.config['quality_headroom']
+            )
+
         logger.info("Инициализация завершена")
 
     def process_frame(self, state) -> bool:
         """Обработка одного кадра"""
+        timers = self.timers
+        timers.begin_frame()
         try:
             # Получение кадров
-            depth_frame, color_frame, timestamp = self.pipeline.get_frames()
+            frames = self.pipeline.get_frames()
+            if frames is None:
+                logger.info("Обработка завершена (конец файла)")
+                return False
+            depth_image, color_image, timestamp = frames
+            if self.clock_correction is not None:
+                timestamp = self.clock_correction.apply(self.config['camera_name'], timestamp)
 
-            if not depth_frame or not color_frame:
+            if depth_image is None or color_image is None:
                 logger.warning("Пропускаю кадр: отсутствуют данные глубины или цвета")
                 return True
 
+            timers.lap('decode')
+
+            # Простой между розыгрышами: детекция и отрисовка пропускаются
+            if self.activity_gate is not None and not self.activity_gate.update(
+                    depth_image, self.frame_count, timestamp):
+                self._process_idle_frame(state, color_image, timestamp)
+                self.frame_count += 1
+                return True
+
+            # Пропуск кадра: без детекции, состояние касания сохраняется
+            if self._degraded(AdaptiveQualityController.SKIP_ALTERNATE_FRAMES) and self.frame_count % 2 == 1:
+                self._camera(state).set_timestamp(timestamp)
+                self.video_writer.write(color_image)
+                timers.lap('encode')
+                if self.config['display']:
+                    self._display_frames(color_image, None)
+                if self.preview is not None:
+                    self.preview.post(self.processed_stream, color_image)
+                timers.lap('display')
+                self._end_frame()
+                self.frame_count += 1
+                return True
+
             # Конвертация кадров
-            color_image = np.asanyarray(color_frame.get_data())
-            depth_image = np.asanyarray(depth_frame.get_data())
             depth_meters = depth_image.astype(float) * self.camera_config.depth_scale
+            timers.lap('convert')
 
-            # Обработка детекций
-            processed_frame, detections, debug_frame = self.detection_processor.process(
+            # Обработка детекций (одно чтение часов на кадр)
+            wall_time = time.time()
+            processed_frame, detections, debug_frame, distance_mask = self.detection_processor.process(
                 color_image, depth_meters, self.roi_polygon,
-                self.frame_count, timestamp
+                self.frame_count, timestamp, wall_time
             )
+            timers.lap('detection')
+
+            # Публикация для внешних процессов
+            if self.ring is not None:
+                self.ring.publish(self.frame_count, timestamp, color_image,
+                                  distance_mask, detections, depth_image)
+                timers.lap('ring')
 
             # Визуализация
-            processed_frame = self.visualization.add_roi_overlay(processed_frame)
+            render = not self._degraded(AdaptiveQualityController.SKIP_DEBUG_RENDER)
+            if render:
+                processed_frame = self.visualization.add_roi_overlay(processed_frame)
 
             is_touched = True if detections else False
 
             # Обновление состояния
+            timers.lap('overlay')
             self._update_state(state, timestamp, is_touched)
+            timers.lap('state')
 
             # Добавление информационной панели
-            info = {
-                "Frame": self.frame_count,
-                "Time": f"{timestamp:.0f} ms",
-                "Detections": len(detections),
-                f"Range ({self.config['distance_min']}-{self.config['distance_max']}m)": "",
-                "Frame diff": f"{timestamp - state.get_timestamp_default_cam():.0f} ms",
-                "Default cam state": state.get_paused_default_cam()
-            }
-            processed_frame = self.visualization.add_info_panel(processed_frame, info)
+            if render:
+                partner = state.partner(self.config['camera_name'])
+                info = {
+                    "Frame": self.frame_count,
+                    "Time": f"{timestamp:.0f} ms",
+                    "Detections": len(detections),
+                    f"Range ({self.config['distance_min']}-{self.config['distance_max']}m)": "",
+                }
+                if partner is not None:
+                    info["Frame diff"] = f"{timestamp - partner.get_timestamp():.0f} ms"
+                    info[f"{partner.camera_id} paused"] = partner.paused
+                processed_frame = self.visualization.add_info_panel(processed_frame, info)
+            timers.lap('drawing')
 
             # Запись детекций
-            for detection in detections:
-                self.csv_writer.write_detection(detection)
-                self.total_detections += 1
-
+            self.detection_sink.write_frame(detections, wall_time)
+            self.total_detections += len(detections)
+            timers.lap('sink')
 
             # Запись видео
+            if self._degraded(AdaptiveQualityController.SKIP_MASK_ENCODE):
+                debug_frame = None
             self.video_writer.write(processed_frame, debug_frame)
+            timers.lap('encode')
 
             # Отображение (для отладки)
-            self._display_frames(processed_frame, debug_frame)
+            if self.config['display']:
+                self._display_frames(processed_frame, debug_frame)
+            if self.preview is not None:
+                self.preview.post(self.processed_stream, processed_frame)
+            timers.lap('display')
+            self._end_frame()
+
+            if self.on_frame is not None:
+                self.on_frame(self.frame_count, timestamp, detections)
 
             # Логирование прогресса
             if self.frame_count % 30 == 0 and self.frame_count > 0:
@@ -152,39 +332,92 @@ class BagFileProcessor:
                 logger.error(f"Ошибка при обработке кадра: {e}")
                 raise
 
+    def _process_idle_frame(self, state, color_image, timestamp):
+        """Кадр простоя: состояние обновляется, в видео - исходный кадр (маска не кодируется)"""
+        timers = self.timers
+        self._update_state(state, timestamp, False)
+        self._empty_batch.reset(self.frame_count, timestamp)
+        timers.lap('idle')
+
+        self.video_writer.write(color_image)
+        timers.lap('encode')
+        if self.config['display']:
+            self._display_frames(color_image, None)
+        if self.preview is not None:
+            self.preview.post(self.processed_stream, color_image)
+        timers.lap('display')
+        self._end_frame()
+
+        if self.on_frame is not None:
+            self.on_frame(self.frame_count, timestamp, self._empty_batch)
+
+    def _save_checkpoint(self):
+        """Контрольная точка: сброс детекций, закрытие сегмента видео, состояние"""
+        sink_state = self.detection_sink.checkpoint()
+        self.video_writer.rotate()
+        self.checkpoints.save(self.frame_count, {
+            'segment': self.video_writer.segment,
+            'frames_written': self.video_writer.frames_written,
+            'sink': sink_state,
+            'total_detections': self.total_detections,
+            'detection_processor': self.detection_processor.checkpoint_state(),
+            'activity_gate': self.activity_gate.checkpoint_state() if self.activity_gate else None
+        })
+
+    def _degraded(self, degradation: str) -> bool:
+        """Включена ли деградация адаптивного качества"""
+        return self.quality is not None and self.quality.active(degradation)
+
+    def _end_frame(self):
+        """Завершение кадра: полное время и адаптация качества"""
+        frame_time = self.timers.end_frame()
+        if self.quality is not None:
+            self.quality.update(frame_time)
+
+    def _camera(self, state):
+        """Состояние этой камеры в реестре (регистрируется при первом обращении)"""
+        return state.register_camera(self.config['camera_name'], CameraRole.DEPTH,
+                                     self.config['table'])
+
     def _update_state(self, state, timestamp, is_touch = False):
         """Обновление состояния синхронизации"""
-        state.set_timestamp_depth_cam(timestamp)
-
-        if is_touch:
-            state.set_touched_depth_cam(True)
-        else:
-            state.set_touched_depth_cam(False)
-
-        if (timestamp - state.get_timestamp_default_cam() < 0):
-            state.pause_default_cam()
+        camera = self._camera(state)
+        camera.set_timestamp(timestamp)
+        camera.set_touched(is_touch)
+
+        # Обычная камера стола ждет, пока глубина ее не догонит
+        partner = state.partner(camera.camera_id)
+        if partner is None:
+            return
+        if (timestamp - partner.get_timestamp() < 0):
+            partner.pause()
         else:
-            state.resume_default_cam()
+            partner.resume()
 
     def _display_frames(self, processed_frame, debug_frame):
-        """Отображение кадров для отладки"""
-        cv2.imshow('Processed', processed_frame)
-        cv2.imshow('Debug Mask', debug_frame)
-
-        # Проверка нажатия клавиши для выхода
-        key = cv2.waitKey(1) & 0xFF
-        if key == ord('q'):
-            raise KeyboardInterrupt()
+        """Отправка кадров в окно отображения (без ожидания GUI)"""
+        if self.compositor is not None:
+            self.compositor.post(self.processed_stream, processed_frame)
+            self.compositor.post(self.debug_stream, debug_frame)
 
     def run(self, state):
         """Основной цикл обработки"""
         try:
             logger.info("Запуск обработки...")
-            while True:
+            while not (self.compositor and self.compositor.stop_requested.is_set()):
                 # state.get_event_depth_cam().wait()
+
+                # Пауза (клавиша p в окне отображения)
+                if self.compositor and self.compositor.paused:
+                    time.sleep(0.03)
+                    continue
+
                 if not self.process_frame(state):
                     break
 
+                if self.checkpoints is not None and self.checkpoints.due(self.frame_count):
+                    self._save_checkpoint()
+
 
         except KeyboardInterrupt:
             logger.info("Обработка прервана пользователем")
@@ -204,8 +437,14 @@ class BagFileProcessor:
         if self.video_writer:
             self.video_writer.release()
 
-        if self.csv_writer:
-            self.csv_writer.close()
+        if self.detection_sink:
+            self.detection_sink.close()
+
+        if self.ring:
+            self.ring.close()
+
+        if self.activity_gate:
+            self.activity_gate.save(path.splitext(self.config['csv_file'])[0] + '_idle.csv')
 
         # cv2.destroyAllWindows()
 
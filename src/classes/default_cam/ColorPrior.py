@@ -0,0 +1,99 @@
+import cv2
+import numpy as np
+from os import path
+from typing import Sequence
+import logging
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ColorPrior:
+    """
+    Предварительный фильтр по цвету мяча.
+
+    Таблица на квантованный куб BGR (2^bits уровней на канал) строится один
+    раз: центр каждой ячейки переводится в HSV и проверяется по диапазонам
+    цветов мяча. На кадре цвет пикселя превращается в индекс ячейки и
+    берется из таблицы - без cvtColor и inRange на каждом кадре. Маска цвета
+    накладывается (AND) на маску движения, и движущиеся не-мячи (руки,
+    ракетки, одежда) не доходят до поиска контуров.
+    """
+
+    def __init__(self, hsv_ranges: Sequence[Sequence[Sequence[int]]], bits: int = 5):
+        if not 1 <= bits <= 5:
+            # Индекс ячейки (3 * bits бит) должен помещаться в uint16
+            raise ValueError(f"color_prior_bits должен быть от 1 до 5: {bits}")
+        self.bits = bits
+        shift = 8 - bits
+
+        self.table = self._build_table(hsv_ranges, bits)
+
+        # cv2.LUT работает по каналам: каждый канал дает свой вклад в индекс
+        # ячейки (b << 2*bits, g << bits, r), сумма вкладов - индекс
+        levels = np.arange(256, dtype=np.uint16) >> shift
+        self._channel_lut = np.stack(
+            [levels << (2 * bits), levels << bits, levels], axis=-1
+        ).reshape(1, 256, 3)
+        self._sum = np.ones((1, 3), dtype=np.float32)
+
+        # Плоские буферы (растут по необходимости; кадр и его части берут
+        # непрерывное начало буфера)
+        self._contributions = np.empty(0, dtype=np.uint16)
+        self._index = np.empty(0, dtype=np.uint16)
+        self._mask = np.empty(0, dtype=np.uint8)
+
+        logger.info(f"Цветовой фильтр: {len(hsv_ranges)} диапазонов HSV, "
+                    f"{np.count_nonzero(self.table)}/{self.table.size} ячеек BGR")
+
+    @staticmethod
+    def _build_table(hsv_ranges: Sequence[Sequence[Sequence[int]]], bits: int) -> np.ndarray:
+        """Таблица 0/255 на 2^(3*bits) ячеек BGR по диапазонам HSV"""
+        levels = 1 << bits
+        shift = 8 - bits
+        centers = (np.arange(levels, dtype=np.uint16) << shift) + ((1 << shift) >> 1)
+
+        b, g, r = np.meshgrid(centers, centers, centers, indexing='ij')
+        cube = np.stack([b, g, r], axis=-1).astype(np.uint8).reshape(-1, 1, 3)
+        hsv = cv2.cvtColor(cube, cv2.COLOR_BGR2HSV)
+
+        table = np.zeros(len(cube), dtype=np.uint8)
+        for lower, upper in hsv_ranges:
+            table |= cv2.inRange(hsv, np.array(lower), np.array(upper)).reshape(-1)
+        return table
+
+    def likelihood(self, frame: np.ndarray) -> np.ndarray:
+        """Маска цвета мяча (0/255) для BGR кадра, буфер переиспользуется"""
+        height, width = frame.shape[:2]
+        size = height * width
+        if self._mask.size < size:
+            self._contributions = np.empty(size * 3, dtype=np.uint16)
+            self._index = np.empty(size, dtype=np.uint16)
+            self._mask = np.empty(size, dtype=np.uint8)
+        contributions = self._contributions[:size * 3].reshape(height, width, 3)
+        index = self._index[:size].reshape(height, width)
+        mask = self._mask[:size].reshape(height, width)
+
+        cv2.LUT(frame, self._channel_lut, dst=contributions)
+        cv2.transform(contributions, self._sum, dst=index)
+        np.take(self.table, index, out=mask)
+        return mask
+
+    def apply(self, frame: np.ndarray, motion_mask: np.ndarray) -> np.ndarray:
+        """
+        Маска движения AND маска цвета.
+
+        Цвет проверяется только в ограничивающем прямоугольнике движения,
+        маска изменяется на месте.
+        """
+        x, y, w, h = cv2.boundingRect(motion_mask)
+        if w == 0 or h == 0:
+            return motion_mask
+
+        region = motion_mask[y:y + h, x:x + w]
+        cv2.bitwise_and(region, self.likelihood(frame[y:y + h, x:x + w]), dst=region)
+        return motion_mask
+
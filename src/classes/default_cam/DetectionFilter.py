@@ -4,7 +4,7 @@ from os import path
 from typing import List, Tuple, Optional
 import logging
 
-from src.classes.default_cam.data.Detection import Detection
+from src.classes.general.data.DetectionBatch import DetectionBatch
 from src.default_configs.default_cam_config import DEFAULT_CONFIG
 
 parent_dir = path.dirname(path.abspath(__file__))
@@ -19,19 +19,24 @@ class DetectionFilter:
     def __init__(self, config: dict = None):
         self.config = {**DEFAULT_CONFIG, **(config or {})}
 
-    def filter_contours(self, contours: List[np.ndarray]) -> List[Detection]:
-        """Фильтрация контуров по различным критериям"""
-        filtered_detections = []
+        # Переиспользуемый пакет детекций
+        self.batch = DetectionBatch()
+
+    def filter_contours(self, contours: List[np.ndarray]) -> DetectionBatch:
+        """
+        Фильтрация контуров по различным критериям
+
+        Возвращаемый пакет переиспользуется на следующем кадре.
+        """
+        self.batch.reset()
 
         for contour in contours:
-            detection = self._process_contour(contour)
-            if detection:
-                filtered_detections.append(detection)
+            self._process_contour(contour, self.batch)
 
-        return filtered_detections
+        return self.batch
 
-    def _process_contour(self, contour: np.ndarray) -> Optional[Detection]:
-        """Обработка отдельного контура"""
+    def _process_contour(self, contour: np.ndarray, batch: DetectionBatch) -> Optional[int]:
+        """Обработка отдельного контура, возвращает индекс детекции в пакете"""
         # Фильтр по площади
         area = cv2.contourArea(contour)
         if not (self.config['min_area'] <= area <= self.config['max_area']):
@@ -50,12 +55,12 @@ class DetectionFilter:
         if center is None:
             return None
 
-        return Detection(
+        return batch.append(
             center=center,
-            contour=contour,
+            box=(x, y, w, h),
             area=area,
-            bounding_box=(x, y, w, h),
-            aspect_ratio=aspect_ratio
+            aspect_ratio=aspect_ratio,
+            rect=cv2.minAreaRect(contour)
         )
 
     def _calculate_aspect_ratio(self, width: int, height: int) -> float:
@@ -0,0 +1,168 @@
+import cv2
+import shutil
+import subprocess
+import numpy as np
+from os import path
+from typing import Optional, Tuple
+import logging
+
+from src.classes.default_cam.VideoProcessor import VideoProcessor
+from src.classes.general.FrameSource import FrameSource, Frames
+from src.classes.general.data.CameraConfig import CameraConfig
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FFmpegVideoSource(FrameSource):
+    """
+    Декодирование видео процессом ffmpeg в сырые кадры.
+
+    ffmpeg сразу отдает кадры нужного формата (gray - без декодирования
+    цвета и cvtColor в MotionDetector) и размера (scale), байты из канала
+    читаются readinto прямо в заранее выделенные буферы. Буферов
+    buffer_count, они используются по кругу: кадр действителен, пока не
+    прочитаны следующие buffer_count - 1 кадров (как в FrameMailbox,
+    потребители берут последний кадр и сразу его обрабатывают).
+
+    Временная метка кадра - номер кадра / FPS. Без ffmpeg create
+    возвращает VideoProcessor (cv2.VideoCapture).
+    """
+
+    PIXEL_FORMATS = {'gray': 1, 'bgr24': 3}
+
+    reuses_buffers = True
+
+    def __init__(self, video_path: str, pixel_format: str = 'gray',
+                 scale: Optional[Tuple[int, int]] = None, threads: int = 0,
+                 buffer_count: int = 4, ffmpeg: str = 'ffmpeg'):
+        if pixel_format not in self.PIXEL_FORMATS:
+            raise ValueError(f"Неизвестный формат пикселей: {pixel_format}")
+
+        self.video_path = video_path
+        self.pixel_format = pixel_format
+        self.threads = threads
+        self.buffer_count = buffer_count
+        self.ffmpeg = ffmpeg
+
+        # Параметры потока (без ffprobe - через cv2.VideoCapture)
+        capture = cv2.VideoCapture(video_path)
+        if not capture.isOpened():
+            raise IOError(f"Не удалось открыть видео файл: {video_path}")
+        self.source_width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.source_height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        capture.release()
+
+        self.width, self.height = scale or (self.source_width, self.source_height)
+        channels = self.PIXEL_FORMATS[pixel_format]
+        shape = (self.height, self.width) if channels == 1 else (self.height, self.width, channels)
+        self._buffers = [np.empty(shape, dtype=np.uint8) for _ in range(buffer_count)]
+        self._next = 0
+
+        self.process: Optional[subprocess.Popen] = None
+        self.frame_count = 0
+
+        logger.info(f"Видео загружено (ffmpeg, {pixel_format}): {video_path}")
+        logger.info(f"Разрешение: {self.width}x{self.height}, FPS: {self.fps:.2f}")
+
+    @staticmethod
+    def available(ffmpeg: str = 'ffmpeg') -> bool:
+        """Есть ли исполняемый файл ffmpeg"""
+        return shutil.which(ffmpeg) is not None
+
+    @classmethod
+    def create(cls, video_path: str, pixel_format: str = 'gray',
+               scale: Optional[Tuple[int, int]] = None, threads: int = 0,
+               buffer_count: int = 4, ffmpeg: str = 'ffmpeg') -> FrameSource:
+        """FFmpegVideoSource или VideoProcessor, если ffmpeg недоступен"""
+        if str(video_path).isdigit():
+            logger.info("Индекс камеры читается через cv2.VideoCapture")
+            return VideoProcessor(video_path)
+        if not cls.available(ffmpeg):
+            logger.warning(f"ffmpeg не найден ({ffmpeg}), используется cv2.VideoCapture")
+            return VideoProcessor(video_path)
+        return cls(video_path, pixel_format, scale, threads, buffer_count, ffmpeg)
+
+    def _command(self, start_frame: int = 0) -> list:
+        """Командная строка ffmpeg"""
+        command = [self.ffmpeg, '-nostdin', '-loglevel', 'error', '-threads', str(self.threads)]
+        if start_frame:
+            command += ['-ss', f"{start_frame / self.fps:.6f}"]
+        command += ['-i', self.video_path, '-an', '-sn']
+        if (self.width, self.height) != (self.source_width, self.source_height):
+            command += ['-vf', f"scale={self.width}:{self.height}:flags=area"]
+        command += ['-f', 'rawvideo', '-pix_fmt', self.pixel_format, '-']
+        return command
+
+    def _start(self, start_frame: int = 0):
+        """Запуск (перезапуск) процесса декодирования с заданного кадра"""
+        self._terminate()
+        # bufsize=0: readinto читает из канала прямо в буфер кадра
+        self.process = subprocess.Popen(self._command(start_frame), stdout=subprocess.PIPE,
+                                        stdin=subprocess.DEVNULL, bufsize=0)
+        self.frame_count = start_frame
+
+    def _terminate(self):
+        """Остановка процесса декодирования"""
+        if self.process is None:
+            return
+        self.process.stdout.close()
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+    def initialize(self) -> CameraConfig:
+        """Запуск декодирования, параметры видеопотока"""
+        if self.process is None:
+            self._start()
+        return CameraConfig(
+            width=self.width,
+            height=self.height,
+            fps=int(round(self.fps)),
+            depth_scale=0.0
+        )
+
+    def read_frame(self) -> Optional[np.ndarray]:
+        """Чтение следующего кадра в буфер пула; None - конец видео"""
+        if self.process is None:
+            self._start()
+
+        buffer = self._buffers[self._next]
+        view = memoryview(buffer).cast('B')
+        filled = 0
+        while filled < len(view):
+            count = self.process.stdout.readinto(view[filled:])
+            if not count:
+                if filled:
+                    logger.warning(f"Неполный кадр в конце видео ({filled}/{len(view)} байт)")
+                return None
+            filled += count
+
+        self._next = (self._next + 1) % self.buffer_count
+        self.frame_count += 1
+        return buffer
+
+    def get_frames(self) -> Optional[Frames]:
+        """Получение кадра в формате FrameSource"""
+        frame = self.read_frame()
+        if frame is None:
+            return None
+        return None, frame, (self.frame_count - 1) * 1000.0 / self.fps
+
+    def seek_frame(self, index: int) -> int:
+        """Переход к кадру по номеру (перезапуск ffmpeg с -ss)"""
+        self._start(max(int(index), 0))
+        return self.frame_count
+
+    def stop(self):
+        """Освобождение ресурсов (интерфейс FrameSource)"""
+        self._terminate()
+        logger.info("Декодирование ffmpeg остановлено")
@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+from os import path
+from typing import Tuple
+import logging
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class GlobalMotionEstimator:
+    """
+    Оценка сдвига всего кадра между соседними кадрами (тряска камеры).
+
+    Фазовая корреляция (cv2.phaseCorrelate) по уменьшенному серому кадру с
+    окном Хэннинга. Сдвиг возвращается в пикселях исходного кадра; при
+    слабом отклике (response < min_response) сдвиг считается нулевым.
+    """
+
+    def __init__(self, scale: float = 0.25, min_response: float = 0.1):
+        self.scale = scale
+        self.min_response = min_response
+
+        self._previous = None
+        self._window = None
+        self.last_response = 0.0
+
+    def reset(self):
+        """Сброс предыдущего кадра"""
+        self._previous = None
+
+    def estimate(self, gray: np.ndarray) -> Tuple[float, float]:
+        """Сдвиг (dx, dy) текущего кадра относительно предыдущего"""
+        small = cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        small = small.astype(np.float32)
+
+        if self._previous is None or self._previous.shape != small.shape:
+            self._previous = small
+            self._window = cv2.createHanningWindow((small.shape[1], small.shape[0]), cv2.CV_32F)
+            self.last_response = 0.0
+            return 0.0, 0.0
+
+        (dx, dy), self.last_response = cv2.phaseCorrelate(self._previous, small, self._window)
+        self._previous = small
+
+        if self.last_response < self.min_response:
+            return 0.0, 0.0
+        return dx / self.scale, dy / self.scale
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from os import path
+from typing import Optional, Tuple
+import logging
+
+from src.classes.default_cam.MotionDetector import MotionDetector
+from src.classes.depth_cam.FrameCacheBuilder import FrameCacheBuilder
+from src.default_configs.default_cam_config import DEFAULT_CONFIG
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class MaskCache:
+    """
+    Кэш масок движения для подбора параметров DetectionFilter и Tracker.
+
+    Маски MotionDetector не зависят от параметров фильтра и трекера, поэтому
+    строятся один раз на видео. Кэш - каталог с masks.bin (N, H, ceil(W/8))
+    uint8 (np.packbits по строкам), timestamps.npy (N,) float64 и meta.json.
+    Ключ каталога - хэш видео и параметров стадии движения (MOTION_KEYS):
+    при их изменении строится новый кэш.
+    """
+
+    VERSION = 1
+
+    # Параметры конфигурации, влияющие на маску движения
+    MOTION_KEYS = (
+        'motion_threshold', 'dilation_kernel_size', 'gaussian_blur_size',
+        'background_engine', 'background_history', 'background_threshold',
+        'background_learning', 'background_warmup_frames', 'background_reduced_factor',
+        'background_alpha', 'background_median_samples', 'background_median_interval',
+        'global_motion', 'global_motion_scale', 'global_motion_min_shift',
+        'global_motion_min_response', 'max_foreground_ratio',
+        'color_prior', 'color_prior_colors', 'color_prior_ranges', 'color_prior_bits'
+    )
+
+    def __init__(self, cache_root: str):
+        self.cache_root = cache_root
+
+    def video_key(self, video_path: str) -> str:
+        """Ключ видеофайла (SHA1 содержимого, запоминается как в кэше кадров)"""
+        return FrameCacheBuilder(self.cache_root).file_hash(video_path)[:16]
+
+    @classmethod
+    def motion_settings(cls, config: Optional[dict] = None) -> dict:
+        """Параметры стадии движения из конфигурации"""
+        config = {**DEFAULT_CONFIG, **(config or {})}
+        return {'version': cls.VERSION, **{key: config[key] for key in cls.MOTION_KEYS}}
+
+    def cache_path(self, source_key: str, config: Optional[dict] = None) -> str:
+        """Путь к каталогу кэша для источника и параметров стадии движения"""
+        settings_hash = hashlib.sha1(
+            json.dumps(self.motion_settings(config), sort_keys=True).encode('utf-8')).hexdigest()
+        return path.join(self.cache_root, f"{source_key}_{settings_hash[:8]}")
+
+    @staticmethod
+    def is_complete(cache_dir: str) -> bool:
+        """Кэш построен полностью (meta.json пишется последним)"""
+        return path.exists(path.join(cache_dir, 'meta.json'))
+
+    def build(self, source, source_key: str, config: Optional[dict] = None) -> str:
+        """
+        Прогон MotionDetector по источнику (FrameSource) и запись масок.
+
+        Если кэш для source_key и параметров движения уже есть, источник не
+        читается. Возвращает путь к каталогу кэша.
+        """
+        cache_dir = self.cache_path(source_key, config)
+        if self.is_complete(cache_dir):
+            logger.info(f"Кэш масок уже существует: {cache_dir}")
+            return cache_dir
+
+        if path.exists(cache_dir):
+            shutil.rmtree(cache_dir)
+        os.makedirs(cache_dir)
+        logger.info(f"Строю кэш масок: {cache_dir}")
+
+        source.initialize()
+        detector = MotionDetector(config)
+        timestamps = []
+        shape = None
+        try:
+            with open(path.join(cache_dir, 'masks.bin'), 'wb') as file:
+                while True:
+                    frames = source.get_frames()
+                    if frames is None:
+                        break
+                    _, frame, timestamp = frames
+
+                    mask = detector.process_frame(frame)
+                    shape = mask.shape
+                    file.write(np.packbits(mask > 0, axis=-1).tobytes())
+                    timestamps.append(timestamp)
+
+                    if len(timestamps) % 300 == 0:
+                        logger.info(f"Кэш масок: {len(timestamps)} кадров")
+        finally:
+            source.stop()
+
+        np.save(path.join(cache_dir, 'timestamps.npy'), np.array(timestamps, dtype=np.float64))
+
+        meta = {
+            'source': source_key,
+            'frame_count': len(timestamps),
+            'height': shape[0] if shape else 0,
+            'width': shape[1] if shape else 0,
+            'settings': self.motion_settings(config)
+        }
+        with open(path.join(cache_dir, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump(meta, file, indent=2)
+
+        logger.info(f"Кэш масок построен: {len(timestamps)} кадров")
+        return cache_dir
+
+    @staticmethod
+    def load(cache_dir: str) -> Tuple[np.ndarray, dict]:
+        """Упакованные маски (memmap, только чтение) и meta.json"""
+        with open(path.join(cache_dir, 'meta.json'), 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        if meta['frame_count'] == 0:
+            return np.empty((0, meta['height'], (meta['width'] + 7) // 8), dtype=np.uint8), meta
+        packed = np.memmap(path.join(cache_dir, 'masks.bin'), dtype=np.uint8, mode='r',
+                           shape=(meta['frame_count'], meta['height'], (meta['width'] + 7) // 8))
+        return packed, meta
+
+    @staticmethod
+    def unpack(packed_mask: np.ndarray, width: int) -> np.ndarray:
+        """Маска кадра 0/1 uint8 (для cv2.findContours)"""
+        return np.unpackbits(packed_mask, axis=-1, count=width)
@@ -1,9 +1,15 @@
 import cv2
 import numpy as np
 from os import path
-from typing import Optional
+from typing import Dict, Optional
 import logging
 
+from src.classes.default_cam.ColorPrior import ColorPrior
+from src.classes.default_cam.GlobalMotionEstimator import GlobalMotionEstimator
+from src.classes.default_cam.background.BackgroundModel import BackgroundModel
+from src.classes.default_cam.background.MedianBackground import MedianBackground
+from src.classes.default_cam.background.Mog2Background import Mog2Background
+from src.classes.default_cam.background.RunningAverageBackground import RunningAverageBackground
 from src.default_configs.default_cam_config import DEFAULT_CONFIG
 
 parent_dir = path.dirname(path.abspath(__file__))
@@ -15,37 +21,103 @@ logger = logging.getLogger(__name__)
 class MotionDetector:
     """Детектор движения"""
 
+    # Доступные модели фона (config['background_engine'])
+    ENGINES = ('mog2', 'mog2_gray', 'running_average', 'median')
+
     def __init__(self, config: dict = None):
         self.config = {**DEFAULT_CONFIG, **(config or {})}
 
-        # Инициализация вычитателя фона
-        self.background_subtractor = cv2.createBackgroundSubtractorMOG2(
-            history=self.config['background_history'],
-            varThreshold=self.config['background_threshold'],
-            detectShadows=False
-        )
+        # Инициализация модели фона
+        self.background_model = self.create_background_model(self.config)
+
+        # Фильтр по цвету мяча (после маски движения)
+        self.color_prior = None
+        if self.config['color_prior']:
+            self.color_prior = ColorPrior(
+                [self.config['color_prior_ranges'][name] for name in self.config['color_prior_colors']],
+                self.config['color_prior_bits']
+            )
+
+        # Компенсация сдвига кадра (тряска камеры) перед frame differencing
+        self.global_motion = None
+        if self.config['global_motion']:
+            self.global_motion = GlobalMotionEstimator(
+                self.config['global_motion_scale'],
+                self.config['global_motion_min_response']
+            )
+        self.last_shift = (0.0, 0.0)
+
+        # Защита от аномальной доли переднего плана (тряска, засветка):
+        # такой кадр дает пустую маску вместо тысяч контуров
+        self.unstable = False
+        self.unstable_frames = 0
+        self._unstable_run = 0
 
         # Буферы для frame differencing
         self.prev_gray = None
         self.prev_prev_gray = None
 
+        # Детекторы уменьшенных кадров (DOWNSCALE_MOTION): у каждого масштаба
+        # своя модель фона, переключение масштаба не сбрасывает модели
+        self._scaled: Dict[float, 'MotionDetector'] = {}
+        self._last_scale = 1.0
+
         # Структурные элементы для морфологических операций
         self.kernel = cv2.getStructuringElement(
             cv2.MORPH_ELLIPSE,
             self.config['dilation_kernel_size']
         )
 
-        logger.info("Детектор движения инициализирован")
-
-    def process_frame(self, frame: np.ndarray) -> np.ndarray:
+        logger.info(f"Детектор движения инициализирован (фон: {self.config['background_engine']}, "
+                    f"обучение: {self.config['background_learning']})")
+
+    @staticmethod
+    def create_background_model(config: dict) -> BackgroundModel:
+        """Создание модели фона по конфигурации"""
+        engine = config['background_engine']
+        schedule = {
+            'learning': config['background_learning'],
+            'warmup_frames': config['background_warmup_frames'],
+            'reduced_factor': config['background_reduced_factor']
+        }
+
+        if engine in ('mog2', 'mog2_gray'):
+            return Mog2Background(config['background_history'], config['background_threshold'],
+                                  grayscale=engine == 'mog2_gray', **schedule)
+        if engine == 'running_average':
+            return RunningAverageBackground(config['background_alpha'],
+                                            config['motion_threshold'], **schedule)
+        if engine == 'median':
+            return MedianBackground(config['background_median_samples'],
+                                    config['background_median_interval'],
+                                    config['motion_threshold'], **schedule)
+        raise ValueError(f"Неизвестная модель фона: {engine}")
+
+    def process_frame(self, frame: np.ndarray, scale: float = 1.0) -> np.ndarray:
         """Обработка кадра для выделения движения"""
-        # Преобразование в градации серого и размытие
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if scale != self._last_scale:
+            # Пропущенные кадры другого масштаба: буферы differencing устарели
+            detector = self if scale == 1.0 else self._scaled.get(scale)
+            if detector is not None:
+                detector.prev_gray = detector.prev_prev_gray = None
+            self._last_scale = scale
+
+        if scale != 1.0:
+            # Детекция на уменьшенном кадре, маска возвращается в исходном размере
+            detector = self._scaled.get(scale)
+            if detector is None:
+                detector = self._scaled[scale] = MotionDetector(self.config)
+            small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            fg_mask = detector.process_frame(small)
+            return cv2.resize(fg_mask, (frame.shape[1], frame.shape[0]),
+                              interpolation=cv2.INTER_NEAREST)
+
+        # Преобразование в градации серого (серый кадр - как есть) и размытие
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         gray = cv2.GaussianBlur(gray, self.config['gaussian_blur_size'], 0)
 
-        # Вычитание фона (MOG2)
-        fg_mask_mog = self.background_subtractor.apply(frame)
-        _, fg_mask_mog = cv2.threshold(fg_mask_mog, 200, 255, cv2.THRESH_BINARY)
+        # Вычитание фона
+        fg_mask_mog = self.background_model.apply(frame, gray)
 
         # Frame differencing
         motion_mask = self._frame_differencing(gray)
@@ -59,6 +131,14 @@ class MotionDetector:
         # Удаление шума
         fg_mask = cv2.erode(fg_mask, self.kernel, iterations=1)
 
+        # Аномальная доля переднего плана - кадр пропускается
+        if self._check_unstable(fg_mask):
+            fg_mask[:] = 0
+
+        # Только пиксели цвета мяча (нужен цветной кадр)
+        if self.color_prior is not None and frame.ndim == 3:
+            fg_mask = self.color_prior.apply(frame, fg_mask)
+
         # Обновление буферов
         self._update_buffers(gray)
 
@@ -66,6 +146,13 @@ class MotionDetector:
 
     def _frame_differencing(self, gray: np.ndarray) -> Optional[np.ndarray]:
         """Frame differencing метод"""
+        if self.prev_gray is not None and self.prev_gray.shape != gray.shape:
+            # Смена масштаба: старые буферы не подходят
+            self.prev_gray = self.prev_prev_gray = None
+
+        if self.global_motion is not None:
+            self._compensate_global_motion(gray)
+
         if self.prev_gray is not None and self.prev_prev_gray is not None:
             # Разница: Текущий - Прошлый
             diff1 = cv2.absdiff(gray, self.prev_gray)
@@ -83,6 +170,50 @@ class MotionDetector:
             return motion_mask
         return None
 
+    def _compensate_global_motion(self, gray: np.ndarray):
+        """
+        Выравнивание предыдущих кадров по текущему.
+
+        Буферы хранятся уже выровненными по своему следующему кадру,
+        поэтому оба сдвигаются на сдвиг последней пары кадров.
+        """
+        if self.prev_gray is None:
+            self.global_motion.reset()
+        dx, dy = self.global_motion.estimate(gray)
+        self.last_shift = (dx, dy)
+        if self.prev_gray is None or np.hypot(dx, dy) < self.config['global_motion_min_shift']:
+            return
+
+        shift = np.float32([[1, 0, dx], [0, 1, dy]])
+        size = (gray.shape[1], gray.shape[0])
+        self.prev_gray = cv2.warpAffine(self.prev_gray, shift, size, borderMode=cv2.BORDER_REPLICATE)
+        if self.prev_prev_gray is not None:
+            self.prev_prev_gray = cv2.warpAffine(self.prev_prev_gray, shift, size,
+                                                 borderMode=cv2.BORDER_REPLICATE)
+
+    def _check_unstable(self, fg_mask: np.ndarray) -> bool:
+        """Доля переднего плана выше max_foreground_ratio"""
+        max_ratio = self.config['max_foreground_ratio']
+        if max_ratio is None:
+            return False
+
+        # На первом кадре модели фона весь кадр - передний план (это не тряска)
+        if self.background_model.frames_seen <= 1:
+            return False
+
+        ratio = cv2.countNonZero(fg_mask) / fg_mask.size
+        unstable = ratio > max_ratio
+        if unstable and not self.unstable:
+            logger.warning(f"Передний план {ratio * 100:.1f}% кадра (тряска?), "
+                           f"кадры пропускаются (сдвиг {self.last_shift[0]:.1f}, {self.last_shift[1]:.1f} px)")
+        elif not unstable and self.unstable:
+            logger.info(f"Кадр стабилен, пропущено кадров: {self._unstable_run}")
+
+        self._unstable_run = self._unstable_run + 1 if unstable else 0
+        self.unstable_frames += unstable
+        self.unstable = unstable
+        return unstable
+
     def _update_buffers(self, gray: np.ndarray):
         """Обновление буферов предыдущих кадров"""
         self.prev_prev_gray = self.prev_gray
@@ -1,11 +1,11 @@
 import numpy as np
 from collections import deque
 from os import path
-from typing import List, Tuple, Dict
+from typing import Tuple, Dict
 import logging
 
-from src.classes.default_cam.data.Trajectory import Trajectory
-from src.classes.default_cam.data.Detection import Detection
+from src.classes.default_cam.data.Trajectory import Trajectory, Rect
+from src.classes.general.data.DetectionBatch import DetectionBatch
 from src.default_configs.default_cam_config import DEFAULT_CONFIG
 
 parent_dir = path.dirname(path.abspath(__file__))
@@ -25,13 +25,19 @@ class Tracker:
 
         logger.info("Трекер инициализирован")
 
-    def update(self, detections: List[Detection]) -> Dict[int, Trajectory]:
-        """Обновление траекторий на основе новых детекций"""
+    def update(self, detections: DetectionBatch, frame_step: int = 1) -> Dict[int, Trajectory]:
+        """
+        Обновление траекторий на основе новых детекций.
+
+        frame_step > 1 - с прошлого обновления пропущены кадры: точки на
+        пропущенных кадрах восстанавливаются линейной интерполяцией,
+        скорость считается на один кадр.
+        """
         matched_ids = set()
 
         # Обработка каждой детекции
-        for detection in detections:
-            self._process_detection(detection, matched_ids)
+        for index, center in enumerate(detections.centers.tolist()):
+            self._process_detection(tuple(center), detections.rect(index), matched_ids, frame_step)
 
         # Увеличение счетчика пропущенных кадров для несовпавших треков
         self._increment_missed_frames(matched_ids)
@@ -41,21 +47,36 @@ class Tracker:
 
         return self.trajectories
 
-    def _process_detection(self, detection: Detection, matched_ids: set):
+    def checkpoint_state(self) -> dict:
+        """Состояние трекера для контрольной точки"""
+        return {
+            'trajectories': self.trajectories,
+            'next_id': self.next_id,
+            'colors': self.colors
+        }
+
+    def restore_state(self, state: dict):
+        """Восстановление состояния из контрольной точки"""
+        self.trajectories = state['trajectories']
+        self.next_id = state['next_id']
+        self.colors = state['colors']
+
+    def _process_detection(self, center: Tuple[int, int], rect: Rect, matched_ids: set,
+                           frame_step: int = 1):
         """Обработка отдельной детекции"""
-        best_id, min_dist = self._find_best_match(detection.center)
+        best_id, min_dist = self._find_best_match(center, frame_step)
 
 
         if best_id != -1:
             # Обновление существующей траектории
-            self._update_trajectory(best_id, detection)
+            self._update_trajectory(best_id, center, rect, frame_step)
             matched_ids.add(best_id)
         else:
             # Создание новой траектории
-            self._create_new_trajectory(detection)
+            self._create_new_trajectory(center, rect)
             matched_ids.add(self.next_id - 1)
 
-    def _find_best_match(self, center: Tuple[int, int]) -> Tuple[int, float]:
+    def _find_best_match(self, center: Tuple[int, int], frame_step: int = 1) -> Tuple[int, float]:
         """Поиск ближайшей траектории"""
         best_id = -1
         min_dist = float('inf')
@@ -66,7 +87,7 @@ class Tracker:
 
             dist = np.linalg.norm(np.array(center) - np.array(trajectory.last_point))
 
-            if dist < self.config['track_distance'] and dist < min_dist:
+            if dist < self.config['track_distance'] * frame_step and dist < min_dist:
                 min_dist = dist
                 best_id = traj_id
 
@@ -75,7 +96,8 @@ class Tracker:
     def _check_touched_from_depth_cam(self, touched: bool):
         pass
 
-    def _update_trajectory(self, traj_id: int, detection: Detection):
+    def _update_trajectory(self, traj_id: int, center: Tuple[int, int], rect: Rect,
+                           frame_step: int = 1):
         """Обновление существующей траектории"""
         trajectory = self.trajectories[traj_id]
 
@@ -83,21 +105,27 @@ class Tracker:
         speed = 0.0
         if trajectory.last_point:
             speed = np.linalg.norm(
-                np.array(detection.center) - np.array(trajectory.last_point)
-            )
+                np.array(center) - np.array(trajectory.last_point)
+            ) / frame_step
+
+            # Интерполяция точек пропущенных кадров
+            last_point = np.array(trajectory.last_point, dtype=np.float64)
+            for step in range(1, frame_step):
+                point = last_point + (np.array(center) - last_point) * step / frame_step
+                trajectory.add_point(tuple(np.round(point).astype(int).tolist()), rect, speed)
 
         # Обновление траектории
-        trajectory.add_point(detection.center, detection.contour, speed)
+        trajectory.add_point(center, rect, speed)
 
-    def _create_new_trajectory(self, detection: Detection):
+    def _create_new_trajectory(self, center: Tuple[int, int], rect: Rect):
         """Создание новой траектории"""
         color = tuple(np.random.randint(0, 255, 3).tolist())
 
         trajectory = Trajectory(
             id=self.next_id,
-            points=deque([detection.center], maxlen=DEFAULT_CONFIG['trajectory_length']),
+            points=deque([center], maxlen=DEFAULT_CONFIG['trajectory_length']),
             speeds=deque(maxlen=DEFAULT_CONFIG['trajectory_length']),
-            contours=deque([detection.contour], maxlen=DEFAULT_CONFIG['trajectory_length']),
+            rects=deque([rect], maxlen=DEFAULT_CONFIG['trajectory_length']),
             color=color
         )
 
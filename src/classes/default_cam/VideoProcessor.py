@@ -4,18 +4,22 @@ from os import path
 from typing import Tuple, Optional
 import logging
 
+from src.classes.general.FrameSource import FrameSource
+from src.classes.general.data.CameraConfig import CameraConfig
+
 parent_dir = path.dirname(path.abspath(__file__))
 
 # Настройка логирования
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class VideoProcessor:
+class VideoProcessor(FrameSource):
     """Базовый класс для обработки видео"""
 
     def __init__(self, video_path: str):
         self.video_path = video_path
-        self.cap = cv2.VideoCapture(video_path)
+        # Число вместо пути - индекс подключенной камеры
+        self.cap = cv2.VideoCapture(int(video_path) if str(video_path).isdigit() else video_path)
 
         if not self.cap.isOpened():
             raise IOError(f"Не удалось открыть видео файл: {video_path}")
@@ -35,6 +39,32 @@ class VideoProcessor:
             self.frame_count += 1
         return ret, frame if ret else None
 
+    def initialize(self) -> CameraConfig:
+        """Параметры видеопотока"""
+        return CameraConfig(
+            width=self.width,
+            height=self.height,
+            fps=self.fps,
+            depth_scale=0.0
+        )
+
+    def get_frames(self):
+        """Получение кадра в формате FrameSource"""
+        ret, frame = self.read_frame()
+        if not ret:
+            return None
+        return None, frame, self.cap.get(cv2.CAP_PROP_POS_MSEC)
+
+    def seek_frame(self, index: int) -> int:
+        """Переход к кадру по номеру"""
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+        return self.frame_count
+
+    def stop(self):
+        """Освобождение ресурсов (интерфейс FrameSource)"""
+        self.release()
+
     def release(self):
         """Освобождение ресурсов видео"""
         if self.cap:
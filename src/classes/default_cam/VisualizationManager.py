@@ -3,13 +3,12 @@ import numpy as np
 import time
 from collections import deque
 from os import path
-from typing import List, Tuple, Dict, Deque, Any
+from typing import Tuple, Dict, Deque
 import logging
 
-from numpy import floating
-
 from src.classes.default_cam.data.Trajectory import Trajectory
-from src.classes.default_cam.data.Detection import Detection
+from src.classes.general.RenderBufferPool import RenderBufferPool
+from src.classes.general.data.DetectionBatch import DetectionBatch
 from src.default_configs.default_cam_config import DEFAULT_CONFIG
 
 parent_dir = path.dirname(path.abspath(__file__))
@@ -21,36 +20,54 @@ logger = logging.getLogger(__name__)
 class VisualizationManager:
     """Менеджер визуализации"""
 
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, render_buffers: int = 3):
         self.width = width
         self.height = height
 
+        # Переиспользуемые буферы отладочного кадра
+        self.buffers = RenderBufferPool(render_buffers)
+
         # Статистика производительности
         self.frame_times: Deque[float] = deque(maxlen=DEFAULT_CONFIG['frame_time_buffer_size'])
         self.frame_start_time = 0
+        # Скользящая сумма для среднего за O(1)
+        self._frame_times_sum = 0.0
+
+    @property
+    def average_frame_time(self) -> float:
+        """Среднее время кадра по буферу"""
+        return self._frame_times_sum / len(self.frame_times) if self.frame_times else 0.0
 
     def start_frame_timer(self):
         """Запуск таймера для измерения времени обработки кадра"""
         self.frame_start_time = time.perf_counter()
 
-    def end_frame_timer(self) -> tuple[float, float | int, float | int, floating[Any] | int]:
+    def end_frame_timer(self) -> Tuple[float, float, float, float]:
         """Завершение измерения времени обработки кадра"""
         frame_time = time.perf_counter() - self.frame_start_time
+        if len(self.frame_times) == self.frame_times.maxlen:
+            self._frame_times_sum -= self.frame_times[0]
         self.frame_times.append(frame_time)
+        self._frame_times_sum += frame_time
 
-        avg_time = np.mean(self.frame_times) if self.frame_times else 0
+        avg_time = self.average_frame_time
         current_fps = 1 / frame_time if frame_time > 0 else 0
         avg_fps = 1 / avg_time if avg_time > 0 else 0
 
         return frame_time, current_fps, avg_fps, avg_time
 
-    def draw_detections(self, frame: np.ndarray, detections: List[Detection], is_touched: bool = False) -> np.ndarray:
+    def draw_detections(self, frame: np.ndarray, detections: DetectionBatch, is_touched: bool = False) -> np.ndarray:
         """Отрисовка детекций"""
-        debug_frame = frame.copy()
-
-        for detection in detections:
+        if frame.ndim == 2:
+            # Серый кадр (FFmpegVideoSource, pixel_format='gray') - отладочный кадр цветной
+            debug_frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR,
+                                       dst=self.buffers.acquire(frame.shape + (3,)))
+        else:
+            debug_frame = self.buffers.copy(frame)
+
+        for index in range(len(detections)):
             # Отрисовка ограничивающего прямоугольника (серый, для отладки)
-            rect = cv2.minAreaRect(detection.contour)
+            rect = detections.rect(index)
             box = cv2.boxPoints(rect)
             box = np.int32(box)
             color = (150, 150, 150)
@@ -78,9 +95,8 @@ class VisualizationManager:
             cv2.polylines(frame, [pts], False, color, 3)
 
             # Отрисовка последнего контура
-            if trajectory.contours:
-                last_contour = trajectory.contours[-1]
-                rect = cv2.minAreaRect(last_contour)
+            if trajectory.rects:
+                rect = trajectory.rects[-1]
                 box = cv2.boxPoints(rect)
                 box = np.int32(box)
                 cv2.drawContours(frame, [box], 0, color, 2)
@@ -107,7 +123,7 @@ class VisualizationManager:
 
     def draw_info_panel(self, frame: np.ndarray, frame_number: int,
                         frame_time: float, current_fps: float, avg_fps: float,
-                        timestamp: float, state) -> np.ndarray:
+                        timestamp: float, partner=None) -> np.ndarray:
         """Добавление информационной панели"""
         # Информация о кадре
         cv2.putText(frame, f"Frame: {frame_number}", (10, 30),
@@ -118,7 +134,7 @@ class VisualizationManager:
                     (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
 
         # Средние значения
-        cv2.putText(frame, f"Avg: {np.mean(self.frame_times) * 1000:.1f} ms | Avg FPS: {avg_fps:.1f}",
+        cv2.putText(frame, f"Avg: {self.average_frame_time * 1000:.1f} ms | Avg FPS: {avg_fps:.1f}",
                     (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
 
         # Временные метки
@@ -126,8 +142,8 @@ class VisualizationManager:
                     (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
 
         # Разница временных меток
-        if hasattr(state, 'get_timestamp_depth_cam'):
-            time_diff = timestamp - state.get_timestamp_depth_cam()
+        if partner is not None:
+            time_diff = timestamp - partner.get_timestamp()
             cv2.putText(frame, f"Frame differents: {time_diff:.0f} ms",
                         (10, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
 
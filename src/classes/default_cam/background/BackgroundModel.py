@@ -0,0 +1,52 @@
+import numpy as np
+from os import path
+import logging
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BackgroundModel:
+    """
+    Базовый класс модели фона для MotionDetector.
+
+    apply(frame, gray) возвращает бинарную маску переднего плана (0/255).
+    frame - исходный BGR кадр, gray - размытый серый кадр детектора.
+
+    Расписание обучения (learning):
+        'continuous' - обучение с полной скоростью всегда;
+        'freeze'     - после warmup_frames кадров модель не обучается;
+        'reduced'    - после warmup_frames скорость умножается на reduced_factor.
+    Движки переводят множитель learning_factor() в свои параметры.
+    """
+
+    SCHEDULES = ('continuous', 'freeze', 'reduced')
+
+    def __init__(self, learning: str = 'continuous', warmup_frames: int = 100,
+                 reduced_factor: float = 0.1):
+        if learning not in self.SCHEDULES:
+            raise ValueError(f"Неизвестное расписание обучения фона: {learning}")
+        self.learning = learning
+        self.warmup_frames = warmup_frames
+        self.reduced_factor = reduced_factor
+        self.frames_seen = 0
+
+    def learning_factor(self) -> float:
+        """Множитель скорости обучения на текущем кадре"""
+        if self.learning == 'continuous' or self.frames_seen < self.warmup_frames:
+            return 1.0
+        if self.learning == 'freeze':
+            return 0.0
+        return self.reduced_factor
+
+    def apply(self, frame: np.ndarray, gray: np.ndarray) -> np.ndarray:
+        """Маска переднего плана с обучением модели"""
+        mask = self._apply(frame, gray, self.learning_factor())
+        self.frames_seen += 1
+        return mask
+
+    def _apply(self, frame: np.ndarray, gray: np.ndarray, factor: float) -> np.ndarray:
+        raise NotImplementedError
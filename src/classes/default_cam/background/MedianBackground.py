@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+
+from src.classes.default_cam.background.BackgroundModel import BackgroundModel
+
+
+class MedianBackground(BackgroundModel):
+    """
+    Фон - медиана последних samples серых кадров.
+
+    Кадры попадают в выборку раз в sample_interval кадров (при сниженной
+    скорости обучения - реже), медиана пересчитывается только при
+    добавлении кадра. Передний план - отличие от медианы больше threshold.
+    """
+
+    def __init__(self, samples: int = 15, sample_interval: int = 5, threshold: int = 25,
+                 **schedule):
+        super().__init__(**schedule)
+        self.samples = samples
+        self.sample_interval = sample_interval
+        self.threshold = threshold
+
+        self._buffer = None
+        self._filled = 0
+        self._next_slot = 0
+        self._since_sample = 0
+        self.background = None
+
+    def _apply(self, frame: np.ndarray, gray: np.ndarray, factor: float) -> np.ndarray:
+        if self._buffer is None or self._buffer.shape[1:] != gray.shape:
+            self._buffer = np.empty((self.samples,) + gray.shape, dtype=np.uint8)
+            self._filled = self._next_slot = self._since_sample = 0
+            self._add_sample(gray)
+
+        mask = cv2.absdiff(gray, self.background)
+        _, mask = cv2.threshold(mask, self.threshold, 255, cv2.THRESH_BINARY)
+
+        # Добавление кадра в выборку по расписанию обучения
+        if factor > 0:
+            self._since_sample += 1
+            if self._since_sample >= self.sample_interval / factor:
+                self._add_sample(gray)
+        return mask
+
+    def _add_sample(self, gray: np.ndarray):
+        """Добавление кадра в кольцевую выборку и пересчет медианы"""
+        self._buffer[self._next_slot] = gray
+        self._next_slot = (self._next_slot + 1) % self.samples
+        self._filled = min(self._filled + 1, self.samples)
+        self._since_sample = 0
+        self.background = np.median(self._buffer[:self._filled], axis=0).astype(np.uint8)
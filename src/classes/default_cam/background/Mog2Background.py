@@ -0,0 +1,31 @@
+import cv2
+import numpy as np
+
+from src.classes.default_cam.background.BackgroundModel import BackgroundModel
+
+
+class Mog2Background(BackgroundModel):
+    """
+    MOG2 из OpenCV.
+
+    grayscale=False - исходное поведение: модель по полному BGR кадру.
+    grayscale=True - модель по уже размытому серому кадру (втрое меньше
+    данных на пиксель, шум сглажен).
+    """
+
+    def __init__(self, history: int, var_threshold: float, grayscale: bool = False, **schedule):
+        super().__init__(**schedule)
+        self.history = history
+        self.grayscale = grayscale
+        self.subtractor = cv2.createBackgroundSubtractorMOG2(
+            history=history,
+            varThreshold=var_threshold,
+            detectShadows=False
+        )
+
+    def _apply(self, frame: np.ndarray, gray: np.ndarray, factor: float) -> np.ndarray:
+        # -1 - автоматическая скорость MOG2 (1 / min(кадров, history))
+        rate = -1 if factor == 1.0 else factor / self.history
+        mask = self.subtractor.apply(gray if self.grayscale else frame, learningRate=rate)
+        _, mask = cv2.threshold(mask, 200, 255, cv2.THRESH_BINARY)
+        return mask
@@ -0,0 +1,32 @@
+import cv2
+import numpy as np
+
+from src.classes.default_cam.background.BackgroundModel import BackgroundModel
+
+
+class RunningAverageBackground(BackgroundModel):
+    """
+    Фон - экспоненциальное скользящее среднее серого кадра.
+
+    Передний план - пиксели, отличающиеся от фона больше threshold.
+    Обучение: cv2.accumulateWeighted с alpha * learning_factor().
+    """
+
+    def __init__(self, alpha: float = 0.02, threshold: int = 25, **schedule):
+        super().__init__(**schedule)
+        self.alpha = alpha
+        self.threshold = threshold
+        self.background = None
+        self._difference = None
+
+    def _apply(self, frame: np.ndarray, gray: np.ndarray, factor: float) -> np.ndarray:
+        if self.background is None or self.background.shape != gray.shape:
+            self.background = gray.astype(np.float32)
+            self._difference = np.empty(gray.shape, dtype=np.float32)
+
+        cv2.absdiff(gray.astype(np.float32), self.background, dst=self._difference)
+        _, mask = cv2.threshold(self._difference, self.threshold, 255, cv2.THRESH_BINARY)
+
+        if factor > 0:
+            cv2.accumulateWeighted(gray, self.background, self.alpha * factor)
+        return mask.astype(np.uint8)
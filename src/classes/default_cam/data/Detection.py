@@ -1,13 +1,25 @@
 from dataclasses import dataclass
 from typing import Tuple
-import numpy as np
 
+from src.classes.general.data.DetectionBatch import DetectionBatch
 
-@dataclass
+
+@dataclass(slots=True)
 class Detection:
     """Класс для хранения информации о детекции"""
     center: Tuple[int, int]
-    contour: np.ndarray
+    rect: Tuple[Tuple[float, float], Tuple[float, float], float]  # cv2.minAreaRect
     area: float
     bounding_box: Tuple[int, int, int, int]  # x, y, w, h
-    aspect_ratio: float
\ No newline at end of file
+    aspect_ratio: float
+
+    @classmethod
+    def from_batch(cls, batch: DetectionBatch, index: int) -> 'Detection':
+        """Построение объекта детекции из пакета (по запросу)"""
+        return cls(
+            center=tuple(batch.centers[index].tolist()),
+            rect=batch.rect(index),
+            area=float(batch.areas[index]),
+            bounding_box=tuple(batch.boxes[index].tolist()),
+            aspect_ratio=float(batch.aspect_ratios[index])
+        )
@@ -3,6 +3,9 @@ from typing import Tuple, Optional, Deque
 import numpy as np
 from src.default_configs.default_cam_config import DEFAULT_CONFIG
 
+# Повернутый прямоугольник в формате cv2.minAreaRect
+Rect = Tuple[Tuple[float, float], Tuple[float, float], float]
+
 
 @dataclass
 class Trajectory:
@@ -10,7 +13,7 @@ class Trajectory:
     id: int
     points: Deque[Tuple[int, int]]
     speeds: Deque[float]
-    contours: Deque[np.ndarray]
+    rects: Deque[Rect]
     missed_frames: int = 0
     color: Optional[Tuple[int, int, int]] = None
 
@@ -26,17 +29,17 @@ class Trajectory:
     def is_active(self) -> bool:
         return self.missed_frames <= 0
 
-    def add_point(self, center: Tuple[int, int], contour: np.ndarray, speed: float):
+    def add_point(self, center: Tuple[int, int], rect: Rect, speed: float):
         """Добавление новой точки в траекторию"""
         self.points.append(center)
         self.speeds.append(speed)
-        self.contours.append(contour)
+        self.rects.append(rect)
 
         # Поддерживаем максимальную длину
         if len(self.points) > DEFAULT_CONFIG['trajectory_length']:
             self.points.popleft()
             self.speeds.popleft()
-            self.contours.popleft()
+            self.rects.popleft()
 
         self.missed_frames = 0
 
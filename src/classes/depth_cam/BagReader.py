@@ -0,0 +1,198 @@
+import os
+import numpy as np
+import pyrealsense2 as rs
+from datetime import timedelta
+from os import path
+from typing import Optional, Tuple
+import logging
+
+from src.classes.depth_cam.RealsensePipeline import RealsensePipeline
+from src.classes.general.data.CameraConfig import CameraConfig
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BagReader(RealsensePipeline):
+    """
+    Чтение bag-файла с произвольным доступом.
+
+    При первом открытии строится индекс кадров (номер кадра, временная
+    метка, позиция воспроизведения) и сохраняется рядом с файлом
+    (<имя>.bag.index.npz). Воспроизведение идет не в реальном времени,
+    конец файла определяется по статусу playback, а не по исключению.
+    """
+
+    INDEX_SUFFIX = '.index.npz'
+
+    def __init__(self, bag_file_path: str, timeout_ms: int = 1000):
+        super().__init__(bag_file_path)
+        self.timeout_ms = timeout_ms
+        self.playback = None
+
+        # Индекс кадров
+        self.frame_numbers: Optional[np.ndarray] = None
+        self.timestamps: Optional[np.ndarray] = None
+        self.positions: Optional[np.ndarray] = None
+
+        # Индекс текущего кадра в индексе
+        self.position = 0
+
+        # Набор кадров, полученный при seek и еще не отданный
+        self._pending_frames = None
+
+    @property
+    def index_path(self) -> str:
+        return self.bag_file_path + self.INDEX_SUFFIX
+
+    @property
+    def frame_total(self) -> int:
+        return 0 if self.timestamps is None else len(self.timestamps)
+
+    def initialize(self) -> CameraConfig:
+        """Инициализация конвейера и загрузка (или построение) индекса"""
+        config = super().initialize()
+
+        self.playback = self.pipeline.get_active_profile().get_device().as_playback()
+        self.playback.set_real_time(False)
+
+        if not self._load_index():
+            self._build_index()
+            self._save_index()
+
+        logger.info(f"Индекс bag-файла: {self.frame_total} кадров")
+        return config
+
+    def _file_signature(self) -> np.ndarray:
+        """Подпись файла для проверки актуальности индекса"""
+        stat = os.stat(self.bag_file_path)
+        return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+    def _load_index(self) -> bool:
+        """Загрузка индекса из кэша"""
+        if not path.exists(self.index_path):
+            return False
+
+        try:
+            with np.load(self.index_path) as data:
+                if not np.array_equal(data['signature'], self._file_signature()):
+                    logger.info("Индекс bag-файла устарел, перестраиваю")
+                    return False
+                self.frame_numbers = data['frame_numbers']
+                self.timestamps = data['timestamps']
+                self.positions = data['positions']
+            return True
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать индекс {self.index_path}: {e}")
+            return False
+
+    def _build_index(self):
+        """Построение индекса одним проходом по файлу"""
+        logger.info("Строю индекс bag-файла...")
+        frame_numbers, timestamps, positions = [], [], []
+
+        while True:
+            frames = self._wait_for_frames()
+            if frames is None:
+                break
+            frame_numbers.append(frames.get_frame_number())
+            timestamps.append(frames.get_timestamp())
+            positions.append(self.playback.get_position())
+
+        self.frame_numbers = np.array(frame_numbers, dtype=np.int64)
+        self.timestamps = np.array(timestamps, dtype=np.float64)
+        self.positions = np.array(positions, dtype=np.int64)
+
+        # Возврат в начало файла
+        self._restart()
+
+    def _save_index(self):
+        """Сохранение индекса рядом с bag-файлом"""
+        try:
+            np.savez(self.index_path,
+                     signature=self._file_signature(),
+                     frame_numbers=self.frame_numbers,
+                     timestamps=self.timestamps,
+                     positions=self.positions)
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить индекс {self.index_path}: {e}")
+
+    def _restart(self):
+        """Перезапуск воспроизведения с начала файла"""
+        if self.playback.current_status() == rs.playback_status.stopped:
+            self.pipeline.stop()
+            self.pipeline.start(self.config)
+            self.playback = self.pipeline.get_active_profile().get_device().as_playback()
+            self.playback.set_real_time(False)
+        else:
+            self.playback.seek(timedelta(0))
+        self.position = 0
+        self._pending_frames = None
+
+    def _wait_for_frames(self):
+        """Ожидание кадров; None - конец файла"""
+        while True:
+            ok, frames = self.pipeline.try_wait_for_frames(self.timeout_ms)
+            if ok:
+                return frames
+            if self.playback.current_status() == rs.playback_status.stopped:
+                return None
+
+    def get_frames(self):
+        """Получение кадров; None - конец файла"""
+        frames, self._pending_frames = self._pending_frames, None
+        if frames is None:
+            frames = self._wait_for_frames()
+        if frames is None:
+            return None
+
+        depth_image, color_image, timestamp = self._convert_frames(frames)
+
+        if self.timestamps is not None and len(self.timestamps):
+            self.position = int(np.searchsorted(self.timestamps, timestamp))
+
+        return depth_image, color_image, timestamp
+
+    def seek_frame(self, index: int) -> int:
+        """Переход к кадру по его порядковому номеру в индексе"""
+        if not self.frame_total:
+            return 0
+
+        index = int(np.clip(index, 0, self.frame_total - 1))
+        if self.playback.current_status() == rs.playback_status.stopped:
+            self._restart()
+
+        # Позиция в индексе записана после получения кадра, поэтому
+        # переходим к позиции предыдущего кадра
+        position = int(self.positions[index - 1]) if index > 0 else 0
+        self.playback.seek(timedelta(microseconds=position / 1000))
+        self._skip_until(self.timestamps[index])
+        self.position = index
+
+        logger.info(f"Переход к кадру {index} (t={self.timestamps[index]:.0f} ms)")
+        return index
+
+    def seek_time(self, timestamp: float) -> int:
+        """Переход к первому кадру с временной меткой не меньше заданной (мс)"""
+        if not self.frame_total:
+            return 0
+        return self.seek_frame(int(np.searchsorted(self.timestamps, timestamp)))
+
+    def _skip_until(self, timestamp: float):
+        """Пропуск кадров до заданной временной метки после seek"""
+        while True:
+            frames = self._wait_for_frames()
+            if frames is None or frames.get_timestamp() >= timestamp:
+                if frames is not None:
+                    frames.keep()
+                self._pending_frames = frames
+                return
+
+    def frame_range(self, start_time: float, end_time: float) -> Tuple[int, int]:
+        """Диапазон индексов кадров для интервала времени (мс)"""
+        start = int(np.searchsorted(self.timestamps, start_time))
+        end = int(np.searchsorted(self.timestamps, end_time, side='right'))
+        return start, end
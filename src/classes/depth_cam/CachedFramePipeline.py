@@ -0,0 +1,70 @@
+import json
+import numpy as np
+from os import path
+from typing import Optional
+import logging
+
+from src.classes.depth_cam.FrameCacheBuilder import FrameCacheBuilder
+from src.classes.general.data.CameraConfig import CameraConfig
+from src.classes.general.FrameSource import FrameSource
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class CachedFramePipeline(FrameSource):
+    """
+    Источник кадров из кэша, совместимый с RealsensePipeline.
+
+    Кадры отдаются как срезы memmap без копирования, pyrealsense2 не требуется.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.depth: Optional[np.ndarray] = None
+        self.color: Optional[np.ndarray] = None
+        self.timestamps: Optional[np.ndarray] = None
+        self.frame_total = 0
+        self.position = 0
+
+    def initialize(self) -> CameraConfig:
+        """Открытие файлов кэша"""
+        with open(path.join(self.cache_dir, 'meta.json'), 'r', encoding='utf-8') as file:
+            self.frame_total = json.load(file)['frame_count']
+
+        self.depth = np.load(path.join(self.cache_dir, 'depth.npy'), mmap_mode='r')
+        self.color = np.load(path.join(self.cache_dir, 'color.npy'), mmap_mode='r')
+        self.timestamps = np.load(path.join(self.cache_dir, 'timestamps.npy'))[:self.frame_total]
+        self.position = 0
+
+        config = FrameCacheBuilder.load_camera_config(self.cache_dir)
+        logger.info(f"Кэш кадров открыт: {self.cache_dir} ({self.frame_total} кадров, "
+                    f"{config.width}x{config.height})")
+        return config
+
+    def get_frames(self):
+        """Получение кадров; None - конец кэша"""
+        if self.position >= self.frame_total:
+            return None
+
+        i = self.position
+        self.position += 1
+        return self.depth[i], self.color[i], float(self.timestamps[i])
+
+    def seek_frame(self, index: int) -> int:
+        """Переход к кадру по номеру"""
+        self.position = int(np.clip(index, 0, max(self.frame_total - 1, 0)))
+        return self.position
+
+    def seek_time(self, timestamp: float) -> int:
+        """Переход к первому кадру с временной меткой не меньше заданной (мс)"""
+        return self.seek_frame(int(np.searchsorted(self.timestamps, timestamp)))
+
+    def stop(self):
+        """Закрытие memmap"""
+        self.depth = None
+        self.color = None
+        logger.info("Кэш кадров закрыт")
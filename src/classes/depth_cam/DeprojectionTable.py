@@ -0,0 +1,72 @@
+import numpy as np
+from os import path
+from typing import Optional, Tuple
+import logging
+
+from src.classes.general.data.Intrinsics import Intrinsics
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class DeprojectionTable:
+    """
+    Предрасчитанная таблица лучей для депроекции пикселей в 3D.
+
+    Для каждого пикселя (u, v) хранится луч (x, y, 1) такой, что точка
+    в системе координат камеры равна depth * ray - то же самое, что делает
+    rs2_deproject_pixel_to_point, но один раз на всё изображение.
+    """
+
+    def __init__(self, intrinsics: Intrinsics):
+        self.intrinsics = intrinsics
+        self.rays_x, self.rays_y = self._build_rays(intrinsics)
+        logger.info(f"Таблица депроекции построена: {intrinsics.width}x{intrinsics.height}, "
+                    f"модель дисторсии: {intrinsics.model}")
+
+    @staticmethod
+    def _build_rays(intrin: Intrinsics) -> Tuple[np.ndarray, np.ndarray]:
+        """Построение лучей для всех пикселей (повторяет rsutil.h)"""
+        u = np.arange(intrin.width, dtype=np.float64)
+        v = np.arange(intrin.height, dtype=np.float64)
+        x = np.broadcast_to((u - intrin.ppx) / intrin.fx, (intrin.height, intrin.width))
+        y = np.broadcast_to(((v - intrin.ppy) / intrin.fy)[:, None], (intrin.height, intrin.width))
+
+        if intrin.model.lower() == 'inverse_brown_conrady':
+            k = intrin.coeffs
+            r2 = x * x + y * y
+            f = 1 + k[0] * r2 + k[1] * r2 * r2 + k[4] * r2 * r2 * r2
+            ux = x * f + 2 * k[2] * x * y + k[3] * (r2 + 2 * x * x)
+            uy = y * f + 2 * k[3] * x * y + k[2] * (r2 + 2 * y * y)
+            x, y = ux, uy
+
+        return (np.ascontiguousarray(x, dtype=np.float32),
+                np.ascontiguousarray(y, dtype=np.float32))
+
+    def centroid(self, depth_meters: np.ndarray, mask: np.ndarray,
+                 x: int, y: int) -> Optional[Tuple[float, float, float]]:
+        """
+        3D центроид блоба как взвешенная сумма по пикселям маски
+
+        Args:
+            depth_meters: Глубина в метрах в пределах ограничивающего прямоугольника
+            mask: Булева маска валидных пикселей блоба той же формы
+            x: Левая граница прямоугольника в координатах кадра
+            y: Верхняя граница прямоугольника в координатах кадра
+
+        Returns:
+            (X, Y, Z) в метрах или None, если валидных пикселей нет
+        """
+        h, w = depth_meters.shape
+        weights = depth_meters * mask
+        total = np.count_nonzero(mask)
+        if total == 0:
+            return None
+
+        px = float(np.sum(weights * self.rays_x[y:y + h, x:x + w])) / total
+        py = float(np.sum(weights * self.rays_y[y:y + h, x:x + w])) / total
+        pz = float(np.sum(weights)) / total
+        return px, py, pz
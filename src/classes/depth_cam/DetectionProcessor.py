@@ -1,10 +1,12 @@
 import numpy as np
 import cv2
 from os import path
-from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Optional, Tuple
 import logging
-from src.classes.depth_cam.data.Detection import Detection
+from src.classes.general.RenderBufferPool import RenderBufferPool
+from src.classes.general.data.DetectionBatch import DetectionBatch
+from src.classes.depth_cam.DeprojectionTable import DeprojectionTable
+from src.classes.general.data.Intrinsics import Intrinsics
 parent_dir = path.dirname(path.abspath(__file__))
 
 # Настройка логирования
@@ -16,15 +18,38 @@ class DetectionProcessor:
     """Обработчик детекций"""
 
     def __init__(self, distance_min: float, distance_max: float,
-                 min_contour_area: float = 0.0, min_valid_depth_points: int = 10):
+                 min_contour_area: float = 0.0, min_valid_depth_points: int = 10,
+                 render_buffers: int = 3):
         self.distance_min = distance_min
         self.distance_max = distance_max
         self.min_contour_area = min_contour_area
         self.min_valid_depth_points = min_valid_depth_points
 
+        # Таблица депроекции (создается после получения intrinsics)
+        self.deprojection_table: Optional[DeprojectionTable] = None
+
+        # Переиспользуемый пакет детекций
+        self.batch = DetectionBatch()
+
+        # Буферы кадра для отрисовки (исходный кадр уходит в кольцо без рисунков)
+        self.buffers = RenderBufferPool(render_buffers)
+
+        # 3D позиции предыдущего кадра для расчета скорости
+        self._prev_positions = np.empty((0, 3), dtype=np.float64)
+        self._prev_timestamp: Optional[float] = None
+
+    def set_intrinsics(self, intrinsics: Optional[Intrinsics]):
+        """Предрасчет таблицы лучей по параметрам камеры"""
+        if intrinsics is None:
+            logger.warning("Intrinsics недоступны, 3D позиции не вычисляются")
+            self.deprojection_table = None
+            return
+        self.deprojection_table = DeprojectionTable(intrinsics)
+
     def process(self, color_image: np.ndarray, depth_meters: np.ndarray,
-                roi_polygon: np.ndarray, frame_number: int, timestamp: float) -> Tuple[
-        np.ndarray, List[Detection], np.ndarray]:
+                roi_polygon: np.ndarray, frame_number: int, timestamp: float,
+                wall_time: float = 0.0) -> Tuple[
+        np.ndarray, DetectionBatch, np.ndarray, np.ndarray]:
         """
         Обработка кадра для обнаружения объектов
 
@@ -34,11 +59,13 @@ class DetectionProcessor:
             roi_polygon: Полигон области интереса
             frame_number: Номер кадра
             timestamp: Временная метка
+            wall_time: Время кадра по часам системы (time.time())
 
         Returns:
-            Tuple[обработанное изображение, список детекций, отладочное изображение]
+            Tuple[обработанное изображение, пакет детекций, отладочное изображение,
+            маска диапазона расстояний 0/255] (пакет переиспользуется на следующем кадре)
         """
-        display_image = color_image.copy()
+        display_image = self.buffers.copy(color_image)
 
         # Создание маски ROI
         roi_mask = np.zeros_like(depth_meters, dtype=np.uint8)
@@ -55,17 +82,44 @@ class DetectionProcessor:
                                        cv2.RETR_EXTERNAL,
                                        cv2.CHAIN_APPROX_SIMPLE)
 
-        detections = []
         debug_mask = (distance_mask * 255).astype(np.uint8)
         debug_display = cv2.cvtColor(debug_mask, cv2.COLOR_GRAY2BGR)
 
+        detections = self.batch
+        detections.reset(frame_number, timestamp, wall_time)
+
         for contour in contours:
-            detection = self._process_contour(contour, roi_depth, display_image,
-                                              debug_display, frame_number, timestamp)
-            if detection:
-                detections.append(detection)
+            self._process_contour(contour, roi_depth, display_image,
+                                  debug_display, detections)
+
+        self._update_velocities(detections, timestamp)
 
-        return display_image, detections, debug_display
+        return display_image, detections, debug_display, distance_mask
+
+    def checkpoint_state(self) -> dict:
+        """Состояние расчета скорости для контрольной точки"""
+        return {'prev_positions': self._prev_positions, 'prev_timestamp': self._prev_timestamp}
+
+    def restore_state(self, state: dict):
+        """Восстановление состояния из контрольной точки"""
+        self._prev_positions = state['prev_positions']
+        self._prev_timestamp = state['prev_timestamp']
+
+    def _update_velocities(self, detections: DetectionBatch, timestamp: float):
+        """Расчет скорости по ближайшей 3D позиции предыдущего кадра"""
+        positions = detections.positions
+        valid = ~np.isnan(positions[:, 2])
+
+        if len(self._prev_positions) and self._prev_timestamp is not None and valid.any():
+            dt = (timestamp - self._prev_timestamp) / 1000.0
+            if dt > 0:
+                current = positions[valid]
+                dists = np.linalg.norm(current[:, None, :] - self._prev_positions[None, :, :], axis=2)
+                nearest = self._prev_positions[np.argmin(dists, axis=1)]
+                detections.velocities[valid] = (current - nearest) / dt
+
+        self._prev_positions = positions[valid].copy()
+        self._prev_timestamp = timestamp
 
     def _create_distance_mask(self, roi_depth: np.ndarray) -> np.ndarray:
         """Создание маски для заданного диапазона расстояний"""
@@ -77,8 +131,8 @@ class DetectionProcessor:
 
     def _process_contour(self, contour: np.ndarray, roi_depth: np.ndarray,
                          display_image: np.ndarray, debug_display: np.ndarray,
-                         frame_number: int, timestamp: float) -> Optional[Detection]:
-        """Обработка отдельного контура"""
+                         detections: DetectionBatch) -> Optional[int]:
+        """Обработка отдельного контура, возвращает индекс детекции в пакете"""
         # # Фильтрация по площади
         # area = cv2.contourArea(contour)
         # print(area)
@@ -88,13 +142,14 @@ class DetectionProcessor:
         # Получение ограничивающего прямоугольника
         x, y, w, h = cv2.boundingRect(contour)
 
-        # Создание маски для контура
-        contour_mask = np.zeros_like(roi_depth, dtype=np.uint8)
-        cv2.drawContours(contour_mask, [contour], -1, 255, -1)
+        # Создание маски для контура (только в пределах прямоугольника)
+        box_depth = roi_depth[y:y + h, x:x + w]
+        contour_mask = np.zeros((h, w), dtype=np.uint8)
+        cv2.drawContours(contour_mask, [contour], -1, 255, -1, offset=(-x, -y))
 
         # Вычисление средней глубины
-        contour_pixels = roi_depth[contour_mask == 255]
-        valid_depths = contour_pixels[contour_pixels > 0]
+        valid_mask = (contour_mask == 255) & (box_depth > 0)
+        valid_depths = box_depth[valid_mask]
 
         if len(valid_depths) < self.min_valid_depth_points:
             return None
@@ -108,15 +163,22 @@ class DetectionProcessor:
         self._visualize_detection(display_image, debug_display,
                                   contour, x, y, w, h, avg_depth)
 
-        # Создание объекта детекции
-        return Detection(
-            frame_number=frame_number,
-            timestamp=timestamp,
-            x=x, y=y, width=w, height=h,
-            distance=avg_depth,
-            datetime=datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        # Добавление детекции в пакет
+        index = detections.append(
+            center=(x + w // 2, y + h // 2),
+            box=(x, y, w, h),
+            area=float(len(valid_depths)),
+            distance=avg_depth
         )
 
+        # 3D центроид по таблице лучей
+        if self.deprojection_table is not None:
+            position = self.deprojection_table.centroid(box_depth, valid_mask, x, y)
+            if position is not None:
+                detections.positions[index] = position
+
+        return index
+
     def _visualize_detection(self, display_image: np.ndarray, debug_display: np.ndarray,
                              contour: np.ndarray, x: int, y: int, w: int, h: int,
                              avg_depth: float):
@@ -0,0 +1,284 @@
+import csv
+import os
+import queue
+import struct
+import numpy as np
+from datetime import datetime
+from os import path
+from threading import Thread
+from typing import Optional, BinaryIO, Dict
+import logging
+
+from src.classes.general.data.DetectionBatch import DetectionBatch
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Колоночная схема записи детекций
+DETECTION_DTYPE = np.dtype([
+    ('frame', np.int64),
+    ('timestamp', np.float64),
+    ('x', np.int32),
+    ('y', np.int32),
+    ('width', np.int32),
+    ('height', np.int32),
+    ('distance', np.float64),
+    ('pos_x', np.float64),
+    ('pos_y', np.float64),
+    ('pos_z', np.float64),
+    ('vel_x', np.float64),
+    ('vel_y', np.float64),
+    ('vel_z', np.float64),
+    ('wall_time', np.float64),
+])
+
+# Фиксированный размер заголовка .npy, чтобы переписать форму при закрытии
+NPY_HEADER_SIZE = 128
+
+
+class DetectionSink:
+    """
+    Буферизованная запись детекций.
+
+    Детекции копируются в заранее выделенный структурированный массив,
+    заполненные блоки записываются на диск фоновым потоком. Формат:
+    'csv' (совместимый с прежним CSVWriter) или 'npy' (по одному .npy файлу
+    на колонку в каталоге <имя>_columns).
+
+    Неполный блок тоже передается на запись, если с прошлой передачи прошло
+    flush_interval секунд (по wall_time кадров), - при редких детекциях
+    файл не остается пустым до заполнения блока. Очередь блоков ограничена
+    max_pending: если диск не успевает, write_frame ждет фоновый поток.
+    """
+
+    FORMATS = ('csv', 'npy')
+
+    def __init__(self, filepath: str, output_format: str = 'csv', block_size: int = 4096,
+                 flush_interval: float = 1.0, max_pending: int = 8):
+        if output_format not in self.FORMATS:
+            raise ValueError(f"Неизвестный формат вывода: {output_format}")
+
+        self.filepath = filepath
+        self.output_format = output_format
+        self.block_size = block_size
+        self.flush_interval = flush_interval
+
+        self._block: Optional[np.ndarray] = None
+        self._count = 0
+        self._last_flush: Optional[float] = None
+        self._free_blocks: queue.Queue = queue.Queue()
+        self._pending: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[Thread] = None
+
+        # Состояние фонового потока
+        self._csv_file = None
+        self._csv_writer = None
+        self._column_files: Dict[str, BinaryIO] = {}
+        self.rows_written = 0
+
+    @property
+    def columns_dir(self) -> str:
+        """Каталог колоночного вывода"""
+        return path.splitext(self.filepath)[0] + '_columns'
+
+    def initialize(self, resume: Optional[dict] = None):
+        """
+        Открытие вывода и запуск фонового потока записи.
+
+        resume - состояние из checkpoint(): вывод открывается на дозапись и
+        обрезается до сохраненной длины (строки после контрольной точки
+        будут записаны заново).
+        """
+        if resume is not None and not self._can_resume():
+            logger.warning("Вывод детекций не найден, запись начинается заново")
+            resume = None
+
+        if self.output_format == 'csv':
+            if resume is None:
+                self._csv_file = open(self.filepath, 'w', newline='', encoding='utf-8')
+                self._csv_writer = csv.writer(self._csv_file)
+                self._csv_writer.writerow([name for name in DETECTION_DTYPE.names
+                                           if name != 'wall_time'] + ['datetime'])
+                self._csv_file.flush()
+            else:
+                self._csv_file = open(self.filepath, 'r+', newline='', encoding='utf-8')
+                self._csv_file.truncate(resume['csv_offset'])
+                self._csv_file.seek(0, os.SEEK_END)
+                self._csv_writer = csv.writer(self._csv_file)
+        else:
+            os.makedirs(self.columns_dir, exist_ok=True)
+            for name in DETECTION_DTYPE.names:
+                column_path = path.join(self.columns_dir, f"{name}.npy")
+                if resume is None:
+                    column_file = open(column_path, 'wb')
+                    self._write_npy_header(column_file, DETECTION_DTYPE[name], 0)
+                else:
+                    column_file = open(column_path, 'r+b')
+                    column_file.truncate(NPY_HEADER_SIZE +
+                                         resume['rows_written'] * DETECTION_DTYPE[name].itemsize)
+                    column_file.seek(0, os.SEEK_END)
+                self._column_files[name] = column_file
+
+        self.rows_written = resume['rows_written'] if resume is not None else 0
+
+        self._block = np.empty(self.block_size, dtype=DETECTION_DTYPE)
+        self._count = 0
+        self._last_flush = None
+
+        self._thread = Thread(target=self._writer_loop, name='DetectionSink', daemon=True)
+        self._thread.start()
+
+        target = self.filepath if self.output_format == 'csv' else self.columns_dir
+        logger.info(f"Вывод детекций инициализирован ({self.output_format}): {target}")
+
+    def write_frame(self, detections: DetectionBatch, wall_time: Optional[float] = None):
+        """Добавление детекций одного кадра (wall_time=None - время из пакета)"""
+        if wall_time is None:
+            wall_time = detections.wall_time
+
+        # Передача неполного блока по времени (проверяется и на кадрах без детекций)
+        if self._last_flush is None:
+            self._last_flush = wall_time
+        elif self._count and wall_time - self._last_flush >= self.flush_interval:
+            self._flush_block(wall_time)
+
+        total = len(detections)
+        if total == 0:
+            return
+
+        start = 0
+        while start < total:
+            count = min(total - start, self.block_size - self._count)
+            rows = self._block[self._count:self._count + count]
+            boxes = detections.boxes[start:start + count]
+            positions = detections.positions[start:start + count]
+            velocities = detections.velocities[start:start + count]
+
+            rows['frame'] = detections.frame_number
+            rows['timestamp'] = detections.timestamp
+            rows['x'] = boxes[:, 0]
+            rows['y'] = boxes[:, 1]
+            rows['width'] = boxes[:, 2]
+            rows['height'] = boxes[:, 3]
+            rows['distance'] = detections.distances[start:start + count]
+            rows['pos_x'] = positions[:, 0]
+            rows['pos_y'] = positions[:, 1]
+            rows['pos_z'] = positions[:, 2]
+            rows['vel_x'] = velocities[:, 0]
+            rows['vel_y'] = velocities[:, 1]
+            rows['vel_z'] = velocities[:, 2]
+            rows['wall_time'] = wall_time
+
+            self._count += count
+            start += count
+            if self._count == self.block_size:
+                self._flush_block(wall_time)
+
+    def _can_resume(self) -> bool:
+        """Есть ли вывод прошлого запуска для дозаписи"""
+        if self.output_format == 'csv':
+            return path.exists(self.filepath)
+        return all(path.exists(path.join(self.columns_dir, f"{name}.npy"))
+                   for name in DETECTION_DTYPE.names)
+
+    def checkpoint(self) -> dict:
+        """
+        Сброс всех накопленных строк на диск, возвращает состояние для
+        initialize(resume=...). Заголовки .npy обновляются, чтобы файлы
+        читались и после сбоя.
+        """
+        self._flush_block()
+        self._pending.join()
+
+        state = {'rows_written': self.rows_written}
+        if self._csv_file:
+            self._csv_file.flush()
+            state['csv_offset'] = self._csv_file.tell()
+        for name, column_file in self._column_files.items():
+            column_file.seek(0)
+            self._write_npy_header(column_file, DETECTION_DTYPE[name], self.rows_written)
+            column_file.seek(0, os.SEEK_END)
+            column_file.flush()
+        return state
+
+    def _flush_block(self, wall_time: Optional[float] = None):
+        """Передача накопленного блока фоновому потоку (wall_time - время передачи)"""
+        if wall_time is not None:
+            self._last_flush = wall_time
+        if self._count == 0:
+            return
+
+        self._pending.put((self._block, self._count))
+
+        try:
+            self._block = self._free_blocks.get_nowait()
+        except queue.Empty:
+            self._block = np.empty(self.block_size, dtype=DETECTION_DTYPE)
+        self._count = 0
+
+    def _writer_loop(self):
+        """Фоновая запись блоков"""
+        while True:
+            item = self._pending.get()
+            if item is None:
+                self._pending.task_done()
+                break
+
+            block, count = item
+            rows = block[:count]
+            if self.output_format == 'csv':
+                self._write_csv(rows)
+            else:
+                self._write_columns(rows)
+            self.rows_written += count
+
+            self._free_blocks.put(block)
+            self._pending.task_done()
+
+    def _write_csv(self, rows: np.ndarray):
+        """Запись блока в CSV"""
+        values = rows[list(DETECTION_DTYPE.names[:-1])].tolist()
+        stamps = [datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M:%S.%f")
+                  for t in rows['wall_time'].tolist()]
+        self._csv_writer.writerows(value + (stamp,) for value, stamp in zip(values, stamps))
+        self._csv_file.flush()
+
+    def _write_columns(self, rows: np.ndarray):
+        """Дозапись блока в колоночные файлы"""
+        for name, column_file in self._column_files.items():
+            column_file.write(np.ascontiguousarray(rows[name]).tobytes())
+
+    @staticmethod
+    def _write_npy_header(file: BinaryIO, dtype: np.dtype, length: int):
+        """Запись заголовка .npy фиксированного размера"""
+        header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+            np.lib.format.dtype_to_descr(dtype), length)
+        header = header.ljust(NPY_HEADER_SIZE - 10 - 1) + '\n'
+        file.write(b'\x93NUMPY\x01\x00')
+        file.write(struct.pack('<H', len(header)))
+        file.write(header.encode('latin1'))
+
+    def close(self):
+        """Сброс буфера, остановка потока и закрытие файлов"""
+        if self._thread is None:
+            return
+
+        self._flush_block()
+        self._pending.put(None)
+        self._thread.join()
+        self._thread = None
+
+        if self._csv_file:
+            self._csv_file.close()
+            self._csv_file = None
+
+        for name, column_file in self._column_files.items():
+            column_file.seek(0)
+            self._write_npy_header(column_file, DETECTION_DTYPE[name], self.rows_written)
+            column_file.close()
+        self._column_files = {}
+
+        logger.info(f"Вывод детекций закрыт, записано строк: {self.rows_written}")
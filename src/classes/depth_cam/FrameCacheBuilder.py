@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from dataclasses import asdict
+from os import path
+from typing import Optional
+import logging
+
+from src.classes.general.data.CameraConfig import CameraConfig
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Параметры потоков, влияющие на содержимое кэша
+CACHE_SETTINGS = {
+    'version': 1,
+    'align_to': 'color',
+    'depth_dtype': 'uint16',
+    'color_dtype': 'uint8'
+}
+
+
+class FrameCacheBuilder:
+    """
+    Однократная конвертация bag-файла в кэш кадров.
+
+    Кэш - каталог с depth.npy (N, H, W) uint16, color.npy (N, H, W, 3) uint8,
+    timestamps.npy (N,) float64 и meta.json. Файлы читаются через memmap
+    классом CachedFramePipeline без pyrealsense2. Без исходного bag-файла
+    (скопирован только каталог кэша) кэш находится по имени файла из
+    meta.json (find).
+    """
+
+    HASH_CHUNK_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, cache_root: str):
+        self.cache_root = cache_root
+
+    def file_hash(self, file_path: str) -> str:
+        """SHA1 файла; результат запоминается по размеру и времени изменения"""
+        stat = os.stat(file_path)
+        registry_path = path.join(self.cache_root, 'hashes.json')
+        registry = {}
+        if path.exists(registry_path):
+            with open(registry_path, 'r', encoding='utf-8') as file:
+                registry = json.load(file)
+
+        key = path.abspath(file_path)
+        entry = registry.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha1']
+
+        sha1 = hashlib.sha1()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(self.HASH_CHUNK_SIZE), b''):
+                sha1.update(chunk)
+
+        registry[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                         'sha1': sha1.hexdigest()}
+        os.makedirs(self.cache_root, exist_ok=True)
+        with open(registry_path, 'w', encoding='utf-8') as file:
+            json.dump(registry, file, indent=2)
+
+        return sha1.hexdigest()
+
+    def cache_path(self, bag_file_path: str, settings: Optional[dict] = None) -> str:
+        """Путь к каталогу кэша для файла и параметров потоков"""
+        settings = {**CACHE_SETTINGS, **(settings or {})}
+        settings_hash = hashlib.sha1(
+            json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+        return path.join(self.cache_root,
+                         f"{self.file_hash(bag_file_path)[:16]}_{settings_hash[:8]}")
+
+    def find(self, bag_file_path: str, settings: Optional[dict] = None) -> Optional[str]:
+        """
+        Каталог готового кэша для файла или None.
+
+        Если bag-файла нет, кэш ищется по имени файла и параметрам потоков
+        в meta.json каталогов кэша (хэш содержимого посчитать нельзя).
+        """
+        if path.exists(bag_file_path):
+            cache_dir = self.cache_path(bag_file_path, settings)
+            return cache_dir if self.is_complete(cache_dir) else None
+
+        if not path.isdir(self.cache_root):
+            return None
+        settings = {**CACHE_SETTINGS, **(settings or {})}
+        # Путь в meta.json мог быть записан в Windows
+        name = path.basename(bag_file_path.replace('\\', '/'))
+        matches = []
+        for entry in sorted(os.listdir(self.cache_root)):
+            cache_dir = path.join(self.cache_root, entry)
+            if not self.is_complete(cache_dir):
+                continue
+            with open(path.join(cache_dir, 'meta.json'), 'r', encoding='utf-8') as file:
+                meta = json.load(file)
+            if path.basename(meta['source'].replace('\\', '/')) == name and meta['settings'] == settings:
+                matches.append(cache_dir)
+
+        if len(matches) > 1:
+            logger.warning(f"Несколько кэшей для {name} без исходного файла: {matches}")
+            return None
+        if matches:
+            logger.info(f"Bag-файл не найден, кэш найден по имени файла: {matches[0]}")
+            return matches[0]
+        return None
+
+    @staticmethod
+    def is_complete(cache_dir: str) -> bool:
+        """Кэш построен полностью (meta.json пишется последним)"""
+        return path.exists(path.join(cache_dir, 'meta.json'))
+
+    def build(self, bag_file_path: str, settings: Optional[dict] = None) -> str:
+        """Построение кэша (если его еще нет), возвращает путь к каталогу"""
+        cache_dir = self.cache_path(bag_file_path, settings)
+        if self.is_complete(cache_dir):
+            logger.info(f"Кэш кадров уже существует: {cache_dir}")
+            return cache_dir
+
+        # Импорт здесь: для чтения готового кэша pyrealsense2 не нужен
+        from src.classes.depth_cam.BagReader import BagReader
+
+        if path.exists(cache_dir):
+            shutil.rmtree(cache_dir)
+        os.makedirs(cache_dir)
+
+        reader = BagReader(bag_file_path)
+        camera_config = reader.initialize()
+        total = reader.frame_total
+        logger.info(f"Строю кэш кадров ({total} кадров): {cache_dir}")
+
+        shape = (camera_config.height, camera_config.width)
+        depth = np.lib.format.open_memmap(path.join(cache_dir, 'depth.npy'), mode='w+',
+                                          dtype=np.uint16, shape=(total, *shape))
+        color = np.lib.format.open_memmap(path.join(cache_dir, 'color.npy'), mode='w+',
+                                          dtype=np.uint8, shape=(total, *shape, 3))
+        timestamps = np.full(total, np.nan, dtype=np.float64)
+
+        count = 0
+        try:
+            while count < total:
+                frames = reader.get_frames()
+                if frames is None:
+                    break
+                depth_image, color_image, timestamp = frames
+                if depth_image is None or color_image is None:
+                    continue
+
+                depth[count] = depth_image
+                color[count] = color_image
+                timestamps[count] = timestamp
+                count += 1
+
+                if count % 300 == 0:
+                    logger.info(f"Кэш кадров: {count}/{total}")
+        finally:
+            reader.stop()
+
+        depth.flush()
+        color.flush()
+        del depth, color
+        np.save(path.join(cache_dir, 'timestamps.npy'), timestamps)
+
+        meta = {
+            'source': path.abspath(bag_file_path),
+            'frame_count': count,
+            'settings': {**CACHE_SETTINGS, **(settings or {})},
+            'camera_config': asdict(camera_config)
+        }
+        with open(path.join(cache_dir, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump(meta, file, indent=2)
+
+        logger.info(f"Кэш кадров построен: {count} кадров")
+        return cache_dir
+
+    @staticmethod
+    def load_camera_config(cache_dir: str) -> CameraConfig:
+        """Чтение конфигурации камеры из meta.json"""
+        from src.classes.general.data.Intrinsics import Intrinsics
+
+        with open(path.join(cache_dir, 'meta.json'), 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        config = dict(meta['camera_config'])
+        if config.get('intrinsics'):
+            intrinsics = dict(config['intrinsics'])
+            intrinsics['coeffs'] = tuple(intrinsics['coeffs'])
+            config['intrinsics'] = Intrinsics(**intrinsics)
+        return CameraConfig(**config)
@@ -1,7 +1,10 @@
+import numpy as np
 import pyrealsense2 as rs
 from os import path
 import logging
 from src.classes.general.data.CameraConfig import CameraConfig
+from src.classes.general.FrameSource import FrameSource
+from src.classes.general.data.Intrinsics import Intrinsics
 
 parent_dir = path.dirname(path.abspath(__file__))
 
@@ -9,7 +12,7 @@ parent_dir = path.dirname(path.abspath(__file__))
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class RealsensePipeline:
+class RealsensePipeline(FrameSource):
     """Класс для управления конвейером RealSense"""
 
     def __init__(self, bag_file_path: str):
@@ -40,7 +43,9 @@ class RealsensePipeline:
             width=color_profile.get_intrinsics().width,
             height=color_profile.get_intrinsics().height,
             fps=color_profile.fps(),
-            depth_scale=depth_scale
+            depth_scale=depth_scale,
+            # Глубина выравнивается по цвету, поэтому используем intrinsics цветового потока
+            intrinsics=Intrinsics.from_realsense(color_profile.get_intrinsics())
         )
 
         logger.info(f"Конвейер инициализирован. Разрешение: {config.width}x{config.height}, FPS: {config.fps}")
@@ -48,15 +53,24 @@ class RealsensePipeline:
         return config
 
     def get_frames(self):
-        """Получение кадров из конвейера"""
+        """Получение кадров из конвейера (depth uint16, color BGR, временная метка)"""
         frames = self.pipeline.wait_for_frames()
+        return self._convert_frames(frames)
+
+    def _convert_frames(self, frames):
+        """Выравнивание и конвертация кадров в массивы"""
         aligned_frames = self.align.process(frames)
 
         depth_frame = aligned_frames.get_depth_frame()
         color_frame = aligned_frames.get_color_frame()
         timestamp = frames.get_timestamp()
 
-        return depth_frame, color_frame, timestamp
+        if not depth_frame or not color_frame:
+            return None, None, timestamp
+
+        return (np.asanyarray(depth_frame.get_data()),
+                np.asanyarray(color_frame.get_data()),
+                timestamp)
 
     def stop(self):
         """Остановка конвейера"""
@@ -16,19 +16,31 @@ class VisualizationOverlay:
         self.width = width
         self.height = height
         self.roi_polygon = roi_polygon
-        self.roi_overlay = self._create_roi_overlay()
+        self.roi_rect, self.roi_overlay = self._create_roi_overlay()
 
-    def _create_roi_overlay(self) -> np.ndarray:
-        """Создание оверлея для ROI"""
+    def _create_roi_overlay(self):
+        """
+        Создание оверлея для ROI.
+
+        Оверлей хранится только в пределах ограничивающего прямоугольника
+        полигона: вне полигона он нулевой и изображение не меняет.
+        """
         overlay = np.zeros((self.height, self.width, 3), dtype=np.uint8)
         cv2.fillPoly(overlay, [self.roi_polygon], (0, 100, 0))
-        return overlay
+
+        x, y, w, h = cv2.boundingRect(self.roi_polygon)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, self.width), min(y + h, self.height)
+        return (x0, y0, x1, y1), overlay[y0:y1, x0:x1].copy()
 
     def add_roi_overlay(self, image: np.ndarray) -> np.ndarray:
-        """Добавление ROI оверлея на изображение"""
-        result = cv2.addWeighted(image, 1.0, self.roi_overlay, 0.2, 0)
-        cv2.polylines(result, [self.roi_polygon], True, (0, 255, 255), 2)
-        return result
+        """Добавление ROI оверлея на изображение (на месте)"""
+        x0, y0, x1, y1 = self.roi_rect
+        region = image[y0:y1, x0:x1]
+        if region.size:
+            cv2.addWeighted(region, 1.0, self.roi_overlay, 0.2, 0, dst=region)
+        cv2.polylines(image, [self.roi_polygon], True, (0, 255, 255), 2)
+        return image
 
     def add_info_panel(self, image: np.ndarray, info: dict) -> np.ndarray:
         """Добавление информационной панели"""
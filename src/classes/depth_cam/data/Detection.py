@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 
-@dataclass
+from src.classes.general.data.DetectionBatch import DetectionBatch
+
+@dataclass(slots=True)
 class Detection:
     """Класс для хранения информации о детекции"""
     frame_number: int
@@ -11,6 +13,29 @@ class Detection:
     height: int
     distance: float
     datetime: str
+    # Положение в системе координат камеры (м) и скорость (м/с)
+    pos_x: float = float('nan')
+    pos_y: float = float('nan')
+    pos_z: float = float('nan')
+    vel_x: float = float('nan')
+    vel_y: float = float('nan')
+    vel_z: float = float('nan')
+
+    @classmethod
+    def from_batch(cls, batch: DetectionBatch, index: int) -> 'Detection':
+        """Построение объекта детекции из пакета (по запросу)"""
+        x, y, w, h = batch.boxes[index].tolist()
+        pos_x, pos_y, pos_z = batch.positions[index].tolist()
+        vel_x, vel_y, vel_z = batch.velocities[index].tolist()
+        return cls(
+            frame_number=batch.frame_number,
+            timestamp=batch.timestamp,
+            x=x, y=y, width=w, height=h,
+            distance=float(batch.distances[index]),
+            datetime=batch.datetime,
+            pos_x=pos_x, pos_y=pos_y, pos_z=pos_z,
+            vel_x=vel_x, vel_y=vel_y, vel_z=vel_z
+        )
 
     def to_dict(self):
         return {
@@ -21,5 +46,11 @@ class Detection:
             'width': self.width,
             'height': self.height,
             'distance': self.distance,
+            'pos_x': self.pos_x,
+            'pos_y': self.pos_y,
+            'pos_z': self.pos_z,
+            'vel_x': self.vel_x,
+            'vel_y': self.vel_y,
+            'vel_z': self.vel_z,
             'datetime': self.datetime
-        }
\ No newline at end of file
+        }
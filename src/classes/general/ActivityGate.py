@@ -0,0 +1,151 @@
+import csv
+import cv2
+import numpy as np
+from os import path
+from typing import List, Optional, Tuple
+import logging
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ActivityGate:
+    """
+    Дешевый детектор активности для пропуска пауз между розыгрышами.
+
+    ROI кадра уменьшается до сетки grid (десятки ячеек) и сравнивается с
+    предыдущим кадром: активность - максимальное изменение ячейки. Для
+    глубины (uint16) дополнительно сравнивается сумма ROI (среднее на
+    пиксель). Если idle_frames кадров подряд изменения ниже порогов,
+    включается простой: update() возвращает False, дорогие стадии
+    пропускаются. Каждый background_interval-й кадр простоя помечается
+    background_due - на нем модели фона обновляются. Первое же изменение
+    возвращает полную обработку.
+
+    Пропущенные интервалы (кадры и временные метки) сохраняются в ranges.
+    """
+
+    def __init__(self, roi: Optional[Tuple[int, int, int, int]] = None,
+                 grid: Tuple[int, int] = (32, 18), threshold: float = 4.0,
+                 sum_threshold: Optional[float] = None, idle_frames: int = 15,
+                 background_interval: int = 10):
+        self.roi = roi
+        self.grid = tuple(grid)
+        self.threshold = threshold
+        self.sum_threshold = sum_threshold
+        self.idle_frames = idle_frames
+        self.background_interval = background_interval
+
+        self._previous: Optional[np.ndarray] = None
+        self._previous_sum: Optional[float] = None
+        self._quiet_frames = 0
+
+        self.idle = False
+        self.background_due = False
+        self.activity = 0.0
+        self.skipped_frames = 0
+
+        # Интервалы простоя: (первый кадр, последний кадр, метка начала, метка конца)
+        self.ranges: List[Tuple[int, int, float, float]] = []
+        self._range_start: Optional[Tuple[int, float]] = None
+        self._last: Tuple[int, float] = (0, 0.0)
+
+    def _measure(self, frame: np.ndarray) -> bool:
+        """Сравнение с предыдущим кадром; True - есть изменения"""
+        if self.roi is not None:
+            x, y, w, h = self.roi
+            frame = frame[y:y + h, x:x + w]
+
+        small = cv2.resize(frame, self.grid, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        small = small.astype(np.float32)
+
+        roi_sum = None
+        if self.sum_threshold is not None:
+            roi_sum = float(frame.sum(dtype=np.uint64)) / frame.size
+
+        previous, previous_sum = self._previous, self._previous_sum
+        self._previous, self._previous_sum = small, roi_sum
+        if previous is None:
+            return True
+
+        self.activity = float(np.max(np.abs(small - previous)))
+        if self.activity > self.threshold:
+            return True
+        return roi_sum is not None and abs(roi_sum - previous_sum) > self.sum_threshold
+
+    def update(self, frame: np.ndarray, frame_number: int, timestamp: float) -> bool:
+        """Учет кадра; True - кадр нужно обработать полностью"""
+        changed = self._measure(frame)
+        if changed and self.idle:
+            self._end_range()
+            logger.info(f"Активность на кадре {frame_number}: возобновлена полная обработка")
+        self._last = (frame_number, timestamp)
+
+        if changed:
+            self._quiet_frames = 0
+            return True
+
+        self._quiet_frames += 1
+        if not self.idle:
+            if self._quiet_frames < self.idle_frames:
+                return True
+            self.idle = True
+            self._range_start = (frame_number, timestamp)
+            logger.info(f"Простой с кадра {frame_number}: пропуск обработки")
+
+        self.skipped_frames += 1
+        self.background_due = (self.skipped_frames % self.background_interval) == 0
+        return False
+
+    def _end_range(self):
+        """Завершение интервала простоя на последнем пропущенном кадре"""
+        start_frame, start_time = self._range_start
+        end_frame, end_time = self._last
+        self.ranges.append((start_frame, end_frame, start_time, end_time))
+        self.idle = False
+        self.background_due = False
+        self._range_start = None
+
+    def checkpoint_state(self) -> dict:
+        """Состояние детектора и интервалы простоя для контрольной точки"""
+        return {
+            'previous': self._previous,
+            'previous_sum': self._previous_sum,
+            'quiet_frames': self._quiet_frames,
+            'idle': self.idle,
+            'skipped_frames': self.skipped_frames,
+            'ranges': list(self.ranges),
+            'range_start': self._range_start,
+            'last': self._last
+        }
+
+    def restore_state(self, state: dict):
+        """Восстановление состояния из контрольной точки"""
+        self._previous = state['previous']
+        self._previous_sum = state['previous_sum']
+        self._quiet_frames = state['quiet_frames']
+        self.idle = state['idle']
+        self.skipped_frames = state['skipped_frames']
+        self.ranges = list(state['ranges'])
+        self._range_start = state['range_start']
+        self._last = state['last']
+
+    def close(self):
+        """Завершение открытого интервала в конце потока"""
+        if self.idle:
+            self._end_range()
+
+    def save(self, csv_path: str):
+        """Запись интервалов простоя в CSV"""
+        self.close()
+        with open(csv_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['start_frame', 'end_frame', 'start_timestamp', 'end_timestamp'])
+            writer.writerows(self.ranges)
+        logger.info(f"Интервалы простоя ({len(self.ranges)}, кадров: {self.skipped_frames}) "
+                    f"сохранены: {csv_path}")
@@ -0,0 +1,108 @@
+from collections import deque
+from os import path
+from typing import List, Optional
+import logging
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveQualityController:
+    """
+    Адаптивное снижение качества при превышении бюджета времени на кадр.
+
+    По измеренному времени кадров (StageTimers.end_frame) ведется скользящее
+    среднее. Если оно превышает бюджет, включается следующая деградация из
+    списка, если есть запас (среднее ниже headroom * бюджет) - последняя
+    включенная отключается. Уровень - число включенных деградаций.
+
+    После смены уровня окно измерений очищается, новое решение принимается
+    не раньше чем через hold_frames кадров. Если повышение качества сразу
+    приводит к перегрузке, задержка перед следующей попыткой удваивается.
+    """
+
+    # Известные деградации (в порядке включения по умолчанию)
+    SKIP_DEBUG_RENDER = 'skip_debug_render'
+    SKIP_MASK_ENCODE = 'skip_mask_encode'
+    DOWNSCALE_MOTION = 'downscale_motion'
+    SKIP_ALTERNATE_FRAMES = 'skip_alternate_frames'
+
+    def __init__(self, camera: str, degradations: List[str], budget_ms: float,
+                 window: int = 30, headroom: float = 0.75, hold_frames: int = 30,
+                 max_hold_frames: int = 960):
+        self.camera = camera
+        self.degradations = list(degradations)
+        self.budget = budget_ms / 1000
+        self.headroom = headroom
+        self.hold_frames = hold_frames
+        self.max_hold_frames = max_hold_frames
+
+        self.level = 0
+        self._frame_times = deque(maxlen=window)
+        self._frames_since_change = 0
+        self._up_hold = hold_frames
+        self._last_change_up = False
+
+        # Журнал переходов: (номер кадра, старый уровень, новый уровень, среднее мс)
+        self.transitions = []
+        self._frame_index = 0
+
+        logger.info(f"[{camera}] Адаптивное качество: бюджет {budget_ms:.1f} ms, "
+                    f"деградации: {', '.join(self.degradations)}")
+
+    def active(self, degradation: str) -> bool:
+        """Включена ли деградация на текущем уровне"""
+        return degradation in self.degradations[:self.level]
+
+    @property
+    def rolling_frame_time(self) -> Optional[float]:
+        """Скользящее среднее времени кадра (с)"""
+        if not self._frame_times:
+            return None
+        return sum(self._frame_times) / len(self._frame_times)
+
+    def update(self, frame_seconds: float) -> int:
+        """Учет времени кадра и, при необходимости, смена уровня"""
+        self._frame_index += 1
+        self._frames_since_change += 1
+        self._frame_times.append(frame_seconds)
+
+        if len(self._frame_times) < self._frame_times.maxlen:
+            return self.level
+
+        rolling = self.rolling_frame_time
+        if rolling > self.budget and self.level < len(self.degradations):
+            if self._frames_since_change >= self.hold_frames:
+                # Повышение качества не удержалось - реже пробуем снова
+                if self._last_change_up and self._frames_since_change < 2 * self._up_hold:
+                    self._up_hold = min(self._up_hold * 2, self.max_hold_frames)
+                self._set_level(self.level + 1, rolling)
+        elif rolling < self.headroom * self.budget and self.level > 0:
+            if self._frames_since_change >= self._up_hold:
+                self._set_level(self.level - 1, rolling)
+        elif self._frames_since_change >= self.max_hold_frames:
+            # Долгая стабильная работа - сброс задержки повышения
+            self._up_hold = self.hold_frames
+
+        return self.level
+
+    def _set_level(self, level: int, rolling: float):
+        """Смена уровня с записью в журнал"""
+        previous = self.level
+        self.level = level
+        self._last_change_up = level < previous
+        self._frames_since_change = 0
+        self._frame_times.clear()
+        self.transitions.append((self._frame_index, previous, level, rolling * 1000))
+
+        if level > previous:
+            logger.warning(f"[{self.camera}] Кадр {self._frame_index}: среднее время "
+                           f"{rolling * 1000:.1f} ms > бюджета {self.budget * 1000:.1f} ms, "
+                           f"включено '{self.degradations[level - 1]}' (уровень {level})")
+        else:
+            logger.info(f"[{self.camera}] Кадр {self._frame_index}: среднее время "
+                        f"{rolling * 1000:.1f} ms, запас есть, отключено "
+                        f"'{self.degradations[level]}' (уровень {level})")
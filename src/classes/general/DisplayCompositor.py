@@ -0,0 +1,139 @@
+import cv2
+import math
+import time
+import numpy as np
+from os import path
+from threading import Event, Lock
+from typing import Callable, Dict, Optional, Tuple
+import logging
+
+from src.classes.general.FrameMailbox import FrameMailbox
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class DisplayCompositor:
+    """
+    Единственный поток отображения для всех конвейеров.
+
+    Процессоры отправляют аннотированные кадры через post(name, frame) в
+    неблокирующие почтовые ящики и никогда не ждут GUI. run() (в главном
+    потоке) собирает последние кадры всех ящиков в одно окно-мозаику с
+    ограниченной частотой обновления и обрабатывает всю клавиатуру:
+    ESC / q - остановка, p - пауза всех конвейеров.
+    """
+
+    def __init__(self, window_name: str = 'BallDetecting', max_fps: float = 30.0,
+                 tile_height: int = 360, columns: int = 2):
+        self.window_name = window_name
+        self.max_fps = max_fps
+        self.tile_height = tile_height
+        self.columns = columns
+
+        self._mailboxes: Dict[str, FrameMailbox] = {}
+        self._mailboxes_lock = Lock()
+
+        # Последний кадр каждого ящика, уменьшенный до высоты плитки
+        self._tiles: Dict[str, np.ndarray] = {}
+        self._canvas: Optional[np.ndarray] = None
+
+        self.stop_requested = Event()
+        self.paused = False
+
+    def mailbox(self, name: str) -> FrameMailbox:
+        """Почтовый ящик окна (создается при первом обращении)"""
+        with self._mailboxes_lock:
+            mailbox = self._mailboxes.get(name)
+            if mailbox is None:
+                mailbox = FrameMailbox()
+                self._mailboxes[name] = mailbox
+            return mailbox
+
+    def post(self, name: str, frame: Optional[np.ndarray]):
+        """Отправка кадра в окно name"""
+        if frame is not None:
+            self.mailbox(name).post(frame)
+
+    def stop(self):
+        """Запрос остановки всех конвейеров"""
+        self.stop_requested.set()
+
+    def run(self, until: Callable[[], bool] = None):
+        """Цикл отображения (до остановки или пока until() не вернет True)"""
+        period = 1.0 / self.max_fps
+        logger.info(f"Отображение запущено (до {self.max_fps:.0f} FPS)")
+
+        while not self.stop_requested.is_set():
+            if until is not None and until():
+                break
+
+            started = time.perf_counter()
+            if self._collect():
+                cv2.imshow(self.window_name, self._compose())
+
+            # Ожидание клавиши заодно ограничивает частоту обновления
+            remaining = period - (time.perf_counter() - started)
+            self._handle_key(cv2.waitKey(max(1, int(remaining * 1000))) & 0xFF)
+
+        if self._canvas is not None:
+            cv2.destroyWindow(self.window_name)
+        logger.info("Отображение остановлено")
+
+    def _collect(self) -> bool:
+        """Забор новых кадров из ящиков; True - есть что обновить"""
+        with self._mailboxes_lock:
+            mailboxes = list(self._mailboxes.items())
+
+        updated = False
+        for name, mailbox in mailboxes:
+            taken = mailbox.take()
+            if taken is not None:
+                self._tiles[name] = self._to_tile(name, taken[0])
+                updated = True
+        return updated
+
+    def _to_tile(self, name: str, frame: np.ndarray) -> np.ndarray:
+        """Приведение кадра к плитке: BGR, высота tile_height, подпись"""
+        if frame.ndim == 2:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        height, width = frame.shape[:2]
+        tile_width = max(1, int(round(width * self.tile_height / height)))
+        tile = cv2.resize(frame, (tile_width, self.tile_height), interpolation=cv2.INTER_AREA)
+        cv2.putText(tile, name, (8, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        return tile
+
+    def _layout(self) -> Tuple[int, int, int]:
+        """Размер сетки: строки, столбцы, ширина ячейки"""
+        count = len(self._tiles)
+        columns = min(self.columns, count)
+        rows = math.ceil(count / columns)
+        cell_width = max(tile.shape[1] for tile in self._tiles.values())
+        return rows, columns, cell_width
+
+    def _compose(self) -> np.ndarray:
+        """Сборка мозаики в переиспользуемый холст"""
+        rows, columns, cell_width = self._layout()
+        shape = (rows * self.tile_height, columns * cell_width, 3)
+        if self._canvas is None or self._canvas.shape != shape:
+            self._canvas = np.zeros(shape, dtype=np.uint8)
+
+        for index, tile in enumerate(self._tiles.values()):
+            row, column = divmod(index, columns)
+            y, x = row * self.tile_height, column * cell_width
+            self._canvas[y:y + self.tile_height, x:x + tile.shape[1]] = tile
+            # Очистка остатка ячейки, если плитка уже ячейки
+            self._canvas[y:y + self.tile_height, x + tile.shape[1]:x + cell_width] = 0
+        return self._canvas
+
+    def _handle_key(self, key: int):
+        """Обработка клавиатуры"""
+        if key == 27 or key == ord('q') or key == ord('Q'):  # ESC / q
+            logger.info("Остановка по команде пользователя")
+            self.stop()
+        elif key == ord('p') or key == ord('P'):
+            self.paused = not self.paused
+            logger.info(f"Пауза: {'включена' if self.paused else 'выключена'}")
@@ -0,0 +1,36 @@
+import numpy as np
+from threading import Lock
+from typing import Optional, Tuple
+
+
+class FrameMailbox:
+    """
+    Неблокирующий почтовый ящик на один кадр.
+
+    post() заменяет предыдущий кадр (побеждает последний), take() отдает
+    кадр, только если с прошлого вызова пришел новый. Кадр передается по
+    ссылке: после отправки процессор не должен его изменять.
+    """
+
+    __slots__ = ('_lock', '_frame', '_sequence', '_taken')
+
+    def __init__(self):
+        self._lock = Lock()
+        self._frame: Optional[np.ndarray] = None
+        self._sequence = 0
+        self._taken = 0
+
+    def post(self, frame: np.ndarray):
+        """Отправка кадра (никогда не блокирует надолго)"""
+        with self._lock:
+            self._frame = frame
+            self._sequence += 1
+
+    def take(self) -> Optional[Tuple[np.ndarray, int]]:
+        """Новый кадр и число кадров, пришедших с прошлого вызова; None - нового нет"""
+        with self._lock:
+            if self._sequence == self._taken:
+                return None
+            received = self._sequence - self._taken
+            self._taken = self._sequence
+            return self._frame, received
@@ -0,0 +1,44 @@
+import numpy as np
+from os import path
+from typing import Optional, Tuple
+import logging
+
+from src.classes.general.data.CameraConfig import CameraConfig
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (глубина uint16 или None, цвет BGR или None, временная метка в мс)
+Frames = Tuple[Optional[np.ndarray], Optional[np.ndarray], float]
+
+
+class FrameSource:
+    """
+    Базовый интерфейс источника кадров для обеих камер.
+
+    get_frames возвращает кортеж (depth, color, timestamp) или None в конце
+    потока. Источники обычной камеры отдают depth=None.
+    """
+
+    # Источник перезаписывает свои буферы кадров следующими кадрами
+    # (кадр действителен только до следующих чтений)
+    reuses_buffers = False
+
+    def initialize(self) -> CameraConfig:
+        """Открытие источника, возвращает параметры потока"""
+        raise NotImplementedError
+
+    def get_frames(self) -> Optional[Frames]:
+        """Получение следующих кадров; None - конец потока"""
+        raise NotImplementedError
+
+    def seek_frame(self, index: int) -> int:
+        """Переход к кадру по номеру, возвращает фактический номер"""
+        raise NotImplementedError(f"{type(self).__name__} не поддерживает переход по кадрам")
+
+    def stop(self):
+        """Освобождение ресурсов"""
+        pass
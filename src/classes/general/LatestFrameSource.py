@@ -0,0 +1,153 @@
+import time
+from os import path
+from threading import Condition, Thread
+from typing import Optional
+import logging
+
+from src.classes.general.FrameSource import FrameSource, Frames
+from src.classes.general.data.CameraConfig import CameraConfig
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class LatestFrameSource(FrameSource):
+    """
+    Живой режим захвата: побеждает последний кадр.
+
+    Отдельный поток непрерывно читает кадры из вложенного источника.
+    Буфер двойной: один кадр захватывается, второй (последний готовый)
+    ждет обработки и при поступлении нового просто заменяется. Цикл
+    обработки всегда получает самый свежий кадр, пропущенные кадры
+    подсчитываются, временная метка берется в момент захвата. Так задержка
+    от камеры до результата не растет при перегрузке.
+
+    Файл или синтетический источник можно использовать вместо камеры:
+    при pace=True захват идет с частотой fps источника. Кадры источников с
+    переиспользуемыми буферами (reuses_buffers) копируются: поток захвата
+    читает дальше, пока обработка еще работает с выданным кадром.
+    Зависание источника дольше timeout не завершает поток: get_frames
+    предупреждает (stalled) и продолжает ждать.
+    """
+
+    def __init__(self, source: FrameSource, pace: bool = True, timeout: float = 5.0,
+                 timers=None):
+        self.source = source
+        self.pace = pace
+        self.timeout = timeout
+        self.timers = timers
+
+        self.camera_config: Optional[CameraConfig] = None
+        self._condition = Condition()
+        self._thread: Optional[Thread] = None
+        self._running = False
+        self._finished = False
+
+        # Последний готовый кадр: (номер захвата, кадры)
+        self._latest: Optional[Frames] = None
+        self._latest_sequence = -1
+        self._consumed_sequence = -1
+        self._start_time = 0.0
+
+        # Статистика
+        self.captured_frames = 0
+        self.delivered_frames = 0
+        self.skipped_frames = 0
+        self.last_age = 0.0
+        self.stalled = False
+        self.stall_count = 0
+
+    def initialize(self) -> CameraConfig:
+        """Открытие вложенного источника и запуск потока захвата"""
+        self.camera_config = self.source.initialize()
+        self._start_time = time.perf_counter()
+        self._running = True
+        self._finished = False
+        self._thread = Thread(target=self._capture_loop, name='LatestFrameCapture', daemon=True)
+        self._thread.start()
+        logger.info(f"Живой захват запущен ({type(self.source).__name__}, "
+                     f"{'с частотой ' + str(self.camera_config.fps) + ' FPS' if self.pace else 'без ограничения частоты'})")
+        return self.camera_config
+
+    def _capture_loop(self):
+        """Поток захвата: чтение кадров и замена последнего"""
+        period = 1.0 / self.camera_config.fps if self.pace and self.camera_config.fps else 0.0
+        next_deadline = time.perf_counter()
+
+        try:
+            while self._running:
+                if period:
+                    delay = next_deadline - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_deadline = max(next_deadline + period, time.perf_counter() - period)
+
+                frames = self.source.get_frames()
+                if frames is None:
+                    break
+
+                captured_at = time.perf_counter()
+                depth, color, _ = frames
+                if self.source.reuses_buffers:
+                    depth = depth.copy() if depth is not None else None
+                    color = color.copy() if color is not None else None
+                with self._condition:
+                    self._latest = (depth, color, (captured_at - self._start_time) * 1000)
+                    self._latest_sequence += 1
+                    self.captured_frames += 1
+                    self._condition.notify()
+        except Exception as e:
+            logger.error(f"Ошибка захвата кадра: {e}")
+        finally:
+            with self._condition:
+                self._finished = True
+                self._condition.notify_all()
+
+    def get_frames(self) -> Optional[Frames]:
+        """Самый свежий кадр; None - поток захвата завершен или остановлен"""
+        with self._condition:
+            # Зависание камеры - не конец потока: ожидание продолжается,
+            # пока поток захвата работает (stalled - нет кадров дольше timeout)
+            while not self._condition.wait_for(
+                    lambda: self._latest_sequence > self._consumed_sequence
+                    or self._finished or not self._running,
+                    timeout=self.timeout):
+                self.stalled = True
+                self.stall_count += 1
+                logger.warning(f"Нет новых кадров за {self.timeout:.1f} с, ожидание продолжается")
+            if self.stalled:
+                logger.info("Кадры снова поступают")
+                self.stalled = False
+            if self._latest_sequence == self._consumed_sequence:
+                return None
+
+            self.skipped_frames += self._latest_sequence - self._consumed_sequence - 1
+            self._consumed_sequence = self._latest_sequence
+            frames = self._latest
+            self._latest = None
+
+        self.delivered_frames += 1
+
+        # Возраст кадра на момент выдачи в обработку
+        self.last_age = time.perf_counter() - self._start_time - frames[2] / 1000
+        if self.timers is not None:
+            self.timers.record('capture_age', self.last_age)
+
+        return frames
+
+    def stop(self):
+        """Остановка захвата и вложенного источника"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout)
+            self._thread = None
+        self.source.stop()
+
+        if self.captured_frames:
+            logger.info(f"Живой захват: захвачено {self.captured_frames}, "
+                        f"обработано {self.delivered_frames}, пропущено {self.skipped_frames}")
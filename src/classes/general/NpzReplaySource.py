@@ -0,0 +1,88 @@
+import numpy as np
+from os import path
+from typing import Optional
+import logging
+
+from src.classes.general.FrameSource import FrameSource
+from src.classes.general.data.CameraConfig import CameraConfig
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class NpzReplaySource(FrameSource):
+    """
+    Воспроизведение кадров из .npz файла.
+
+    Ожидаемые массивы: 'color' (N, H, W, 3) uint8, 'timestamps' (N,),
+    опционально 'depth' (N, H, W) uint16, 'fps' и 'depth_scale'.
+    """
+
+    def __init__(self, npz_path: str, loop: bool = False):
+        self.npz_path = npz_path
+        self.loop = loop
+        self.color: Optional[np.ndarray] = None
+        self.depth: Optional[np.ndarray] = None
+        self.timestamps: Optional[np.ndarray] = None
+        self.frame_total = 0
+        self.position = 0
+        self._loop_offset = 0.0
+
+    @staticmethod
+    def save(npz_path: str, color: np.ndarray, timestamps: np.ndarray,
+             depth: Optional[np.ndarray] = None, fps: int = 30, depth_scale: float = 0.001):
+        """Сохранение записи для последующего воспроизведения"""
+        arrays = {'color': color, 'timestamps': np.asarray(timestamps, dtype=np.float64),
+                  'fps': np.int32(fps), 'depth_scale': np.float64(depth_scale)}
+        if depth is not None:
+            arrays['depth'] = depth
+        np.savez(npz_path, **arrays)
+
+    def initialize(self) -> CameraConfig:
+        """Загрузка записи"""
+        with np.load(self.npz_path) as data:
+            self.color = data['color']
+            self.timestamps = data['timestamps']
+            self.depth = data['depth'] if 'depth' in data else None
+            fps = int(data['fps']) if 'fps' in data else 30
+            depth_scale = float(data['depth_scale']) if 'depth_scale' in data else 0.0
+
+        self.frame_total = len(self.color)
+        self.position = 0
+        self._loop_offset = 0.0
+
+        logger.info(f"Запись загружена: {self.npz_path} ({self.frame_total} кадров)")
+        return CameraConfig(
+            width=self.color.shape[2],
+            height=self.color.shape[1],
+            fps=fps,
+            depth_scale=depth_scale
+        )
+
+    def get_frames(self):
+        """Получение следующих кадров; None - конец записи"""
+        if self.position >= self.frame_total:
+            if not self.loop or self.frame_total == 0:
+                return None
+            # Продолжаем временные метки при зацикливании
+            period = self.timestamps[-1] - self.timestamps[0]
+            self._loop_offset += period + (period / max(self.frame_total - 1, 1))
+            self.position = 0
+
+        i = self.position
+        self.position += 1
+        depth = self.depth[i] if self.depth is not None else None
+        return depth, self.color[i], float(self.timestamps[i]) + self._loop_offset
+
+    def seek_frame(self, index: int) -> int:
+        """Переход к кадру по номеру"""
+        self.position = int(np.clip(index, 0, max(self.frame_total - 1, 0)))
+        return self.position
+
+    def stop(self):
+        """Освобождение массивов"""
+        self.color = None
+        self.depth = None
@@ -0,0 +1,225 @@
+import cv2
+import time
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import path
+from threading import Condition, Lock, Thread
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, unquote
+import logging
+
+from src.classes.general.FrameMailbox import FrameMailbox
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class PreviewServer:
+    """
+    Локальный HTTP-сервер предпросмотра (MJPEG).
+
+    Процессоры отправляют аннотированные кадры через post(name, frame), как
+    в DisplayCompositor. Отдельный поток кодирует каждый поток в JPEG один
+    раз, с уменьшенной частотой и разрешением; готовый JPEG раздается всем
+    клиентам (multipart/x-mixed-replace). Медленный клиент получает только
+    последний кадр и не тормозит ни кодирование, ни детекцию.
+
+    Адреса: / - страница со всеми потоками, /stream/<имя> - MJPEG,
+    /snapshot/<имя> - последний кадр JPEG.
+    """
+
+    BOUNDARY = 'frame'
+
+    def __init__(self, host: str = '0.0.0.0', port: int = 8080, max_fps: float = 10.0,
+                 max_width: int = 640, quality: int = 70):
+        self.host = host
+        self.port = port
+        self.max_fps = max_fps
+        self.max_width = max_width
+        self.quality = quality
+
+        self._mailboxes: Dict[str, FrameMailbox] = {}
+        self._mailboxes_lock = Lock()
+
+        # Последний JPEG каждого потока: (номер, байты)
+        self._encoded: Dict[str, Tuple[int, bytes]] = {}
+        self._encoded_ready = Condition()
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._server_thread: Optional[Thread] = None
+        self._encoder_thread: Optional[Thread] = None
+        self._running = False
+
+        self.encoded_frames = 0
+
+    def post(self, name: str, frame: Optional[np.ndarray]):
+        """Отправка кадра в поток name (не блокирует)"""
+        if frame is None:
+            return
+        with self._mailboxes_lock:
+            mailbox = self._mailboxes.get(name)
+            if mailbox is None:
+                mailbox = FrameMailbox()
+                self._mailboxes[name] = mailbox
+        mailbox.post(frame)
+
+    @property
+    def streams(self):
+        """Имена потоков, для которых уже есть кадр"""
+        with self._encoded_ready:
+            return list(self._encoded)
+
+    def start(self):
+        """Запуск кодировщика и HTTP-сервера"""
+        if self._running:
+            return
+        self._running = True
+
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        # Фактический порт (при port=0 выбирается свободный)
+        self.port = self._server.server_address[1]
+
+        self._encoder_thread = Thread(target=self._encode_loop, name='PreviewEncoder', daemon=True)
+        self._encoder_thread.start()
+        self._server_thread = Thread(target=self._server.serve_forever, name='PreviewServer', daemon=True)
+        self._server_thread.start()
+
+        logger.info(f"Сервер предпросмотра: http://{self.host}:{self.port}/ "
+                    f"(до {self.max_fps:.0f} FPS, ширина до {self.max_width} px)")
+
+    def stop(self):
+        """Остановка сервера и отключение клиентов"""
+        if not self._running:
+            return
+        self._running = False
+        with self._encoded_ready:
+            self._encoded_ready.notify_all()
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._encoder_thread.join()
+        self._server_thread.join()
+        logger.info(f"Сервер предпросмотра остановлен (закодировано кадров: {self.encoded_frames})")
+
+    # ---------- Кодирование ----------
+
+    def _encode_loop(self):
+        """Поток кодирования: один JPEG на поток за период"""
+        period = 1.0 / self.max_fps
+        while self._running:
+            started = time.perf_counter()
+
+            with self._mailboxes_lock:
+                mailboxes = list(self._mailboxes.items())
+
+            for name, mailbox in mailboxes:
+                taken = mailbox.take()
+                if taken is None:
+                    continue
+                jpeg = self._encode(taken[0])
+                if jpeg is None:
+                    continue
+                with self._encoded_ready:
+                    sequence = self._encoded.get(name, (0, b''))[0] + 1
+                    self._encoded[name] = (sequence, jpeg)
+                    self._encoded_ready.notify_all()
+                self.encoded_frames += 1
+
+            remaining = period - (time.perf_counter() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    def _encode(self, frame: np.ndarray) -> Optional[bytes]:
+        """Уменьшение и JPEG-кодирование кадра"""
+        height, width = frame.shape[:2]
+        if width > self.max_width:
+            frame = cv2.resize(frame, (self.max_width, int(round(height * self.max_width / width))),
+                               interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        return buffer.tobytes() if ok else None
+
+    def _wait_frame(self, name: str, last_sequence: int, timeout: float = 1.0) -> Optional[Tuple[int, bytes]]:
+        """Ожидание JPEG новее last_sequence (None - нет или сервер остановлен)"""
+        with self._encoded_ready:
+            self._encoded_ready.wait_for(
+                lambda: not self._running or self._encoded.get(name, (0,))[0] > last_sequence,
+                timeout=timeout
+            )
+            encoded = self._encoded.get(name)
+            if not self._running or encoded is None or encoded[0] <= last_sequence:
+                return None
+            return encoded
+
+    # ---------- HTTP ----------
+
+    def _make_handler(self):
+        """Класс обработчика запросов, привязанный к серверу"""
+        preview = self
+
+        class PreviewHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path in ('/', '/index.html'):
+                    self._send_index()
+                elif self.path.startswith('/stream/'):
+                    self._send_stream(unquote(self.path[len('/stream/'):]))
+                elif self.path.startswith('/snapshot/'):
+                    self._send_snapshot(unquote(self.path[len('/snapshot/'):]))
+                else:
+                    self.send_error(404)
+
+            def _send_index(self):
+                images = ''.join(
+                    f'<div><h3>{name}</h3><img src="/stream/{quote(name)}"></div>'
+                    for name in preview.streams
+                )
+                body = (f'<html><head><meta charset="utf-8"><title>BallDetecting</title></head>'
+                        f'<body>{images or "Нет потоков"}</body></html>').encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_snapshot(self, name: str):
+                encoded = preview._encoded.get(name)
+                if encoded is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/jpeg')
+                self.send_header('Content-Length', str(len(encoded[1])))
+                self.end_headers()
+                self.wfile.write(encoded[1])
+
+            def _send_stream(self, name: str):
+                self.send_response(200)
+                self.send_header('Content-Type',
+                                 f'multipart/x-mixed-replace; boundary={preview.BOUNDARY}')
+                self.send_header('Cache-Control', 'no-cache')
+                self.end_headers()
+
+                last_sequence = 0
+                try:
+                    while preview._running:
+                        encoded = preview._wait_frame(name, last_sequence)
+                        if encoded is None:
+                            continue
+                        # Клиент получает последний готовый кадр, промежуточные пропускаются
+                        last_sequence, jpeg = encoded
+                        self.wfile.write(
+                            f'--{preview.BOUNDARY}\r\nContent-Type: image/jpeg\r\n'
+                            f'Content-Length: {len(jpeg)}\r\n\r\n'.encode('ascii'))
+                        self.wfile.write(jpeg)
+                        self.wfile.write(b'\r\n')
+                except (BrokenPipeError, ConnectionResetError):
+                    logger.debug(f"Клиент предпросмотра отключился: {self.client_address}")
+
+            def log_message(self, format, *args):
+                logger.debug(f"Предпросмотр {self.client_address[0]}: {format % args}")
+
+        return PreviewHandler
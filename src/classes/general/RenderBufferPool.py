@@ -0,0 +1,44 @@
+import numpy as np
+from os import path
+from typing import List
+import logging
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class RenderBufferPool:
+    """
+    Кольцо переиспользуемых буферов для отрисовки.
+
+    Вместо frame.copy() кадр копируется в заранее выделенный буфер (без
+    выделения памяти на каждом кадре). Отрисованный кадр уходит в
+    FrameMailbox (окно, предпросмотр), где его берут по ссылке, поэтому
+    буфер перезаписывается только через count кадров: потребители забирают
+    последний кадр и сразу уменьшают/кодируют его.
+    """
+
+    def __init__(self, count: int = 3):
+        self.count = count
+        self._buffers: List[np.ndarray] = []
+        self._next = 0
+
+    def acquire(self, shape: tuple, dtype=np.uint8) -> np.ndarray:
+        """Следующий буфер заданной формы и типа (содержимое не задано)"""
+        if not self._buffers or self._buffers[0].shape != shape \
+                or self._buffers[0].dtype != dtype:
+            self._buffers = [np.empty(shape, dtype=dtype) for _ in range(self.count)]
+            self._next = 0
+
+        buffer = self._buffers[self._next]
+        self._next = (self._next + 1) % self.count
+        return buffer
+
+    def copy(self, frame: np.ndarray) -> np.ndarray:
+        """Копия кадра в буфере кольца"""
+        buffer = self.acquire(frame.shape, frame.dtype)
+        np.copyto(buffer, frame)
+        return buffer
@@ -0,0 +1,200 @@
+import numpy as np
+from multiprocessing import shared_memory
+from os import path
+from typing import Optional
+import logging
+
+from src.classes.general.data.DetectionBatch import DetectionBatch
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RING_MAGIC = b'BDRING01'
+
+# Общий заголовок кольца
+RING_HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('slot_count', '<u4'),
+    ('width', '<u4'),
+    ('height', '<u4'),
+    ('has_depth', '<u4'),
+    ('max_detections', '<u4'),
+    ('_pad', '<u4'),
+    ('slot_size', '<u8'),
+    ('published', '<u8'),  # Число опубликованных кадров
+])
+
+# Заголовок слота: sequence - seqlock (нечетный во время записи,
+# 2 * (номер публикации + 1) после записи)
+SLOT_HEADER_DTYPE = np.dtype([
+    ('sequence', '<u8'),
+    ('frame_number', '<i8'),
+    ('timestamp', '<f8'),
+    ('detection_count', '<u4'),
+    ('_pad', '<u4'),
+])
+
+# Детекция в кольце
+RING_DETECTION_DTYPE = np.dtype([
+    ('x', '<i4'), ('y', '<i4'),
+    ('box_x', '<i4'), ('box_y', '<i4'), ('box_width', '<i4'), ('box_height', '<i4'),
+    ('area', '<f4'),
+    ('distance', '<f8'),
+    ('pos_x', '<f8'), ('pos_y', '<f8'), ('pos_z', '<f8'),
+    ('vel_x', '<f8'), ('vel_y', '<f8'), ('vel_z', '<f8'),
+])
+
+
+def align_size(size: int, alignment: int = 64) -> int:
+    """Выравнивание размера части буфера"""
+    return (size + alignment - 1) // alignment * alignment
+
+
+def slot_layout(width: int, height: int, has_depth: bool, max_detections: int) -> dict:
+    """Смещения частей слота и его размер"""
+    layout = {}
+    offset = align_size(SLOT_HEADER_DTYPE.itemsize)
+    for name, size in (('color', width * height * 3),
+                       ('mask', width * height),
+                       ('depth', width * height * 2 if has_depth else 0),
+                       ('detections', max_detections * RING_DETECTION_DTYPE.itemsize)):
+        layout[name] = offset
+        offset += align_size(size)
+    layout['size'] = offset
+    return layout
+
+
+class SharedFrameRing:
+    """
+    Кольцевой буфер кадров и детекций в разделяемой памяти (писатель).
+
+    Каждый кадр публикуется в очередной слот: цветной кадр, маска, глубина
+    (для камеры глубины) и детекции. Слот защищен seqlock-счетчиком:
+    писатель никогда не ждет читателей, читатель (SharedFrameRingReader)
+    проверяет счетчик до и после чтения и отбрасывает перезаписанный слот.
+    Читатели подключаются по имени из любого локального процесса.
+    """
+
+    def __init__(self, name: str, width: int, height: int, has_depth: bool = False,
+                 slot_count: int = 8, max_detections: int = 64):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.has_depth = has_depth
+        self.slot_count = slot_count
+        self.max_detections = max_detections
+
+        self.layout = slot_layout(width, height, has_depth, max_detections)
+        self.header_size = align_size(RING_HEADER_DTYPE.itemsize)
+        size = self.header_size + slot_count * self.layout['size']
+
+        # Остатки после аварийного завершения удаляются
+        try:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            logger.warning(f"Удален старый сегмент разделяемой памяти: {name}")
+        except FileNotFoundError:
+            pass
+
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        buffer = self._shm.buf
+
+        self.header = np.ndarray((), dtype=RING_HEADER_DTYPE, buffer=buffer)
+        self.header['magic'] = RING_MAGIC
+        self.header['slot_count'] = slot_count
+        self.header['width'] = width
+        self.header['height'] = height
+        self.header['has_depth'] = int(has_depth)
+        self.header['max_detections'] = max_detections
+        self.header['slot_size'] = self.layout['size']
+        self.header['published'] = 0
+
+        # Представления частей всех слотов
+        self._slots = [self._slot_views(buffer, i) for i in range(slot_count)]
+        self.published = 0
+        self.truncated_frames = 0
+
+        logger.info(f"Кольцо кадров '{name}': {slot_count} слотов по "
+                    f"{self.layout['size'] / 1e6:.1f} МБ")
+
+    def _slot_views(self, buffer, index: int) -> dict:
+        base = self.header_size + index * self.layout['size']
+        shape = (self.height, self.width)
+        views = {
+            'header': np.ndarray((), dtype=SLOT_HEADER_DTYPE, buffer=buffer, offset=base),
+            'color': np.ndarray(shape + (3,), dtype=np.uint8, buffer=buffer,
+                                offset=base + self.layout['color']),
+            'mask': np.ndarray(shape, dtype=np.uint8, buffer=buffer,
+                               offset=base + self.layout['mask']),
+            'detections': np.ndarray(self.max_detections, dtype=RING_DETECTION_DTYPE, buffer=buffer,
+                                     offset=base + self.layout['detections']),
+        }
+        if self.has_depth:
+            views['depth'] = np.ndarray(shape, dtype=np.uint16, buffer=buffer,
+                                        offset=base + self.layout['depth'])
+        return views
+
+    def publish(self, frame_number: int, timestamp: float, color: np.ndarray,
+                mask: Optional[np.ndarray], detections: DetectionBatch,
+                depth: Optional[np.ndarray] = None):
+        """Публикация кадра (без ожидания читателей)"""
+        index = self.published
+        slot = self._slots[index % self.slot_count]
+        header = slot['header']
+
+        # Начало записи: нечетный счетчик
+        header['sequence'] = 2 * index + 1
+
+        # Серый кадр дублируется в три канала
+        slot['color'][...] = color if color.ndim == 3 else color[:, :, None]
+        if mask is not None:
+            slot['mask'][...] = mask
+        else:
+            slot['mask'].fill(0)
+        if self.has_depth and depth is not None:
+            slot['depth'][...] = depth
+
+        count = min(len(detections), self.max_detections)
+        if count < len(detections):
+            self.truncated_frames += 1
+        self._fill_detections(slot['detections'][:count], detections, count)
+
+        header['frame_number'] = frame_number
+        header['timestamp'] = timestamp
+        header['detection_count'] = count
+
+        # Конец записи: четный счетчик, затем общий счетчик публикаций
+        header['sequence'] = 2 * index + 2
+        self.published = index + 1
+        self.header['published'] = self.published
+
+    @staticmethod
+    def _fill_detections(target: np.ndarray, detections: DetectionBatch, count: int):
+        """Копирование колонок пакета детекций"""
+        if count == 0:
+            return
+        centers, boxes = detections.centers[:count], detections.boxes[:count]
+        positions, velocities = detections.positions[:count], detections.velocities[:count]
+        target['x'], target['y'] = centers[:, 0], centers[:, 1]
+        target['box_x'], target['box_y'] = boxes[:, 0], boxes[:, 1]
+        target['box_width'], target['box_height'] = boxes[:, 2], boxes[:, 3]
+        target['area'] = detections.areas[:count]
+        target['distance'] = detections.distances[:count]
+        target['pos_x'], target['pos_y'], target['pos_z'] = positions.T
+        target['vel_x'], target['vel_y'], target['vel_z'] = velocities.T
+
+    def close(self):
+        """Удаление сегмента (подключенные читатели сохраняют отображение)"""
+        if self._shm is None:
+            return
+        self._slots = []
+        self.header = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+        logger.info(f"Кольцо кадров '{self.name}' закрыто: опубликовано {self.published}"
+                    + (f", детекции обрезаны на {self.truncated_frames} кадрах" if self.truncated_frames else ""))
@@ -0,0 +1,170 @@
+import time
+import numpy as np
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from os import path
+from typing import Optional
+import logging
+
+from src.classes.general.SharedFrameRing import (
+    RING_DETECTION_DTYPE, RING_HEADER_DTYPE, RING_MAGIC, SLOT_HEADER_DTYPE, slot_layout, align_size
+)
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RingFrame:
+    """Кадр из кольца (массивы - представления разделяемой памяти, если copy=False)"""
+    index: int
+    frame_number: int
+    timestamp: float
+    color: np.ndarray
+    mask: np.ndarray
+    depth: Optional[np.ndarray]
+    detections: np.ndarray
+
+
+class SharedFrameRingReader:
+    """
+    Читатель кольца кадров SharedFrameRing из другого процесса.
+
+    read(index, copy=False) отдает представления памяти слота без
+    копирования; такие данные действительны, пока is_valid(frame) == True
+    (писатель мог перезаписать слот). При copy=True данные копируются и
+    проверяются сразу. Читатель никак не замедляет писателя.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._shm = self._attach(name)
+        buffer = self._shm.buf
+
+        self.header = np.ndarray((), dtype=RING_HEADER_DTYPE, buffer=buffer)
+        if bytes(self.header['magic']) != RING_MAGIC:
+            self._shm.close()
+            raise ValueError(f"Сегмент '{name}' не является кольцом кадров")
+
+        self.slot_count = int(self.header['slot_count'])
+        self.width = int(self.header['width'])
+        self.height = int(self.header['height'])
+        self.has_depth = bool(self.header['has_depth'])
+        self.max_detections = int(self.header['max_detections'])
+        self.layout = slot_layout(self.width, self.height, self.has_depth, self.max_detections)
+        self.header_size = align_size(RING_HEADER_DTYPE.itemsize)
+
+        self._slot_headers = [
+            np.ndarray((), dtype=SLOT_HEADER_DTYPE, buffer=buffer,
+                       offset=self.header_size + i * self.layout['size'])
+            for i in range(self.slot_count)
+        ]
+
+        # Следующий ожидаемый кадр (для next_frame)
+        self.position = self.published
+        self.dropped_frames = 0
+
+        logger.info(f"Подключено к кольцу '{name}': {self.width}x{self.height}, "
+                    f"{self.slot_count} слотов")
+
+    @staticmethod
+    def _attach(name: str) -> shared_memory.SharedMemory:
+        """Подключение без регистрации в resource_tracker (сегмент удаляет писатель)"""
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        except Exception:
+            pass
+        return shm
+
+    @property
+    def published(self) -> int:
+        """Число опубликованных писателем кадров"""
+        return int(self.header['published'])
+
+    def read(self, index: int, copy: bool = False) -> Optional[RingFrame]:
+        """Кадр с номером публикации index; None - еще не записан или уже перезаписан"""
+        slot_header = self._slot_headers[index % self.slot_count]
+        expected = 2 * index + 2
+        if int(slot_header['sequence']) != expected:
+            return None
+
+        base = self.header_size + (index % self.slot_count) * self.layout['size']
+        buffer = self._shm.buf
+        shape = (self.height, self.width)
+        count = int(slot_header['detection_count'])
+
+        color = np.ndarray(shape + (3,), dtype=np.uint8, buffer=buffer, offset=base + self.layout['color'])
+        mask = np.ndarray(shape, dtype=np.uint8, buffer=buffer, offset=base + self.layout['mask'])
+        depth = None
+        if self.has_depth:
+            depth = np.ndarray(shape, dtype=np.uint16, buffer=buffer, offset=base + self.layout['depth'])
+        detections = np.ndarray(count, dtype=RING_DETECTION_DTYPE, buffer=buffer,
+                                offset=base + self.layout['detections'])
+
+        frame = RingFrame(index, int(slot_header['frame_number']), float(slot_header['timestamp']),
+                          color, mask, depth, detections)
+
+        if copy:
+            frame.color, frame.mask = color.copy(), mask.copy()
+            frame.depth = depth.copy() if depth is not None else None
+            frame.detections = detections.copy()
+
+        # Проверка, что слот не начали перезаписывать во время чтения
+        if not self.is_valid(frame):
+            return None
+        return frame
+
+    def is_valid(self, frame: RingFrame) -> bool:
+        """Не перезаписан ли слот кадра (для данных без копирования)"""
+        return int(self._slot_headers[frame.index % self.slot_count]['sequence']) == 2 * frame.index + 2
+
+    def latest(self, copy: bool = False) -> Optional[RingFrame]:
+        """Последний опубликованный кадр"""
+        published = self.published
+        if published == 0:
+            return None
+        return self.read(published - 1, copy)
+
+    def next_frame(self, copy: bool = False, timeout: float = 1.0,
+                   poll_interval: float = 0.001) -> Optional[RingFrame]:
+        """
+        Следующий кадр по порядку. Если читатель отстал больше чем на
+        размер кольца, пропущенные кадры учитываются в dropped_frames.
+        """
+        deadline = time.perf_counter() + timeout
+        while True:
+            published = self.published
+            if published > self.position:
+                # Отставание: переход к самому старому живому слоту
+                oldest = published - self.slot_count + 1
+                if self.position < oldest:
+                    self.dropped_frames += oldest - self.position
+                    self.position = oldest
+
+                frame = self.read(self.position, copy)
+                if frame is not None:
+                    self.position += 1
+                    return frame
+                # Слот перезаписан во время чтения - повтор
+                continue
+
+            if time.perf_counter() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+    def close(self):
+        """Отключение от кольца"""
+        if self._shm is None:
+            return
+        self._slot_headers = []
+        self.header = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # Остались кадры без копирования: память освободится вместе с ними
+            logger.warning("Кольцо кадров закрыто при живых представлениях памяти")
+        self._shm = None
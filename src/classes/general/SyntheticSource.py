@@ -0,0 +1,193 @@
+import csv
+import cv2
+import numpy as np
+from os import path
+from typing import Optional, Tuple
+import logging
+
+from src.classes.general.FrameSource import FrameSource
+from src.classes.general.data.CameraConfig import CameraConfig
+from src.classes.general.data.Intrinsics import Intrinsics
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SyntheticSource(FrameSource):
+    """
+    Детерминированный синтетический источник: мяч летает над столом.
+
+    Цветной кадр и согласованная с ним глубина (uint16, масштаб depth_scale)
+    генерируются по заранее рассчитанной траектории. Между розыгрышами
+    есть паузы без мяча. Истинные положения мяча и моменты касаний
+    доступны через write_ground_truth.
+    """
+
+    def __init__(self, width: int = 848, height: int = 480, fps: int = 30,
+                 frame_total: int = 600, seed: int = 0, ball_radius: int = 5,
+                 crossing_frames: int = 24, crossings_per_rally: int = 4,
+                 idle_frames: int = 30, bounce_y: int = 285,
+                 ball_distance: float = 1.8, table_distance: float = 2.8,
+                 background_distance: float = 4.0, depth_scale: float = 0.001,
+                 start_timestamp: float = 0.0):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_total = frame_total
+        self.seed = seed
+        self.ball_radius = ball_radius
+        self.crossing_frames = crossing_frames
+        self.crossings_per_rally = crossings_per_rally
+        self.idle_frames = idle_frames
+        self.bounce_y = bounce_y
+        self.ball_distance = ball_distance
+        self.table_distance = table_distance
+        self.background_distance = background_distance
+        self.depth_scale = depth_scale
+        self.start_timestamp = start_timestamp
+
+        self.position = 0
+
+        # Траектория мяча
+        self.xs, self.ys, self.visible, self.bounces = self._build_trajectory()
+
+        # Статичный фон
+        self.color_background, self.depth_background = self._render_background()
+        self._depth_noise = self._build_depth_noise()
+
+    def _build_trajectory(self):
+        """Расчет положения мяча для всех кадров"""
+        rng = np.random.default_rng(self.seed)
+        n = self.frame_total
+        xs = np.zeros(n, dtype=np.float64)
+        ys = np.zeros(n, dtype=np.float64)
+        visible = np.zeros(n, dtype=bool)
+        bounces = np.zeros(n, dtype=bool)
+
+        left, right = 0.15 * self.width, 0.9 * self.width
+        rally_length = self.crossing_frames * self.crossings_per_rally + self.idle_frames
+
+        for i in range(n):
+            t_rally = i % rally_length
+            if t_rally >= self.crossing_frames * self.crossings_per_rally:
+                continue
+
+            crossing, t = divmod(t_rally, self.crossing_frames)
+            # Параметры удара постоянны в пределах перелета
+            crossing_rng = np.random.default_rng((self.seed, i // rally_length, crossing))
+            height_before = crossing_rng.uniform(60, 120)
+            height_after = crossing_rng.uniform(40, 90)
+
+            progress = t / (self.crossing_frames - 1)
+            direction = 1 if crossing % 2 == 0 else -1
+            xs[i] = left + (right - left) * (progress if direction > 0 else 1 - progress)
+
+            tb = int(round(0.6 * (self.crossing_frames - 1)))
+            if t <= tb:
+                ys[i] = self.bounce_y - height_before * (1 - (t / tb) ** 2)
+            else:
+                rest = (self.crossing_frames - 1) - tb
+                ys[i] = self.bounce_y - height_after * (1 - ((self.crossing_frames - 1 - t) / rest) ** 2)
+
+            visible[i] = True
+            bounces[i] = t == tb
+
+        # Небольшой детерминированный шум положения
+        xs += rng.normal(0, 0.3, n)
+        ys += rng.normal(0, 0.3, n)
+        return xs, ys, visible, bounces
+
+    def _render_background(self):
+        """Отрисовка стола и фона (цвет и глубина)"""
+        color = np.full((self.height, self.width, 3), (60, 60, 60), dtype=np.uint8)
+        depth = np.full((self.height, self.width),
+                        int(self.background_distance / self.depth_scale), dtype=np.uint16)
+
+        table = np.array([
+            [int(0.11 * self.width), self.bounce_y + 15],
+            [int(0.93 * self.width), self.bounce_y + 15],
+            [self.width - 1, self.height - 1],
+            [0, self.height - 1]
+        ], dtype=np.int32)
+        cv2.fillPoly(color, [table], (90, 60, 20))
+        cv2.line(color, (self.width // 2, self.bounce_y + 15), (self.width // 2, self.height - 1),
+                 (230, 230, 230), 2)
+        cv2.fillPoly(depth, [table], int(self.table_distance / self.depth_scale))
+        return color, depth
+
+    def _build_depth_noise(self) -> np.ndarray:
+        """Набор шумовых кадров глубины (циклически повторяется)"""
+        rng = np.random.default_rng(self.seed + 1)
+        return rng.integers(-5, 6, size=(8, self.height, self.width)).astype(np.int16)
+
+    def initialize(self) -> CameraConfig:
+        """Параметры синтетического потока"""
+        self.position = 0
+        return CameraConfig(
+            width=self.width,
+            height=self.height,
+            fps=self.fps,
+            depth_scale=self.depth_scale,
+            intrinsics=Intrinsics(
+                width=self.width, height=self.height,
+                fx=0.75 * self.width, fy=0.75 * self.width,
+                ppx=self.width / 2, ppy=self.height / 2
+            )
+        )
+
+    def timestamp(self, index: int) -> float:
+        """Временная метка кадра (мс)"""
+        return self.start_timestamp + index * 1000.0 / self.fps
+
+    def get_frames(self):
+        """Генерация следующего кадра; None - конец потока"""
+        if self.position >= self.frame_total:
+            return None
+
+        i = self.position
+        self.position += 1
+
+        color = self.color_background.copy()
+        depth = (self.depth_background + self._depth_noise[i % len(self._depth_noise)]).astype(np.uint16)
+
+        if self.visible[i]:
+            center = (int(round(self.xs[i])), int(round(self.ys[i])))
+            cv2.circle(color, center, self.ball_radius, (0, 140, 255), -1)
+            cv2.circle(depth, center, self.ball_radius, int(self.ball_distance / self.depth_scale), -1)
+
+        return depth, color, self.timestamp(i)
+
+    def seek_frame(self, index: int) -> int:
+        """Переход к кадру по номеру"""
+        self.position = int(np.clip(index, 0, self.frame_total))
+        return self.position
+
+    def depth_visible(self, roi_polygon: Optional[np.ndarray] = None,
+                      distance_range: Optional[Tuple[float, float]] = None) -> np.ndarray:
+        """Кадры, где мяч (круг) задевает ROI и находится в диапазоне расстояний камеры глубины"""
+        visible = self.visible.copy()
+        if distance_range is not None:
+            distance_min, distance_max = distance_range
+            visible &= distance_min < self.ball_distance < distance_max
+        if roi_polygon is not None:
+            polygon = np.asarray(roi_polygon, dtype=np.float32)
+            for i in np.flatnonzero(visible):
+                center = (float(self.xs[i]), float(self.ys[i]))
+                visible[i] = cv2.pointPolygonTest(polygon, center, True) >= -self.ball_radius
+        return visible
+
+    def write_ground_truth(self, csv_path: str, roi_polygon: Optional[np.ndarray] = None,
+                           distance_range: Optional[Tuple[float, float]] = None):
+        """Запись истинных положений мяча и касаний стола (depth_visible - по ROI и диапазону)"""
+        depth_visible = self.depth_visible(roi_polygon, distance_range)
+        with open(csv_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['frame', 'timestamp', 'x', 'y', 'visible', 'bounce', 'depth_visible'])
+            for i in range(self.frame_total):
+                writer.writerow([i, self.timestamp(i), round(float(self.xs[i]), 2),
+                                 round(float(self.ys[i]), 2), int(self.visible[i]), int(self.bounces[i]),
+                                 int(depth_visible[i])])
+        logger.info(f"Эталонная разметка записана: {csv_path}")
@@ -1,4 +1,7 @@
+import csv
 import cv2
+from os import path
+from typing import List, Optional, Tuple
 import logging
 
 from src.classes.general.data.CameraConfig import CameraConfig
@@ -8,7 +11,19 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class VideoWriterManager:
-    """Менеджер для записи видео"""
+    """
+    Менеджер для записи видео.
+
+    Вывод может делиться на сегменты (rotate): сегмент 0 пишется в
+    исходные пути, сегмент N - в <имя>_partNNN<расширение>. Закрытый
+    сегмент - целый mp4, поэтому при возобновлении после сбоя запись
+    продолжается в новый сегмент.
+
+    Кадры без отладочного кадра (простой, пропуск кодирования маски) в
+    отладочное видео не пишутся. Их номера в основном видео (сквозные по
+    сегментам) сохраняются интервалами в <отладочное видео сегмента>_skipped.csv
+    при закрытии сегмента - по ним кадры двух файлов сопоставляются.
+    """
 
     def __init__(self, output_path: str, debug_path: str, config: CameraConfig):
         self.output_path = output_path
@@ -17,38 +32,93 @@ class VideoWriterManager:
         self.output_writer = None
         self.debug_writer = None
 
-    def initialize(self):
-        """Инициализация видеозаписывающих устройств"""
+        # Текущий сегмент и число записанных кадров во всех сегментах
+        self.segment = 0
+        self.frames_written = 0
+
+        # Интервалы кадров без отладочного кадра в текущем сегменте (первый, последний)
+        self.skipped_ranges: List[Tuple[int, int]] = []
+        self._skip_start: Optional[int] = None
+
+    @staticmethod
+    def segment_path(file_path: str, segment: int) -> str:
+        """Путь файла сегмента"""
+        if segment == 0:
+            return file_path
+        base, extension = path.splitext(file_path)
+        return f"{base}_part{segment:03d}{extension}"
+
+    def initialize(self, segment: int = 0):
+        """Инициализация видеозаписывающих устройств для сегмента"""
         fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self.segment = segment
+        output_path = self.segment_path(self.output_path, segment)
+        debug_path = self.segment_path(self.debug_path, segment)
 
         self.output_writer = cv2.VideoWriter(
-            self.output_path,
+            output_path,
             fourcc,
             self.config.fps,
             (self.config.width, self.config.height)
         )
 
         self.debug_writer = cv2.VideoWriter(
-            self.debug_path,
+            debug_path,
             fourcc,
             self.config.fps,
             (self.config.width, self.config.height)
         )
 
         if not self.output_writer.isOpened():
-            raise RuntimeError(f"Не удалось открыть видеовывод: {self.output_path}")
+            raise RuntimeError(f"Не удалось открыть видеовывод: {output_path}")
+
+        logger.info(f"Видеовыводы инициализированы: {output_path}, {debug_path}")
 
-        logger.info(f"Видеовыводы инициализированы: {self.output_path}, {self.debug_path}")
+    def rotate(self):
+        """Закрытие текущего сегмента и переход к следующему"""
+        self.release()
+        self.initialize(self.segment + 1)
+
+    def write(self, frame, debug_frame=None):
+        """Запись кадров (debug_frame=None - отладочный кадр не кодируется, номер кадра запоминается)"""
+        if len(frame.shape) == 2:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        self.output_writer.write(frame)
+        index = self.frames_written
+        self.frames_written += 1
+
+        if debug_frame is None:
+            if self._skip_start is None:
+                self._skip_start = index
+            return
+        self._end_skip(index - 1)
 
-    def write(self, frame, debug_frame):
-        """Запись кадров"""
         if len(debug_frame.shape) == 2:
             debug_frame = cv2.cvtColor(debug_frame, cv2.COLOR_GRAY2BGR)
-        self.output_writer.write(frame)
         self.debug_writer.write(debug_frame)
 
+    def _end_skip(self, last_index: int):
+        """Завершение интервала кадров без отладочного кадра"""
+        if self._skip_start is not None:
+            self.skipped_ranges.append((self._skip_start, last_index))
+            self._skip_start = None
+
+    def _save_skipped(self):
+        """Запись интервалов пропущенных отладочных кадров сегмента"""
+        self._end_skip(self.frames_written - 1)
+        if not self.skipped_ranges:
+            return
+        skipped_path = path.splitext(self.segment_path(self.debug_path, self.segment))[0] + '_skipped.csv'
+        with open(skipped_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['start_frame', 'end_frame'])
+            writer.writerows(self.skipped_ranges)
+        logger.info(f"Кадры без отладочного кадра ({len(self.skipped_ranges)} интервалов): {skipped_path}")
+        self.skipped_ranges = []
+
     def release(self):
         """Освобождение ресурсов"""
+        self._save_skipped()
         if self.output_writer:
             self.output_writer.release()
         if self.debug_writer:
@@ -1,4 +1,7 @@
 from dataclasses import dataclass
+from typing import Optional
+
+from src.classes.general.data.Intrinsics import Intrinsics
 
 @dataclass
 class CameraConfig:
@@ -6,4 +9,5 @@ class CameraConfig:
     width: int
     height: int
     fps: int
-    depth_scale: float
\ No newline at end of file
+    depth_scale: float
+    intrinsics: Optional[Intrinsics] = None
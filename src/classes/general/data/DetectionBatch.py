@@ -0,0 +1,127 @@
+import numpy as np
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+class DetectionBatch:
+    """
+    Детекции одного кадра в виде параллельных массивов.
+
+    Массивы выделяются один раз и переиспользуются между кадрами (reset),
+    поэтому на кадр не создается ни одного объекта на детекцию. Объекты
+    Detection строятся только по запросу через Detection.from_batch.
+    Время кадра хранится числом (time.time()), строка даты строится только
+    при обращении к datetime.
+    """
+
+    __slots__ = ('frame_number', 'timestamp', 'wall_time', '_size',
+                 '_centers', '_boxes', '_rects', '_areas', '_aspect_ratios',
+                 '_distances', '_positions', '_velocities')
+
+    def __init__(self, capacity: int = 64):
+        self.frame_number = 0
+        self.timestamp = 0.0
+        self.wall_time = 0.0
+        self._size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        """Выделение массивов заданной емкости"""
+        self._centers = np.zeros((capacity, 2), dtype=np.int32)
+        self._boxes = np.zeros((capacity, 4), dtype=np.int32)  # x, y, w, h
+        self._rects = np.zeros((capacity, 5), dtype=np.float32)  # cx, cy, w, h, angle
+        self._areas = np.zeros(capacity, dtype=np.float32)
+        self._aspect_ratios = np.zeros(capacity, dtype=np.float32)
+        self._distances = np.full(capacity, np.nan, dtype=np.float64)
+        self._positions = np.full((capacity, 3), np.nan, dtype=np.float64)
+        self._velocities = np.full((capacity, 3), np.nan, dtype=np.float64)
+
+    def _grow(self):
+        """Удвоение емкости с сохранением данных"""
+        old = (self._centers, self._boxes, self._rects, self._areas,
+               self._aspect_ratios, self._distances, self._positions, self._velocities)
+        self._allocate(2 * len(self._centers))
+        new = (self._centers, self._boxes, self._rects, self._areas,
+               self._aspect_ratios, self._distances, self._positions, self._velocities)
+        for src, dst in zip(old, new):
+            dst[:self._size] = src[:self._size]
+
+    def reset(self, frame_number: int = 0, timestamp: float = 0.0, wall_time: float = 0.0):
+        """Очистка пакета перед новым кадром"""
+        self.frame_number = frame_number
+        self.timestamp = timestamp
+        self.wall_time = wall_time
+        self._size = 0
+
+    def append(self, center: Tuple[int, int], box: Tuple[int, int, int, int],
+               area: float = 0.0, aspect_ratio: float = 0.0,
+               distance: float = np.nan,
+               rect: Optional[Tuple[Tuple[float, float], Tuple[float, float], float]] = None) -> int:
+        """Добавление детекции, возвращает ее индекс"""
+        if self._size == len(self._centers):
+            self._grow()
+
+        i = self._size
+        self._centers[i] = center
+        self._boxes[i] = box
+        self._areas[i] = area
+        self._aspect_ratios[i] = aspect_ratio
+        self._distances[i] = distance
+        self._positions[i] = np.nan
+        self._velocities[i] = np.nan
+        if rect is not None:
+            (cx, cy), (w, h), angle = rect
+            self._rects[i] = (cx, cy, w, h, angle)
+        else:
+            x, y, w, h = box
+            self._rects[i] = (x + w / 2, y + h / 2, w, h, 0.0)
+
+        self._size += 1
+        return i
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def datetime(self) -> str:
+        """Дата и время кадра строкой (по wall_time, '' - время не задано)"""
+        if not self.wall_time:
+            return ''
+        return datetime.fromtimestamp(self.wall_time).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+    @property
+    def centers(self) -> np.ndarray:
+        return self._centers[:self._size]
+
+    @property
+    def boxes(self) -> np.ndarray:
+        return self._boxes[:self._size]
+
+    @property
+    def rects(self) -> np.ndarray:
+        return self._rects[:self._size]
+
+    @property
+    def areas(self) -> np.ndarray:
+        return self._areas[:self._size]
+
+    @property
+    def aspect_ratios(self) -> np.ndarray:
+        return self._aspect_ratios[:self._size]
+
+    @property
+    def distances(self) -> np.ndarray:
+        return self._distances[:self._size]
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self._positions[:self._size]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        return self._velocities[:self._size]
+
+    def rect(self, index: int) -> Tuple[Tuple[float, float], Tuple[float, float], float]:
+        """Повернутый прямоугольник в формате cv2.minAreaRect"""
+        cx, cy, w, h, angle = self._rects[index].tolist()
+        return (cx, cy), (w, h), angle
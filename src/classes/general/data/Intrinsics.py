@@ -0,0 +1,29 @@
+from dataclasses import dataclass, field
+from typing import Tuple
+
+
+@dataclass
+class Intrinsics:
+    """Внутренние параметры камеры (аналог rs.intrinsics)"""
+    width: int
+    height: int
+    fx: float
+    fy: float
+    ppx: float
+    ppy: float
+    model: str = 'none'
+    coeffs: Tuple[float, ...] = field(default=(0.0, 0.0, 0.0, 0.0, 0.0))
+
+    @classmethod
+    def from_realsense(cls, intrin) -> 'Intrinsics':
+        """Создание из объекта pyrealsense2.intrinsics"""
+        return cls(
+            width=intrin.width,
+            height=intrin.height,
+            fx=intrin.fx,
+            fy=intrin.fy,
+            ppx=intrin.ppx,
+            ppy=intrin.ppy,
+            model=str(intrin.model).split('.')[-1],
+            coeffs=tuple(float(c) for c in intrin.coeffs)
+        )
@@ -16,5 +16,60 @@ DEFAULT_CONFIG = {
     'trajectory_length': 30,
     'frame_time_buffer_size': 100,
     'dilation_kernel_size': (3, 3),
-    'gaussian_blur_size': (5, 5)
+    'gaussian_blur_size': (5, 5),
+    'camera_name': 'default_cam',  # Имя камеры в метриках и реестре камер
+    'table': 'table',  # Стол (пара камер) в реестре камер
+    'display': True,  # Показывать окна OpenCV (False - headless)
+    'live_capture': False,  # Живой режим: поток захвата, обрабатывается последний кадр
+    'live_pace': True,  # В живом режиме читать файл с частотой его FPS (имитация камеры)
+    'adaptive_quality': False,  # Снижать качество при превышении бюджета времени на кадр
+    'frame_budget_ms': None,  # Бюджет на кадр (None - 1000 / FPS)
+    'quality_degradations': [  # Деградации в порядке включения
+        'skip_debug_render',
+        'skip_mask_encode',
+        'downscale_motion',
+        'skip_alternate_frames'
+    ],
+    'quality_window': 30,  # Окно скользящего среднего времени кадра
+    'quality_headroom': 0.75,  # Доля бюджета, ниже которой качество повышается
+    'motion_downscale': 0.5,  # Масштаб кадра для детекции движения при downscale_motion
+    'shared_ring_name': None,  # Имя кольца кадров в разделяемой памяти (None - не публиковать)
+    'shared_ring_slots': 8,  # Число слотов кольца
+    'shared_ring_max_detections': 64,  # Максимум детекций на кадр в кольце
+    'idle_skip': False,  # Пропускать обработку в паузах между розыгрышами
+    'idle_grid': (32, 18),  # Сетка уменьшенного кадра для детектора активности
+    'idle_threshold': 4.0,  # Порог изменения ячейки (уровни яркости)
+    'idle_frames': 15,  # Кадров без изменений до начала простоя
+    'idle_background_interval': 10,  # Обновлять фон каждый N-й кадр простоя
+    'background_engine': 'mog2',  # 'mog2' (BGR), 'mog2_gray', 'running_average', 'median'
+    'background_learning': 'continuous',  # 'continuous', 'freeze' или 'reduced' после прогрева
+    'background_warmup_frames': 100,  # Кадров прогрева модели фона
+    'background_reduced_factor': 0.1,  # Множитель скорости обучения для 'reduced'
+    'background_alpha': 0.02,  # Скорость обучения running_average
+    'background_median_samples': 15,  # Кадров в выборке median
+    'background_median_interval': 5,  # Интервал добавления кадров в выборку median
+    'clock_correction': None,  # JSON поправки часов (calibrate_clocks.py), None - без поправки
+    'color_prior': False,  # Оставлять в маске движения только пиксели цвета мяча
+    'color_prior_colors': ['orange', 'white'],  # Допустимые цвета мяча
+    'color_prior_ranges': {  # Диапазоны цветов в HSV (OpenCV: H 0-179)
+        'orange': [(5, 100, 120), (25, 255, 255)],
+        'white': [(0, 0, 170), (179, 50, 255)]
+    },
+    'color_prior_bits': 5,  # Бит на канал в таблице цветов (5 - 32768 ячеек)
+    'global_motion': False,  # Компенсировать сдвиг кадра (тряска камеры) перед frame differencing
+    'global_motion_scale': 0.25,  # Масштаб серого кадра для фазовой корреляции
+    'global_motion_min_shift': 0.5,  # Минимальный компенсируемый сдвиг, px
+    'global_motion_min_response': 0.1,  # Минимальный отклик фазовой корреляции
+    'max_foreground_ratio': 0.25,  # Доля переднего плана, выше которой кадр пропускается (None - без защиты)
+    'render_buffers': 3,  # Переиспользуемых буферов отладочного кадра (не меньше числа кадров у потребителей)
+    'checkpoint_dir': None,  # Каталог контрольных точек (None - без контрольных точек)
+    'checkpoint_interval': 9000,  # Кадров между контрольными точками (вывод делится на сегменты)
+    'resume': False,  # Продолжить с последней контрольной точки
+    'resume_warmup_frames': 100,  # Кадров перед контрольной точкой для восстановления модели фона
+    'video_decoder': 'opencv',  # 'opencv' (cv2.VideoCapture) или 'ffmpeg' (процесс ffmpeg, сырые кадры)
+    'ffmpeg_path': 'ffmpeg',  # Исполняемый файл ffmpeg (нет - используется cv2.VideoCapture)
+    'ffmpeg_pixel_format': 'gray',  # 'gray' (только детекция движения) или 'bgr24'
+    'ffmpeg_scale': None,  # Размер кадров (ширина, высота) на выходе ffmpeg (None - исходный)
+    'ffmpeg_threads': 0,  # Потоков декодера (0 - авто)
+    'ffmpeg_buffers': 4  # Буферов кадров (кадр действителен, пока не прочитаны следующие N - 1)
 }
\ No newline at end of file
@@ -8,5 +8,38 @@ DEFAULT_CONFIG = {
     'distance_min': 0.8,
     'distance_max': 2.45,
     'min_contour_area': 5,
-    'min_valid_depth_points': 10
+    'min_valid_depth_points': 10,
+    'output_format': 'csv',  # 'csv' или 'npy' (колоночный)
+    'sink_block_size': 4096,
+    'sink_flush_interval': 1.0,  # Сброс неполного блока детекций не реже (с)
+    'start_frame': None,  # Номер кадра, с которого начать обработку
+    'start_time': None,  # Или временная метка bag-файла (мс)
+    'frame_cache_dir': None,  # Каталог кэша кадров (см. build_frame_cache.py)
+    'build_frame_cache': False,  # Построить кэш кадров, если его нет
+    'camera_name': 'depth_cam',  # Имя камеры в метриках и реестре камер
+    'table': 'table',  # Стол (пара камер) в реестре камер
+    'display': True,  # Показывать окна OpenCV (False - headless)
+    'adaptive_quality': False,  # Снижать качество при превышении бюджета времени на кадр
+    'frame_budget_ms': None,  # Бюджет на кадр (None - 1000 / FPS)
+    'quality_degradations': [  # Деградации в порядке включения
+        'skip_debug_render',
+        'skip_mask_encode',
+        'skip_alternate_frames'
+    ],
+    'quality_window': 30,  # Окно скользящего среднего времени кадра
+    'quality_headroom': 0.75,  # Доля бюджета, ниже которой качество повышается
+    'shared_ring_name': None,  # Имя кольца кадров в разделяемой памяти (None - не публиковать)
+    'shared_ring_slots': 8,  # Число слотов кольца
+    'shared_ring_max_detections': 64,  # Максимум детекций на кадр в кольце
+    'idle_skip': False,  # Пропускать обработку в паузах между розыгрышами
+    'idle_grid': (32, 4),  # Сетка уменьшенной ROI глубины для детектора активности
+    'idle_threshold': 30.0,  # Порог изменения ячейки (единицы глубины)
+    'idle_sum_threshold': 2.0,  # Порог изменения средней глубины ROI (единицы глубины)
+    'idle_frames': 15,  # Кадров без изменений до начала простоя
+    'idle_background_interval': 10,  # Каждый N-й кадр простоя помечается для обновления фона
+    'clock_correction': None,  # JSON поправки часов (calibrate_clocks.py), None - без поправки
+    'render_buffers': 3,  # Переиспользуемых буферов отладочного кадра (не меньше числа кадров у потребителей)
+    'checkpoint_dir': None,  # Каталог контрольных точек (None - без контрольных точек)
+    'checkpoint_interval': 9000,  # Кадров между контрольными точками (вывод делится на сегменты)
+    'resume': False  # Продолжить с последней контрольной точки
 }
\ No newline at end of file
@@ -0,0 +1,139 @@
+import json
+import os
+import time
+import numpy as np
+from os import path
+from typing import Callable, List, Optional
+import logging
+
+from src.classes.default_cam.MotionDetector import MotionDetector
+from src.classes.general.FrameSource import FrameSource
+from src.helpers.benchmark.StageBenchmark import StageBenchmark
+from src.helpers.evaluation.GroundTruth import GroundTruth
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BackgroundBenchmark:
+    """
+    Сравнение моделей фона MotionDetector: время на кадр против качества маски.
+
+    Каждая комбинация (модель, расписание обучения) прогоняется по одному и
+    тому же источнику кадров. Время - медиана и p95 MotionDetector.process_frame.
+    Качество (после warmup кадров): доля переднего плана в кадре (шум), а при
+    наличии разметки - полнота (есть передний план в радиусе match_radius от
+    мяча) и доля переднего плана вне окрестности мяча.
+    """
+
+    LEARNING = ('continuous', 'freeze', 'reduced')
+
+    def __init__(self, engines: Optional[List[str]] = None, learning: Optional[List[str]] = None,
+                 warmup: int = 50, match_radius: int = 8, config: dict = None):
+        self.engines = engines or list(MotionDetector.ENGINES)
+        self.learning = learning or list(self.LEARNING)
+        self.warmup = warmup
+        self.match_radius = match_radius
+        self.config = config or {}
+        self.results: List[dict] = []
+
+    def run(self, source_factory: Callable[[], FrameSource],
+            ground_truth: Optional[GroundTruth] = None,
+            max_frames: Optional[int] = None) -> List[dict]:
+        """Прогон всех комбинаций по источнику (создается заново для каждой)"""
+        self.results = []
+        for engine in self.engines:
+            for learning in self.learning:
+                result = self._run_one(engine, learning, source_factory(), ground_truth, max_frames)
+                self.results.append(result)
+                recall = result['ball_recall']
+                logger.info(f"{engine:16s} {learning:10s}: median {result['median_ms']:.3f} ms, "
+                            f"передний план {result['foreground_ratio'] * 100:.3f}%"
+                            + (f", полнота {recall:.3f}" if recall is not None else ""))
+        return self.results
+
+    def _run_one(self, engine: str, learning: str, source: FrameSource,
+                 ground_truth: Optional[GroundTruth], max_frames: Optional[int]) -> dict:
+        """Прогон одной модели фона"""
+        detector = MotionDetector({**self.config, 'background_engine': engine,
+                                   'background_learning': learning})
+        source.initialize()
+
+        times, foreground, outside = [], [], []
+        hits = visible = 0
+        index = 0
+        try:
+            while max_frames is None or index < max_frames:
+                frames = source.get_frames()
+                if frames is None:
+                    break
+                frame = frames[1]
+
+                start = time.perf_counter()
+                mask = detector.process_frame(frame)
+                elapsed = time.perf_counter() - start
+
+                if index >= self.warmup:
+                    times.append(elapsed)
+                    foreground_mask = mask > 0
+                    foreground.append(np.count_nonzero(foreground_mask) / mask.size)
+
+                    target = ground_truth.position(index) if ground_truth is not None else None
+                    if target is not None:
+                        visible += 1
+                        hit, stray = self._score_mask(foreground_mask, target)
+                        hits += hit
+                        outside.append(stray)
+                    elif ground_truth is not None:
+                        outside.append(foreground[-1])
+                index += 1
+        finally:
+            source.stop()
+
+        times = np.array(times) if times else np.zeros(1)
+        return {
+            'engine': engine,
+            'learning': learning,
+            'frames': index,
+            'median_ms': float(np.median(times) * 1000),
+            'p95_ms': float(np.percentile(times, 95) * 1000),
+            'foreground_ratio': float(np.mean(foreground)) if foreground else 0.0,
+            'ball_recall': hits / visible if visible else None,
+            'false_foreground_ratio': float(np.mean(outside)) if outside else None
+        }
+
+    def _score_mask(self, foreground: np.ndarray, target: np.ndarray):
+        """Попадание в мяч и доля переднего плана вне его окрестности"""
+        height, width = foreground.shape
+        x, y = int(round(target[0])), int(round(target[1]))
+        r = self.match_radius
+        x0, x1 = max(0, x - r), min(width, x + r + 1)
+        y0, y1 = max(0, y - r), min(height, y + r + 1)
+
+        near = np.count_nonzero(foreground[y0:y1, x0:x1])
+        stray = (np.count_nonzero(foreground) - near) / foreground.size
+        return int(near > 0), stray
+
+    def save(self, output_path: str):
+        """Сохранение результатов в JSON"""
+        os.makedirs(path.dirname(path.abspath(output_path)), exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as file:
+            json.dump({'environment': StageBenchmark.environment(), 'results': self.results},
+                      file, indent=2)
+        logger.info(f"Сравнение моделей фона сохранено: {output_path}")
+
+    def format_table(self) -> str:
+        """Текстовая таблица результатов"""
+        fmt = lambda value, pattern: '-' if value is None else pattern.format(value)
+        lines = [f"{'модель':16s} {'обучение':10s} {'median ms':>9s} {'p95 ms':>8s} "
+                 f"{'фон %':>7s} {'полнота':>8s} {'ложный %':>9s}"]
+        for r in self.results:
+            false_ratio = r['false_foreground_ratio']
+            lines.append(
+                f"{r['engine']:16s} {r['learning']:10s} {r['median_ms']:9.3f} {r['p95_ms']:8.3f} "
+                f"{r['foreground_ratio'] * 100:7.3f} {fmt(r['ball_recall'], '{:8.3f}'):>8s} "
+                f"{fmt(None if false_ratio is None else false_ratio * 100, '{:9.3f}'):>9s}")
+        return '\n'.join(lines)
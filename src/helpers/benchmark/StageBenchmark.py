@@ -0,0 +1,267 @@
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+import cv2
+import numpy as np
+from datetime import datetime
+from os import path
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+from src.classes.default_cam.DetectionFilter import DetectionFilter
+from src.classes.default_cam.MotionDetector import MotionDetector
+from src.classes.default_cam.Tracker import Tracker
+from src.classes.depth_cam.DetectionProcessor import DetectionProcessor
+from src.classes.general.VideoWriterManager import VideoWriterManager
+from src.classes.general.data.CameraConfig import CameraConfig
+from src.classes.general.data.DetectionBatch import DetectionBatch
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Разрешения и количество объектов по умолчанию
+DEFAULT_RESOLUTIONS = [(640, 360), (848, 480), (1280, 720), (1920, 1080)]
+DEFAULT_BLOB_COUNTS = [1, 10, 50]
+
+
+class StageBenchmark:
+    """
+    Микро-бенчмарк отдельных стадий обработки на синтетических кадрах.
+
+    Для каждой стадии, разрешения и числа объектов измеряются медиана,
+    p95 и среднее время вызова, а также пиковый объем выделенной за вызов
+    памяти (tracemalloc, отдельный короткий проход, чтобы не искажать время).
+    """
+
+    STAGES = ('motion', 'filter', 'tracking', 'depth', 'writer')
+
+    def __init__(self, iterations: int = 100, warmup: int = 10, alloc_iterations: int = 10,
+                 seed: int = 0):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.alloc_iterations = alloc_iterations
+        self.seed = seed
+        self.results: List[dict] = []
+
+    # ---------- Синтетические данные ----------
+
+    def _blob_positions(self, width: int, height: int, blobs: int,
+                        frames: int) -> np.ndarray:
+        """Положения объектов, движущихся по прямым (frames, blobs, 2)"""
+        rng = np.random.default_rng(self.seed)
+        start = rng.uniform((20, 20), (width - 20, height - 20), size=(blobs, 2))
+        velocity = rng.uniform(-8, 8, size=(blobs, 2))
+        steps = np.arange(frames)[:, None, None]
+        positions = start[None] + velocity[None] * steps
+        # Отражение от границ кадра
+        size = np.array([width - 40, height - 40])
+        positions = np.abs((positions - 20) % (2 * size) - size)
+        return (size - positions + 20).astype(np.int32)
+
+    def _color_frames(self, width: int, height: int, blobs: int,
+                      frames: int = 16) -> List[np.ndarray]:
+        """Цветные кадры с движущимися объектами"""
+        background = np.full((height, width, 3), 70, dtype=np.uint8)
+        result = []
+        for points in self._blob_positions(width, height, blobs, frames):
+            frame = background.copy()
+            for x, y in points:
+                cv2.circle(frame, (int(x), int(y)), 5, (0, 140, 255), -1)
+            result.append(frame)
+        return result
+
+    def _mask_contours(self, width: int, height: int, blobs: int) -> List[np.ndarray]:
+        """Контуры бинарной маски с заданным числом объектов"""
+        mask = np.zeros((height, width), dtype=np.uint8)
+        for x, y in self._blob_positions(width, height, blobs, 1)[0]:
+            cv2.circle(mask, (int(x), int(y)), 5, 255, -1)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        return list(contours)
+
+    def _detection_batches(self, width: int, height: int, blobs: int,
+                           frames: int = 64) -> List[DetectionBatch]:
+        """Пакеты детекций движущихся объектов"""
+        batches = []
+        for points in self._blob_positions(width, height, blobs, frames):
+            batch = DetectionBatch(blobs)
+            for x, y in points.tolist():
+                batch.append(center=(x, y), box=(x - 5, y - 5, 11, 11), area=80.0,
+                             aspect_ratio=1.0, rect=((x, y), (10.0, 10.0), 0.0))
+            batches.append(batch)
+        return batches
+
+    def _depth_frames(self, width: int, height: int, blobs: int,
+                      frames: int = 8) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Пары (цвет, глубина в метрах) с объектами в диапазоне"""
+        result = []
+        for points in self._blob_positions(width, height, blobs, frames):
+            depth = np.full((height, width), 3.0, dtype=np.float64)
+            for x, y in points:
+                cv2.circle(depth, (int(x), int(y)), 5, 1.5, -1)
+            result.append((np.zeros((height, width, 3), dtype=np.uint8), depth))
+        return result
+
+    # ---------- Стадии ----------
+
+    def _stage_callable(self, stage: str, width: int, height: int,
+                        blobs: int, workdir: str) -> Tuple[Callable[[int], None], Callable[[], None]]:
+        """Функция одного вызова стадии и функция очистки"""
+        if stage == 'motion':
+            detector = MotionDetector()
+            frames = self._color_frames(width, height, blobs)
+            return (lambda i: detector.process_frame(frames[i % len(frames)])), (lambda: None)
+
+        if stage == 'filter':
+            detection_filter = DetectionFilter({'min_area': 1, 'max_area': 10 ** 6})
+            contours = self._mask_contours(width, height, blobs)
+            return (lambda i: detection_filter.filter_contours(contours)), (lambda: None)
+
+        if stage == 'tracking':
+            tracker = Tracker()
+            batches = self._detection_batches(width, height, blobs)
+            return (lambda i: tracker.update(batches[i % len(batches)])), (lambda: None)
+
+        if stage == 'depth':
+            processor = DetectionProcessor(0.8, 2.45, 5, 10)
+            frames = self._depth_frames(width, height, blobs)
+            roi = np.array([[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]],
+                           dtype=np.int32)
+
+            def call(i):
+                color, depth = frames[i % len(frames)]
+                processor.process(color, depth, roi, i, i * 33.3)
+            return call, (lambda: None)
+
+        if stage == 'writer':
+            writer = VideoWriterManager(
+                path.join(workdir, f'bench_{width}x{height}.mp4'),
+                path.join(workdir, f'bench_{width}x{height}_debug.mp4'),
+                CameraConfig(width=width, height=height, fps=30, depth_scale=0.0)
+            )
+            writer.initialize()
+            frames = self._color_frames(width, height, blobs, frames=4)
+            mask = np.zeros((height, width), dtype=np.uint8)
+            return (lambda i: writer.write(frames[i % len(frames)], mask)), writer.release
+
+        raise ValueError(f"Неизвестная стадия: {stage}")
+
+    def _measure(self, call: Callable[[int], None]) -> Dict[str, float]:
+        """Замер времени и выделений памяти"""
+        for i in range(self.warmup):
+            call(i)
+
+        times = np.empty(self.iterations, dtype=np.float64)
+        for i in range(self.iterations):
+            start = time.perf_counter()
+            call(i)
+            times[i] = time.perf_counter() - start
+
+        # Выделения памяти - отдельным проходом
+        tracemalloc.start()
+        peaks = np.empty(self.alloc_iterations, dtype=np.int64)
+        retained = 0
+        for i in range(self.alloc_iterations):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            call(i)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks[i] = peak - before
+            retained += current - before
+        tracemalloc.stop()
+
+        return {
+            'iterations': self.iterations,
+            'median_ms': float(np.median(times) * 1000),
+            'p95_ms': float(np.percentile(times, 95) * 1000),
+            'mean_ms': float(np.mean(times) * 1000),
+            'min_ms': float(np.min(times) * 1000),
+            'alloc_peak_bytes': int(np.median(peaks)) if len(peaks) else 0,
+            'retained_bytes_per_call': int(retained / max(self.alloc_iterations, 1))
+        }
+
+    def run(self, stages: Optional[List[str]] = None,
+            resolutions: Optional[List[Tuple[int, int]]] = None,
+            blob_counts: Optional[List[int]] = None) -> List[dict]:
+        """Запуск всех комбинаций стадий, разрешений и числа объектов"""
+        stages = stages or list(self.STAGES)
+        resolutions = resolutions or DEFAULT_RESOLUTIONS
+        blob_counts = blob_counts or DEFAULT_BLOB_COUNTS
+
+        self.results = []
+        with tempfile.TemporaryDirectory() as workdir:
+            for stage in stages:
+                for width, height in resolutions:
+                    for blobs in blob_counts:
+                        call, cleanup = self._stage_callable(stage, width, height, blobs, workdir)
+                        try:
+                            stats = self._measure(call)
+                        finally:
+                            cleanup()
+
+                        result = {'stage': stage, 'resolution': f'{width}x{height}',
+                                  'blobs': blobs, **stats}
+                        self.results.append(result)
+                        logger.info(f"{stage:9s} {width}x{height} blobs={blobs:3d}: "
+                                    f"median {stats['median_ms']:.3f} ms, p95 {stats['p95_ms']:.3f} ms, "
+                                    f"alloc peak {stats['alloc_peak_bytes']} B/call")
+        return self.results
+
+    @staticmethod
+    def environment() -> dict:
+        """Описание окружения для сравнения результатов"""
+        return {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'opencv': cv2.__version__
+        }
+
+    def save(self, output_path: str):
+        """Сохранение результатов в JSON"""
+        os.makedirs(path.dirname(path.abspath(output_path)), exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as file:
+            json.dump({'environment': self.environment(), 'results': self.results}, file, indent=2)
+        logger.info(f"Результаты бенчмарка сохранены: {output_path}")
+
+    @staticmethod
+    def compare(baseline_path: str, current_path: str, threshold: float = 0.1) -> List[dict]:
+        """
+        Сравнение двух файлов результатов по медиане.
+
+        Returns:
+            Список строк сравнения; regression=True, если медиана выросла
+            больше чем на threshold
+        """
+        with open(baseline_path, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+        with open(current_path, 'r', encoding='utf-8') as file:
+            current = json.load(file)['results']
+
+        key = lambda r: (r['stage'], r['resolution'], r['blobs'])
+        baseline_by_key = {key(r): r for r in baseline}
+
+        rows = []
+        for result in current:
+            reference = baseline_by_key.get(key(result))
+            if reference is None or reference['median_ms'] <= 0:
+                continue
+            ratio = result['median_ms'] / reference['median_ms']
+            rows.append({
+                'stage': result['stage'],
+                'resolution': result['resolution'],
+                'blobs': result['blobs'],
+                'baseline_ms': reference['median_ms'],
+                'current_ms': result['median_ms'],
+                'ratio': ratio,
+                'regression': ratio > 1 + threshold
+            })
+        return rows
@@ -0,0 +1,201 @@
+import json
+import os
+import time
+import numpy as np
+from os import path
+from typing import List, Optional
+import logging
+
+from src.helpers.evaluation.GroundTruth import GroundTruth
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class DetectionScore:
+    """Накопление совпадений предсказаний с разметкой по кадрам"""
+
+    def __init__(self, match_radius: float):
+        self.match_radius = match_radius
+        self.true_positives = 0
+        self.false_positives = 0
+        self.false_negatives = 0
+        self.errors: List[float] = []
+
+    def add_frame(self, predictions: np.ndarray, target: Optional[np.ndarray]):
+        """Жадное сопоставление ближайшего предсказания с мячом"""
+        predictions = np.asarray(predictions, dtype=np.float64).reshape(-1, 2)
+
+        if target is None:
+            self.false_positives += len(predictions)
+            return
+
+        if len(predictions) == 0:
+            self.false_negatives += 1
+            return
+
+        distances = np.linalg.norm(predictions - target, axis=1)
+        best = int(np.argmin(distances))
+        if distances[best] <= self.match_radius:
+            self.true_positives += 1
+            self.errors.append(float(distances[best]))
+            self.false_positives += len(predictions) - 1
+        else:
+            self.false_negatives += 1
+            self.false_positives += len(predictions)
+
+    def summary(self) -> dict:
+        tp, fp, fn = self.true_positives, self.false_positives, self.false_negatives
+        return {
+            'true_positives': tp,
+            'false_positives': fp,
+            'false_negatives': fn,
+            'precision': tp / (tp + fp) if tp + fp else None,
+            'recall': tp / (tp + fn) if tp + fn else None,
+            'localisation_error_mean_px': float(np.mean(self.errors)) if self.errors else None,
+            'localisation_error_p95_px': float(np.percentile(self.errors, 95)) if self.errors else None
+        }
+
+
+class Evaluator:
+    """
+    Оценка точности и скорости обеих цепочек обработки по эталонной разметке.
+
+    Процессоры запускаются без окон (config['display'] = False), по каждому
+    кадру предсказания сравниваются с разметкой. Для обычной камеры
+    оцениваются сырые детекции и активные траектории, для камеры глубины -
+    детекции и моменты касаний (начало серии кадров с детекциями).
+    """
+
+    def __init__(self, match_radius: float = 15.0, bounce_tolerance_ms: float = 100.0):
+        self.match_radius = match_radius
+        self.bounce_tolerance_ms = bounce_tolerance_ms
+
+    @staticmethod
+    def _run(processor, state) -> dict:
+        """Прогон процессора до конца источника с замером времени"""
+        processor.initialize()
+        frames = 0
+        start = time.perf_counter()
+        try:
+            while processor.process_frame(state):
+                frames += 1
+        finally:
+            elapsed = time.perf_counter() - start
+            processor.cleanup()
+        return {'frames': frames, 'seconds': elapsed,
+                'fps': frames / elapsed if elapsed > 0 else None}
+
+    @staticmethod
+    def tracked_points(trajectories: dict, min_speed: float, max_speed: float) -> np.ndarray:
+        """Последние точки траекторий, которые отрисовываются как мяч"""
+        tracked = [trajectory.last_point for trajectory in trajectories.values()
+                   if trajectory.is_active and trajectory.speeds
+                   and min_speed <= trajectory.average_speed <= max_speed]
+        return np.array(tracked, dtype=np.float64)
+
+    def evaluate_default_cam(self, processor, ground_truth: GroundTruth, state) -> dict:
+        """Оценка цепочки обычной камеры"""
+        detections_score = DetectionScore(self.match_radius)
+        tracks_score = DetectionScore(self.match_radius)
+        min_speed = processor.config['min_speed']
+        max_speed = processor.config['max_speed']
+
+        def on_frame(frame_number, timestamp, detections, trajectories):
+            target = ground_truth.position(frame_number)
+            detections_score.add_frame(detections.centers, target)
+
+            tracks_score.add_frame(self.tracked_points(trajectories, min_speed, max_speed), target)
+
+        processor.on_frame = on_frame
+        throughput = self._run(processor, state)
+
+        return {
+            'throughput': throughput,
+            'detections': detections_score.summary(),
+            'tracks': tracks_score.summary()
+        }
+
+    def evaluate_depth_cam(self, processor, ground_truth: GroundTruth, state) -> dict:
+        """Оценка цепочки камеры глубины"""
+        detections_score = DetectionScore(self.match_radius)
+        onsets: List[float] = []
+        previous_count = [0]
+
+        def on_frame(frame_number, timestamp, detections):
+            # Оцениваются все кадры: мяч в зоне камеры глубины без детекции - пропуск
+            target = ground_truth.position(frame_number, depth=True)
+            detections_score.add_frame(detections.centers, target)
+
+            count = len(detections)
+            if count and previous_count[0] == 0:
+                onsets.append(timestamp)
+            previous_count[0] = count
+
+        processor.on_frame = on_frame
+        throughput = self._run(processor, state)
+
+        return {
+            'throughput': throughput,
+            'detections': detections_score.summary(),
+            'bounces': self._score_bounces(ground_truth.bounce_timestamps, np.array(onsets))
+        }
+
+    def _score_bounces(self, reference: np.ndarray, detected: np.ndarray) -> dict:
+        """Сопоставление моментов касаний с допуском по времени"""
+        matched = np.zeros(len(detected), dtype=bool)
+        errors = []
+        for timestamp in reference:
+            if len(detected) == 0:
+                break
+            differences = np.abs(detected - timestamp)
+            differences[matched] = np.inf
+            best = int(np.argmin(differences))
+            if differences[best] <= self.bounce_tolerance_ms:
+                matched[best] = True
+                errors.append(float(detected[best] - timestamp))
+
+        hits = len(errors)
+        return {
+            'reference': int(len(reference)),
+            'detected': int(len(detected)),
+            'matched': hits,
+            'missed': int(len(reference) - hits),
+            'false': int(len(detected) - hits),
+            'recall': hits / len(reference) if len(reference) else None,
+            'precision': hits / len(detected) if len(detected) else None,
+            'timing_error_mean_ms': float(np.mean(np.abs(errors))) if errors else None,
+            'timing_error_bias_ms': float(np.mean(errors)) if errors else None
+        }
+
+    @staticmethod
+    def save(report: dict, output_path: str):
+        """Сохранение отчета в JSON"""
+        os.makedirs(path.dirname(path.abspath(output_path)), exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        logger.info(f"Отчет оценки сохранен: {output_path}")
+
+    @staticmethod
+    def format_report(report: dict) -> str:
+        """Текстовая сводка отчета"""
+        fmt = lambda value, pattern: '-' if value is None else pattern.format(value)
+        lines = ["=" * 50, "ОЦЕНКА КАЧЕСТВА И СКОРОСТИ"]
+        for camera, result in report.items():
+            throughput = result['throughput']
+            lines.append(f"[{camera}] кадров: {throughput['frames']}, FPS: {fmt(throughput['fps'], '{:.1f}')}")
+            for level in ('detections', 'tracks'):
+                if level in result:
+                    score = result[level]
+                    lines.append(
+                        f"  {level:10s} precision {fmt(score['precision'], '{:.3f}')} "
+                        f"recall {fmt(score['recall'], '{:.3f}')} "
+                        f"ошибка {fmt(score['localisation_error_mean_px'], '{:.1f}')} px")
+            if 'bounces' in result:
+                bounces = result['bounces']
+                lines.append(
+                    f"  касания    найдено {bounces['matched']}/{bounces['reference']}, "
+                    f"ложных {bounces['false']}, "
+                    f"ошибка времени {fmt(bounces['timing_error_mean_ms'], '{:.1f}')} ms")
+        return '\n'.join(lines)
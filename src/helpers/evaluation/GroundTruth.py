@@ -0,0 +1,59 @@
+import csv
+import numpy as np
+from os import path
+import logging
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class GroundTruth:
+    """
+    Эталонная разметка положения мяча.
+
+    CSV с колонками frame, timestamp, x, y, visible, bounce (одна строка на
+    кадр; bounce=1 - кадр касания стола) и необязательной depth_visible
+    (мяч в ROI и диапазоне расстояний камеры глубины; без колонки берется
+    visible). Такой файл пишет SyntheticSource.write_ground_truth.
+    """
+
+    def __init__(self, csv_path: str):
+        self.csv_path = csv_path
+
+        frames, timestamps, xs, ys, visible, bounces, depth_visible = [], [], [], [], [], [], []
+        with open(csv_path, 'r', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                frames.append(int(row['frame']))
+                timestamps.append(float(row['timestamp']))
+                xs.append(float(row['x']) if row['x'] else np.nan)
+                ys.append(float(row['y']) if row['y'] else np.nan)
+                visible.append(int(row.get('visible') or 0) == 1)
+                bounces.append(int(row.get('bounce') or 0) == 1)
+                depth_flag = row.get('depth_visible')
+                depth_visible.append(visible[-1] if depth_flag in (None, '') else int(depth_flag) == 1)
+
+        order = np.argsort(frames)
+        self.frames = np.array(frames, dtype=np.int64)[order]
+        self.timestamps = np.array(timestamps, dtype=np.float64)[order]
+        self.positions = np.stack([np.array(xs)[order], np.array(ys)[order]], axis=1)
+        self.visible = np.array(visible, dtype=bool)[order]
+        self.bounces = np.array(bounces, dtype=bool)[order]
+        self.depth_visible = np.array(depth_visible, dtype=bool)[order]
+
+        # Быстрый доступ по номеру кадра
+        self._index = {frame: i for i, frame in enumerate(self.frames.tolist())}
+
+        logger.info(f"Разметка загружена: {path.basename(csv_path)} "
+                    f"({len(self.frames)} кадров, {int(self.bounces.sum())} касаний)")
+
+    def position(self, frame: int, depth: bool = False):
+        """Положение мяча на кадре или None, если мяча нет (depth - в зоне камеры глубины)"""
+        i = self._index.get(frame)
+        if i is None or not (self.depth_visible[i] if depth else self.visible[i]):
+            return None
+        return self.positions[i]
+
+    @property
+    def bounce_timestamps(self) -> np.ndarray:
+        return self.timestamps[self.bounces]
@@ -0,0 +1,183 @@
+import csv
+import itertools
+import os
+import time
+import cv2
+import numpy as np
+from multiprocessing import Pool
+from os import path
+from typing import Dict, List, Optional, Sequence
+import logging
+
+from src.classes.default_cam.DetectionFilter import DetectionFilter
+from src.classes.default_cam.MaskCache import MaskCache
+from src.classes.default_cam.Tracker import Tracker
+from src.helpers.evaluation.Evaluator import DetectionScore, Evaluator
+from src.helpers.evaluation.GroundTruth import GroundTruth
+from src.default_configs.default_cam_config import DEFAULT_CONFIG
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _replay(cache_dir: str, ground_truth_path: Optional[str], match_radius: float,
+            base_config: dict, param_sets: List[dict]) -> List[dict]:
+    """
+    Прогон DetectionFilter + Tracker по кэшу масок для набора параметров.
+
+    Маска кадра распаковывается и контуры ищутся один раз, затем подаются
+    всем наборам параметров части. Функция модульная - запускается в
+    процессах пула.
+    """
+    logging.getLogger('src.classes.default_cam.Tracker').setLevel(logging.WARNING)
+    packed, meta = MaskCache.load(cache_dir)
+    ground_truth = GroundTruth(ground_truth_path) if ground_truth_path else None
+
+    runs = []
+    for params in param_sets:
+        config = {**DEFAULT_CONFIG, **base_config, **params}
+        runs.append({
+            'params': params,
+            'config': config,
+            'filter': DetectionFilter(config),
+            'tracker': Tracker(config),
+            'detections': DetectionScore(match_radius),
+            'tracks': DetectionScore(match_radius),
+            'detection_count': 0,
+            'seconds': 0.0
+        })
+
+    for index in range(meta['frame_count']):
+        mask = MaskCache.unpack(packed[index], meta['width'])
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        target = ground_truth.position(index) if ground_truth is not None else None
+
+        for run in runs:
+            start = time.perf_counter()
+            detections = run['filter'].filter_contours(contours)
+            trajectories = run['tracker'].update(detections)
+            run['seconds'] += time.perf_counter() - start
+
+            run['detection_count'] += len(detections)
+            if ground_truth is not None:
+                config = run['config']
+                run['detections'].add_frame(detections.centers, target)
+                run['tracks'].add_frame(
+                    Evaluator.tracked_points(trajectories, config['min_speed'], config['max_speed']),
+                    target)
+
+    results = []
+    for run in runs:
+        result = {
+            **run['params'],
+            'detections_per_frame': run['detection_count'] / max(meta['frame_count'], 1),
+            'trajectories': run['tracker'].next_id,
+            'replay_ms_per_frame': 1000.0 * run['seconds'] / max(meta['frame_count'], 1)
+        }
+        if ground_truth is not None:
+            for level in ('detections', 'tracks'):
+                summary = run[level].summary()
+                result[f'{level}_precision'] = summary['precision']
+                result[f'{level}_recall'] = summary['recall']
+                result[f'{level}_error_px'] = summary['localisation_error_mean_px']
+            precision, recall = result['tracks_precision'], result['tracks_recall']
+            result['tracks_f1'] = (2 * precision * recall / (precision + recall)
+                                   if precision and recall else 0.0)
+        results.append(result)
+    return results
+
+
+class ParameterSweep:
+    """
+    Подбор параметров DetectionFilter и Tracker по кэшу масок (MaskCache).
+
+    Декодирование и MotionDetector не повторяются: каждый набор параметров
+    проигрывает только фильтр и трекер по сохраненным маскам. Наборы
+    делятся между процессами пула, каждый процесс читает кэш один раз на
+    свою часть наборов. С разметкой (GroundTruth) наборы оцениваются так
+    же, как в Evaluator.evaluate_default_cam.
+    """
+
+    # Параметры, которые имеет смысл перебирать по кэшу масок
+    SWEEP_KEYS = ('min_area', 'max_area', 'max_aspect_ratio', 'track_distance',
+                  'min_speed', 'max_speed', 'max_missed_frames')
+
+    def __init__(self, cache_dir: str, ground_truth_path: Optional[str] = None,
+                 match_radius: float = 15.0, base_config: dict = None):
+        self.cache_dir = cache_dir
+        self.ground_truth_path = ground_truth_path
+        self.match_radius = match_radius
+        self.base_config = dict(base_config or {})
+
+    @classmethod
+    def grid(cls, values: Dict[str, Sequence]) -> List[dict]:
+        """Все сочетания значений параметров"""
+        unknown = set(values) - set(cls.SWEEP_KEYS)
+        if unknown:
+            raise ValueError(f"Параметры не перебираются по кэшу масок: {sorted(unknown)}")
+        keys = list(values)
+        return [dict(zip(keys, combination))
+                for combination in itertools.product(*(values[key] for key in keys))]
+
+    def run(self, param_sets: List[dict], processes: Optional[int] = None) -> List[dict]:
+        """Прогон всех наборов; результаты в порядке param_sets"""
+        if not param_sets:
+            return []
+        processes = max(1, min(processes or os.cpu_count() or 1, len(param_sets)))
+        chunks = [param_sets[i::processes] for i in range(processes)]
+        arguments = [(self.cache_dir, self.ground_truth_path, self.match_radius,
+                      self.base_config, chunk) for chunk in chunks]
+
+        logger.info(f"Перебор параметров: {len(param_sets)} наборов, {processes} процессов")
+        start = time.perf_counter()
+        if processes == 1:
+            chunk_results = [_replay(*arguments[0])]
+        else:
+            with Pool(processes) as pool:
+                chunk_results = pool.starmap(_replay, arguments)
+        logger.info(f"Перебор завершен за {time.perf_counter() - start:.1f} с")
+
+        # Восстановление исходного порядка после раздачи по процессам
+        results = [None] * len(param_sets)
+        for i, chunk in enumerate(chunk_results):
+            results[i::processes] = chunk
+        return results
+
+    @staticmethod
+    def save(results: List[dict], output_path: str):
+        """Сохранение таблицы результатов в CSV"""
+        if not results:
+            return
+        os.makedirs(path.dirname(path.abspath(output_path)), exist_ok=True)
+        with open(output_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+        logger.info(f"Результаты перебора сохранены: {output_path}")
+
+    @staticmethod
+    def format_table(results: List[dict], sort_by: Optional[str] = None, limit: Optional[int] = None) -> str:
+        """Текстовая таблица сравнения наборов (лучшие сверху по sort_by)"""
+        if not results:
+            return "Нет результатов"
+        if sort_by:
+            results = sorted(results, key=lambda row: row[sort_by] if row[sort_by] is not None else -np.inf,
+                             reverse=True)
+        if limit:
+            results = results[:limit]
+
+        def fmt(value):
+            if value is None:
+                return '-'
+            if isinstance(value, float):
+                return f"{value:.3f}"
+            return str(value)
+
+        columns = list(results[0])
+        rows = [[fmt(row[column]) for column in columns] for row in results]
+        widths = [max(len(column), *(len(row[i]) for row in rows)) for i, column in enumerate(columns)]
+        lines = ["  ".join(column.rjust(width) for column, width in zip(columns, widths))]
+        lines.append("  ".join("-" * width for width in widths))
+        lines.extend("  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows)
+        return '\n'.join(lines)
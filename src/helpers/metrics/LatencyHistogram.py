@@ -0,0 +1,74 @@
+import math
+from typing import List, Optional
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек с фиксированными логарифмическими корзинами.
+
+    Запись значения - O(1): индекс корзины вычисляется по логарифму,
+    массив корзин не растет. Квантили оцениваются по верхней границе корзины.
+    """
+
+    __slots__ = ('min_seconds', 'growth', 'bounds', 'counts', 'count', 'total', 'max', '_log_growth')
+
+    def __init__(self, min_seconds: float = 1e-5, max_seconds: float = 10.0, growth: float = 1.25):
+        self.min_seconds = min_seconds
+        self.growth = growth
+        self._log_growth = math.log(growth)
+
+        bucket_count = int(math.ceil(math.log(max_seconds / min_seconds) / self._log_growth)) + 1
+        # Верхние границы корзин; последняя корзина - переполнение
+        self.bounds: List[float] = [min_seconds * growth ** i for i in range(bucket_count)] + [math.inf]
+        self.counts: List[int] = [0] * len(self.bounds)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """Добавление значения"""
+        if seconds <= self.min_seconds:
+            index = 0
+        else:
+            index = min(int(math.ceil(math.log(seconds / self.min_seconds) / self._log_growth)),
+                        len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Оценка квантиля (верхняя граница корзины)"""
+        if self.count == 0:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for bound, bucket in zip(self.bounds, self.counts):
+            cumulative += bucket
+            if cumulative >= target:
+                return min(bound, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self) -> dict:
+        """Сводка в миллисекундах"""
+        to_ms = lambda value: None if value is None else value * 1000
+        return {
+            'count': self.count,
+            'mean_ms': self.mean * 1000,
+            'p50_ms': to_ms(self.quantile(0.5)),
+            'p95_ms': to_ms(self.quantile(0.95)),
+            'p99_ms': to_ms(self.quantile(0.99)),
+            'max_ms': self.max * 1000
+        }
+
+    def reset(self):
+        """Очистка гистограммы"""
+        self.counts = [0] * len(self.bounds)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
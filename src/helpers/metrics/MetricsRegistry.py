@@ -0,0 +1,140 @@
+import json
+import math
+import os
+import time
+from os import path
+from threading import Lock, Thread, Event
+from typing import Dict, Optional
+import logging
+
+from src.helpers.metrics.StageTimers import StageTimers
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class MetricsRegistry:
+    """
+    Потокобезопасный синглтон с таймерами стадий всех камер.
+
+    Периодический экспорт: строка JSON в metrics.jsonl (интервальные
+    p50/p95/p99 по стадиям и камерам) и текстовый файл Prometheus
+    metrics.prom (накопительные гистограммы и квантили).
+    """
+
+    _instance = None
+    _lock = Lock()
+
+    METRIC_NAME = 'balldetect_stage_latency_seconds'
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        """Приватная инициализация экземпляра"""
+        self._timers: Dict[str, StageTimers] = {}
+        self._timers_lock = Lock()
+        self._exporter: Optional[Thread] = None
+        self._stop_event = Event()
+        self.metrics_dir: Optional[str] = None
+        self.interval = 10.0
+
+    def timers(self, camera: str) -> StageTimers:
+        """Таймеры стадий камеры (создаются при первом обращении)"""
+        with self._timers_lock:
+            timers = self._timers.get(camera)
+            if timers is None:
+                timers = StageTimers(camera)
+                self._timers[camera] = timers
+            return timers
+
+    def snapshot(self, reset_interval: bool = True) -> dict:
+        """Сводка по всем камерам"""
+        with self._timers_lock:
+            timers = list(self._timers.values())
+        return {t.camera: t.snapshot(reset_interval) for t in timers}
+
+    # ---------- Экспорт ----------
+
+    def start_exporter(self, metrics_dir: str, interval: float = 10.0):
+        """Запуск фонового экспорта"""
+        if self._exporter is not None:
+            return
+
+        self.metrics_dir = metrics_dir
+        self.interval = interval
+        os.makedirs(metrics_dir, exist_ok=True)
+
+        self._stop_event.clear()
+        self._exporter = Thread(target=self._export_loop, name='MetricsExporter', daemon=True)
+        self._exporter.start()
+        logger.info(f"Экспорт метрик запущен: {metrics_dir} (каждые {interval:.0f} с)")
+
+    def stop_exporter(self):
+        """Остановка экспорта с финальной записью"""
+        if self._exporter is None:
+            return
+        self._stop_event.set()
+        self._exporter.join()
+        self._exporter = None
+        self.export()
+
+    def _export_loop(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.export()
+            except OSError as e:
+                logger.error(f"Ошибка экспорта метрик: {e}")
+
+    def export(self):
+        """Однократный экспорт снимка метрик"""
+        if not self.metrics_dir:
+            return
+
+        snapshot = self.snapshot(reset_interval=True)
+
+        # JSON lines: интервальная статистика
+        line = {'time': time.time(), 'cameras': {
+            camera: {stage: data['interval'] for stage, data in stages.items()}
+            for camera, stages in snapshot.items()
+        }}
+        with open(path.join(self.metrics_dir, 'metrics.jsonl'), 'a', encoding='utf-8') as file:
+            file.write(json.dumps(line) + '\n')
+
+        # Prometheus: атомарная перезапись файла
+        prom_path = path.join(self.metrics_dir, 'metrics.prom')
+        with open(prom_path + '.tmp', 'w', encoding='utf-8') as file:
+            file.write(self._format_prometheus(snapshot))
+        os.replace(prom_path + '.tmp', prom_path)
+
+    def _format_prometheus(self, snapshot: dict) -> str:
+        """Текстовый формат Prometheus"""
+        name = self.METRIC_NAME
+        lines = [f"# HELP {name} Длительность стадий обработки кадра",
+                 f"# TYPE {name} histogram"]
+        quantile_lines = [f"# HELP {name}_quantile Квантили длительности стадий (с запуска)",
+                          f"# TYPE {name}_quantile gauge"]
+
+        for camera, stages in snapshot.items():
+            for stage, data in stages.items():
+                labels = f'camera="{camera}",stage="{stage}"'
+                cumulative = 0
+                for bound, count in data['buckets']:
+                    cumulative += count
+                    le = '+Inf' if math.isinf(bound) else f'{bound:.6g}'
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{labels}}} {data["sum"]:.6f}')
+                lines.append(f'{name}_count{{{labels}}} {data["count"]}')
+
+                for quantile in ('p50', 'p95', 'p99'):
+                    value = data['total'][f'{quantile}_ms']
+                    if value is not None:
+                        quantile_lines.append(
+                            f'{name}_quantile{{{labels},quantile="0.{quantile[1:]}"}} {value / 1000:.6f}')
+
+        return '\n'.join(lines + quantile_lines) + '\n'
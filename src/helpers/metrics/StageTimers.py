@@ -0,0 +1,85 @@
+import time
+from threading import Lock
+from typing import Dict, Tuple
+
+from src.helpers.metrics.LatencyHistogram import LatencyHistogram
+
+
+class StageTimers:
+    """
+    Таймеры стадий одной камеры.
+
+    Используется последовательная разметка: begin_frame() в начале кадра,
+    lap('stage') после каждой стадии (записывается время с предыдущей
+    отметки), end_frame() записывает полное время кадра в стадию 'frame'.
+    Для каждой стадии ведутся две гистограммы: накопительная (с запуска)
+    и интервальная (сбрасывается при экспорте).
+    """
+
+    FRAME_STAGE = 'frame'
+
+    def __init__(self, camera: str):
+        self.camera = camera
+        self._lock = Lock()
+        self._histograms: Dict[str, Tuple[LatencyHistogram, LatencyHistogram]] = {}
+        self._frame_start = 0.0
+        self._last_mark = 0.0
+
+    def _get(self, stage: str) -> Tuple[LatencyHistogram, LatencyHistogram]:
+        histograms = self._histograms.get(stage)
+        if histograms is None:
+            histograms = (LatencyHistogram(), LatencyHistogram())
+            self._histograms[stage] = histograms
+        return histograms
+
+    def record(self, stage: str, seconds: float):
+        """Запись длительности стадии"""
+        with self._lock:
+            total, interval = self._get(stage)
+            total.record(seconds)
+            interval.record(seconds)
+
+    def begin_frame(self):
+        """Начало кадра"""
+        self._frame_start = self._last_mark = time.perf_counter()
+
+    def lap(self, stage: str) -> float:
+        """Завершение стадии: запись времени с предыдущей отметки"""
+        now = time.perf_counter()
+        elapsed = now - self._last_mark
+        self._last_mark = now
+        self.record(stage, elapsed)
+        return elapsed
+
+    def skip(self):
+        """Сдвиг отметки без записи (время не относится ни к одной стадии)"""
+        self._last_mark = time.perf_counter()
+
+    def end_frame(self) -> float:
+        """Завершение кадра: запись полного времени"""
+        elapsed = time.perf_counter() - self._frame_start
+        self.record(self.FRAME_STAGE, elapsed)
+        return elapsed
+
+    def last_interval_quantile(self, stage: str, q: float) -> float:
+        """Квантиль интервальной гистограммы стадии (секунды, 0 если нет данных)"""
+        with self._lock:
+            histograms = self._histograms.get(stage)
+            value = histograms[1].quantile(q) if histograms else None
+        return value or 0.0
+
+    def snapshot(self, reset_interval: bool = True) -> dict:
+        """Сводка по всем стадиям"""
+        with self._lock:
+            result = {}
+            for stage, (total, interval) in self._histograms.items():
+                result[stage] = {
+                    'total': total.snapshot(),
+                    'interval': interval.snapshot(),
+                    'buckets': list(zip(total.bounds, total.counts)),
+                    'sum': total.total,
+                    'count': total.count
+                }
+                if reset_interval:
+                    interval.reset()
+            return result
@@ -1,30 +1,156 @@
+from src.helpers.state.CameraRole import CameraRole
 from src.helpers.state.CameraState import CameraState
+from src.helpers.state.TableSession import TableSession
 from threading import Lock, Event
+from typing import Dict, List, Optional
 
 class CameraManager:
-    """Менеджер для управления состоянием камер"""
+    """
+    Реестр камер: состояние по идентификатору камеры, пары камер по столам.
 
-    def __init__(self):
-        self.depth_cam = CameraState(Event())
-        self.default_cam = CameraState(Event())
+    Блокировка реестра нужна только для регистрации. Словари заменяются
+    целиком (копия при записи), поэтому чтение реестра идет без блокировки,
+    а состояние каждой камеры защищено ее собственной блокировкой.
+    """
+
+    DEFAULT_TABLE = 'table'
+
+    def __init__(self, register_defaults: bool = True):
+        self._cameras: Dict[str, CameraState] = {}
+        self._tables: Dict[str, TableSession] = {}
         self._lock = Lock()
 
-        # Инициализируем события как установленные
-        self.depth_cam.resume()
-        self.default_cam.resume()
+        # Исходная пара камер одного стола
+        if register_defaults:
+            self.register('depth_cam', CameraRole.DEPTH)
+            self.register('default_cam', CameraRole.COLOR)
 
-    def pause_depth(self):
+    # ---------- Регистрация ----------
+
+    def register(self, camera_id: str, role: CameraRole,
+                 table: str = DEFAULT_TABLE) -> CameraState:
+        """Регистрация камеры (событие установлено - камера не на паузе)"""
+        role = CameraRole(role)
         with self._lock:
-            self.depth_cam.pause()
+            if camera_id in self._cameras:
+                raise ValueError(f"Камера уже зарегистрирована: {camera_id}")
 
-    def resume_depth(self):
+            session = self._tables.get(table)
+            if session is not None and session.camera(role) is not None:
+                raise ValueError(f"У стола {table} уже есть камера роли {role.value}: "
+                                 f"{session.camera(role)}")
+
+            camera = CameraState(Event(), camera_id=camera_id, role=role, table=table)
+            camera.resume()
+
+            cameras = dict(session.cameras) if session is not None else {}
+            cameras[role] = camera_id
+            self._tables = {**self._tables, table: TableSession(table, cameras)}
+            self._cameras = {**self._cameras, camera_id: camera}
+            return camera
+
+    def ensure(self, camera_id: str, role: CameraRole,
+               table: str = DEFAULT_TABLE) -> CameraState:
+        """
+        Состояние камеры; незарегистрированная камера регистрируется.
+
+        Уже зарегистрированная камера должна иметь ту же роль и стол,
+        иначе ValueError.
+        """
+        role = CameraRole(role)
+        camera = self._cameras.get(camera_id)
+        if camera is None:
+            try:
+                return self.register(camera_id, role, table)
+            except ValueError:
+                # Одновременная регистрация из другого потока
+                camera = self._cameras.get(camera_id)
+                if camera is None:
+                    raise
+
+        if camera.role != role or camera.table != table:
+            raise ValueError(f"Камера {camera_id} зарегистрирована как {camera.role.value} "
+                             f"стола {camera.table}, запрошено {role.value} стола {table}")
+        return camera
+
+    def unregister(self, camera_id: str):
+        """Удаление камеры из реестра и из ее стола"""
         with self._lock:
-            self.depth_cam.resume()
+            camera = self._cameras.get(camera_id)
+            if camera is None:
+                return
+            cameras = {k: v for k, v in self._cameras.items() if k != camera_id}
+
+            tables = dict(self._tables)
+            remaining = {role: other for role, other in tables[camera.table].cameras.items()
+                         if other != camera_id}
+            if remaining:
+                tables[camera.table] = TableSession(camera.table, remaining)
+            else:
+                del tables[camera.table]
+
+            self._cameras, self._tables = cameras, tables
+        # Ожидающий поток не должен зависнуть
+        camera.resume()
+
+    # ---------- Чтение реестра ----------
+
+    def get(self, camera_id: str) -> CameraState:
+        camera = self._cameras.get(camera_id)
+        if camera is None:
+            raise KeyError(f"Камера не зарегистрирована: {camera_id}")
+        return camera
+
+    def cameras(self, role: Optional[CameraRole] = None,
+                table: Optional[str] = None) -> List[CameraState]:
+        """Камеры с фильтром по роли и столу"""
+        return [camera for camera in self._cameras.values()
+                if (role is None or camera.role == role)
+                and (table is None or camera.table == table)]
+
+    def tables(self) -> List[TableSession]:
+        return list(self._tables.values())
+
+    def table(self, name: str) -> Optional[TableSession]:
+        return self._tables.get(name)
+
+    def partner(self, camera_id: str) -> Optional[CameraState]:
+        """Вторая камера того же стола (None - камера без пары)"""
+        camera = self._cameras.get(camera_id)
+        if camera is None:
+            return None
+        partner_id = self._tables[camera.table].partner(camera_id)
+        return self._cameras.get(partner_id) if partner_id is not None else None
+
+    # ---------- Управление ----------
+
+    def pause(self, camera_id: str):
+        self.get(camera_id).pause()
+
+    def resume(self, camera_id: str):
+        self.get(camera_id).resume()
+
+    def resume_all(self):
+        for camera in self._cameras.values():
+            camera.resume()
+
+    # Исходная пара камер
+    @property
+    def depth_cam(self) -> CameraState:
+        return self.get('depth_cam')
+
+    @property
+    def default_cam(self) -> CameraState:
+        return self.get('default_cam')
+
+    def pause_depth(self):
+        self.pause('depth_cam')
+
+    def resume_depth(self):
+        self.resume('depth_cam')
 
     def pause_default(self):
-        with self._lock:
-            self.default_cam.pause()
+        self.pause('default_cam')
 
     def resume_default(self):
-        with self._lock:
-            self.default_cam.resume()
\ No newline at end of file
+        self.resume('default_cam')
\ No newline at end of file
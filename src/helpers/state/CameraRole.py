@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class CameraRole(str, Enum):
+    """Роль камеры в паре стола"""
+    DEPTH = 'depth'  # RealSense: глубина, касания стола
+    COLOR = 'color'  # Обычная камера: движение, траектории
\ No newline at end of file
@@ -1,27 +1,49 @@
-from threading import Event
-from dataclasses import dataclass
+from threading import Event, Lock
+from dataclasses import dataclass, field
+
+from src.helpers.state.CameraRole import CameraRole
 
 @dataclass
 class CameraState:
-    """Состояние одной камеры"""
+    """
+    Состояние одной камеры.
+
+    У каждой камеры своя блокировка: потоки разных камер не ждут друг друга.
+    """
     event: Event
     timestamp: int = 0
     paused: bool = False
     is_touched: bool = False
+    camera_id: str = ''
+    role: CameraRole = CameraRole.COLOR
+    table: str = ''
+    lock: Lock = field(default_factory=Lock, repr=False, compare=False)
 
     def pause(self):
-        self.event.clear()
-        self.paused = True
+        with self.lock:
+            self.event.clear()
+            self.paused = True
 
     def resume(self):
-        self.event.set()
-        self.paused = False
+        with self.lock:
+            self.event.set()
+            self.paused = False
+
+    def set_timestamp(self, timestamp: int):
+        with self.lock:
+            self.timestamp = timestamp
+
+    def get_timestamp(self) -> int:
+        with self.lock:
+            return self.timestamp
 
     def set_touched(self, touched: bool):
-        self.is_touched = touched
+        with self.lock:
+            self.is_touched = touched
 
     def touched_state(self):
-        return self.is_touched
+        with self.lock:
+            return self.is_touched
 
     def is_set(self) -> bool:
         return self.event.is_set()
@@ -0,0 +1,67 @@
+import os
+import pickle
+from os import path
+from typing import Optional
+import logging
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class CheckpointManager:
+    """
+    Периодические контрольные точки процессора камеры.
+
+    Состояние (словарь процессора: позиция источника, трекер, смещения
+    выводов) пишется в <каталог>/<камера>.pkl каждые interval кадров.
+    Запись атомарная (временный файл и os.replace): при сбое во время
+    записи остается предыдущая контрольная точка.
+    """
+
+    VERSION = 1
+
+    def __init__(self, directory: str, camera_name: str, interval: int):
+        self.directory = directory
+        self.camera_name = camera_name
+        self.interval = interval
+        # Кадр последней контрольной точки (None - отсчет с первого кадра сессии)
+        self._last_frame: Optional[int] = None
+
+    @property
+    def checkpoint_path(self) -> str:
+        return path.join(self.directory, f"{self.camera_name}.pkl")
+
+    def due(self, frame_count: int) -> bool:
+        """Пора ли сохранять контрольную точку"""
+        if self._last_frame is None:
+            self._last_frame = frame_count
+        return frame_count - self._last_frame >= self.interval
+
+    def save(self, frame_count: int, state: dict):
+        """Сохранение состояния после frame_count кадров"""
+        os.makedirs(self.directory, exist_ok=True)
+        temporary_path = self.checkpoint_path + '.tmp'
+        with open(temporary_path, 'wb') as file:
+            pickle.dump({'version': self.VERSION, 'frame_count': frame_count, **state},
+                        file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self.checkpoint_path)
+
+        self._last_frame = frame_count
+        logger.info(f"Контрольная точка {self.camera_name}: кадр {frame_count}")
+
+    def load(self) -> Optional[dict]:
+        """Последняя контрольная точка или None"""
+        if not path.exists(self.checkpoint_path):
+            logger.warning(f"Контрольная точка не найдена: {self.checkpoint_path}")
+            return None
+
+        with open(self.checkpoint_path, 'rb') as file:
+            state = pickle.load(file)
+        if state.get('version') != self.VERSION:
+            logger.warning(f"Неподдерживаемая версия контрольной точки: {self.checkpoint_path}")
+            return None
+
+        self._last_frame = state['frame_count']
+        logger.info(f"Контрольная точка {self.camera_name} загружена: кадр {state['frame_count']}")
+        return state
\ No newline at end of file
@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from src.helpers.state.CameraRole import CameraRole
+
+
+@dataclass
+class TableSession:
+    """Камеры одного стола: не больше одной камеры каждой роли"""
+    name: str
+    cameras: Dict[CameraRole, str] = field(default_factory=dict)
+
+    def camera(self, role: CameraRole) -> Optional[str]:
+        """Идентификатор камеры с заданной ролью"""
+        return self.cameras.get(role)
+
+    def partner(self, camera_id: str) -> Optional[str]:
+        """Вторая камера пары (другой роли)"""
+        for other in self.cameras.values():
+            if other != camera_id:
+                return other
+        return None
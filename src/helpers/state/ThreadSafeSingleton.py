@@ -1,6 +1,8 @@
 from threading import Lock, Event
 from src.helpers.state.CameraManager import CameraManager
-from typing import List, Any
+from src.helpers.state.CameraRole import CameraRole
+from src.helpers.state.CameraState import CameraState
+from typing import List, Any, Optional
 
 class ThreadSafeSingleton:
     """Потокобезопасный синглтон с управлением камерами"""
@@ -34,53 +36,82 @@ class ThreadSafeSingleton:
         # Флаг инициализации
         self._initialized = True
 
-    # Делегированные методы для работы с камерами
+    # Реестр камер (произвольное число камер и столов)
+    def register_camera(self, camera_id: str, role: CameraRole,
+                        table: str = CameraManager.DEFAULT_TABLE) -> CameraState:
+        return self.cameras.ensure(camera_id, role, table)
+
+    def camera(self, camera_id: str) -> CameraState:
+        return self.cameras.get(camera_id)
+
+    def partner(self, camera_id: str) -> Optional[CameraState]:
+        return self.cameras.partner(camera_id)
+
+    def pause_cam(self, camera_id: str):
+        self.cameras.pause(camera_id)
+
+    def resume_cam(self, camera_id: str):
+        self.cameras.resume(camera_id)
+
+    def resume_all(self):
+        self.cameras.resume_all()
+
+    def get_event(self, camera_id: str) -> Event:
+        return self.cameras.get(camera_id).event
+
+    def set_timestamp(self, camera_id: str, timestamp: int):
+        self.cameras.get(camera_id).set_timestamp(timestamp)
+
+    def get_timestamp(self, camera_id: str) -> int:
+        return self.cameras.get(camera_id).get_timestamp()
+
+    def set_touched(self, camera_id: str, touched: bool):
+        self.cameras.get(camera_id).set_touched(touched)
+
+    def get_touched_state(self, camera_id: str) -> bool:
+        return self.cameras.get(camera_id).touched_state()
+
+    # Исходная пара камер (обертки для совместимости)
     # Глубинная камера
     def pause_depth_cam(self):
-        self.cameras.pause_depth()
+        self.pause_cam('depth_cam')
 
     def resume_depth_cam(self):
-        self.cameras.resume_depth()
+        self.resume_cam('depth_cam')
 
     def get_event_depth_cam(self) -> Event:
-        return self.cameras.depth_cam.event
+        return self.get_event('depth_cam')
 
     def get_paused_depth_cam(self) -> bool:
-        return self.cameras.depth_cam.paused
+        return self.camera('depth_cam').paused
 
     def set_timestamp_depth_cam(self, timestamp: int):
-        with self.cameras._lock:
-            self.cameras.depth_cam.timestamp = timestamp
+        self.set_timestamp('depth_cam', timestamp)
 
     def get_timestamp_depth_cam(self) -> int:
-        with self.cameras._lock:
-            return self.cameras.depth_cam.timestamp
+        return self.get_timestamp('depth_cam')
 
     # Обычная камера
     def pause_default_cam(self):
-        self.cameras.pause_default()
+        self.pause_cam('default_cam')
 
     def resume_default_cam(self):
-        self.cameras.resume_default()
+        self.resume_cam('default_cam')
 
     def get_event_default_cam(self) -> Event:
-        return self.cameras.default_cam.event
+        return self.get_event('default_cam')
 
     def get_paused_default_cam(self) -> bool:
-        return self.cameras.default_cam.paused
+        return self.camera('default_cam').paused
 
     def set_timestamp_default_cam(self, timestamp: int):
-        with self.cameras._lock:
-            self.cameras.default_cam.timestamp = timestamp
+        self.set_timestamp('default_cam', timestamp)
 
     def get_timestamp_default_cam(self) -> int:
-        with self.cameras._lock:
-            return self.cameras.default_cam.timestamp
+        return self.get_timestamp('default_cam')
 
     def set_touched_depth_cam(self, touched: bool):
-        with self.cameras._lock:
-            self.cameras.depth_cam.set_touched(touched)
+        self.set_touched('depth_cam', touched)
 
     def get_touched_state_depth_cam(self) -> bool:
-        with self.cameras._lock:
-            return self.cameras.depth_cam.touched_state
\ No newline at end of file
+        return self.get_touched_state('depth_cam')
\ No newline at end of file
@@ -0,0 +1,49 @@
+import json
+import os
+from dataclasses import dataclass, field, asdict
+from os import path
+from typing import List
+import logging
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClockCorrection:
+    """
+    Поправка часов одной камеры к часам опорной камеры.
+
+    Для камеры corrected: t_ref = t + offset_ms + drift * (t - reference_time_ms).
+    Для опорной камеры (reference) поправка тождественная.
+    """
+    reference: str = 'depth_cam'
+    corrected: str = 'default_cam'
+    offset_ms: float = 0.0
+    drift: float = 0.0  # мс на мс (1e-6 = 1 ppm)
+    reference_time_ms: float = 0.0
+    # Оценки по сегментам: [время сегмента, сдвиг, уверенность]
+    segments: List[List[float]] = field(default_factory=list)
+
+    def apply(self, camera: str, timestamp: float) -> float:
+        """Временная метка камеры в часах опорной камеры"""
+        if camera != self.corrected:
+            return timestamp
+        return timestamp + self.offset_ms + self.drift * (timestamp - self.reference_time_ms)
+
+    def save(self, json_path: str):
+        """Сохранение поправки в JSON"""
+        os.makedirs(path.dirname(path.abspath(json_path)), exist_ok=True)
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump(asdict(self), file, indent=2)
+        logger.info(f"Поправка часов сохранена: {json_path}")
+
+    @classmethod
+    def load(cls, json_path: str) -> 'ClockCorrection':
+        """Загрузка поправки из JSON"""
+        with open(json_path, 'r', encoding='utf-8') as file:
+            correction = cls(**json.load(file))
+        logger.info(f"Поправка часов {correction.corrected} -> {correction.reference}: "
+                    f"сдвиг {correction.offset_ms:.1f} ms, дрейф {correction.drift * 1e6:.1f} ppm")
+        return correction
@@ -0,0 +1,233 @@
+import cv2
+import numpy as np
+from os import path
+from typing import Optional, Tuple
+import logging
+
+from src.classes.default_cam.MotionDetector import MotionDetector
+from src.classes.default_cam.TimestampReader import TimestampReader
+from src.classes.general.FrameSource import FrameSource
+from src.helpers.sync.ClockCorrection import ClockCorrection
+
+parent_dir = path.dirname(path.abspath(__file__))
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (временные метки мс, энергия движения) - по одному значению на кадр
+EnergySignal = Tuple[np.ndarray, np.ndarray]
+
+
+class ClockOffsetEstimator:
+    """
+    Оценка сдвига и линейного дрейфа часов между камерами.
+
+    Для каждого потока строится дешевый сигнал «энергии движения» на кадр:
+    для обычной камеры - площадь маски MotionDetector, для камеры глубины -
+    число пикселей ROI в слое дальностей [distance_min, distance_max].
+    Сигналы переводятся на общую равномерную сетку, нормируются и
+    сравниваются взаимной корреляцией через FFT: по всей записи (общий
+    сдвиг) и по сегментам одним векторным проходом (двумерный rfft).
+    Сдвиги сегментов аппроксимируются прямой - сдвиг и дрейф; дрейф
+    учитывается, только если он больше drift_sigma своих стандартных
+    ошибок (иначе сдвиг - среднее по сегментам, дрейф 0).
+    """
+
+    def __init__(self, step_ms: float = 5.0, max_lag_ms: float = 2000.0,
+                 segment_ms: float = 30000.0, smooth_ms: float = 1000.0,
+                 min_confidence: float = 0.3, drift_sigma: float = 3.0):
+        self.step_ms = step_ms
+        self.max_lag_ms = max_lag_ms
+        self.segment_ms = segment_ms
+        self.smooth_ms = smooth_ms
+        self.min_confidence = min_confidence
+        self.drift_sigma = drift_sigma
+
+    # ---------- Сигналы ----------
+
+    @staticmethod
+    def motion_energy(source: FrameSource, config: dict = None, scale: float = 0.5,
+                      timestamps_csv: Optional[str] = None) -> EnergySignal:
+        """Площадь маски движения на кадр (кадр уменьшается для скорости)"""
+        detector = MotionDetector(config)
+        timestamp_reader = TimestampReader(timestamps_csv) if timestamps_csv else None
+        source.initialize()
+
+        timestamps, energy = [], []
+        try:
+            while True:
+                frames = source.get_frames()
+                if frames is None:
+                    break
+                _, frame, timestamp = frames
+                if timestamp_reader is not None and timestamp_reader.timestamps:
+                    timestamp = timestamp_reader.get_timestamp(len(timestamps))
+                small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                timestamps.append(timestamp)
+                energy.append(cv2.countNonZero(detector.process_frame(small)))
+        finally:
+            source.stop()
+
+        logger.info(f"Энергия движения обычной камеры: {len(energy)} кадров")
+        return np.array(timestamps, dtype=np.float64), np.array(energy, dtype=np.float64)
+
+    @staticmethod
+    def depth_slab_energy(source: FrameSource, distance_min: float, distance_max: float,
+                          roi_polygon: Optional[np.ndarray] = None) -> EnergySignal:
+        """
+        Число пикселей в слое дальностей на кадр (во всем кадре или в ROI).
+
+        Считается объединение слоя текущего и предыдущего кадра: маска
+        движения обычной камеры (frame differencing по трем кадрам) содержит
+        объект и в текущем, и в предыдущем положении, т.е. запаздывает на
+        полкадра. Без такого же отклика у сигнала глубины сдвиг оценивается
+        с ошибкой около половины периода кадров.
+        """
+        camera_config = source.initialize()
+        low = int(distance_min / camera_config.depth_scale)
+        high = int(distance_max / camera_config.depth_scale)
+
+        x, y, w, h = 0, 0, camera_config.width, camera_config.height
+        roi_mask = None
+        if roi_polygon is not None:
+            x, y, w, h = cv2.boundingRect(roi_polygon)
+            roi_mask = np.zeros((h, w), dtype=np.uint8)
+            cv2.fillPoly(roi_mask, [roi_polygon - [x, y]], 255)
+
+        timestamps, energy = [], []
+        previous = None
+        try:
+            while True:
+                frames = source.get_frames()
+                if frames is None:
+                    break
+                depth, _, timestamp = frames
+                if depth is None:
+                    continue
+                slab = cv2.inRange(depth[y:y + h, x:x + w], low, high)
+                if roi_mask is not None:
+                    cv2.bitwise_and(slab, roi_mask, dst=slab)
+                union = slab if previous is None else cv2.bitwise_or(slab, previous)
+                previous = slab
+                timestamps.append(timestamp)
+                energy.append(cv2.countNonZero(union))
+        finally:
+            source.stop()
+
+        logger.info(f"Энергия движения камеры глубины: {len(energy)} кадров")
+        return np.array(timestamps, dtype=np.float64), np.array(energy, dtype=np.float64)
+
+    # ---------- Оценка ----------
+
+    def _resample(self, signal: EnergySignal, grid: np.ndarray) -> np.ndarray:
+        """Равномерная сетка, удаление медленного тренда, нормировка"""
+        timestamps, energy = signal
+        # Логарифм: выбросы (прогрев модели фона, засветки) не доминируют
+        values = np.interp(grid, timestamps, np.log1p(energy), left=np.nan, right=np.nan)
+        valid = ~np.isnan(values)
+        values[~valid] = 0.0
+
+        # Высокочастотная часть: вычитание скользящего среднего
+        window = max(1, int(self.smooth_ms / self.step_ms))
+        kernel = np.ones(window) / window
+        values = values - np.convolve(values, kernel, mode='same')
+        values[~valid] = 0.0
+
+        std = values[valid].std() if valid.any() else 0.0
+        return values / std if std > 0 else values
+
+    @staticmethod
+    def _correlate(reference: np.ndarray, corrected: np.ndarray, max_lag: int) -> np.ndarray:
+        """
+        Взаимная корреляция по последней оси через FFT.
+
+        Returns:
+            Значения для сдвигов -max_lag..max_lag (положительный сдвиг -
+            события в reference позже, чем в corrected)
+        """
+        length = reference.shape[-1]
+        n = 1 << int(np.ceil(np.log2(length + max_lag + 1)))
+        spectrum = np.fft.rfft(reference, n) * np.conj(np.fft.rfft(corrected, n))
+        correlation = np.fft.irfft(spectrum, n)
+        return np.concatenate([correlation[..., n - max_lag:], correlation[..., :max_lag + 1]], axis=-1)
+
+    @staticmethod
+    def _peak(correlation: np.ndarray, max_lag: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Положение максимума с параболическим уточнением (в шагах сетки) и его величина"""
+        index = np.argmax(correlation, axis=-1)
+        inner = np.clip(index, 1, correlation.shape[-1] - 2)
+        take = lambda offset: np.take_along_axis(correlation, (inner + offset)[..., None], -1)[..., 0]
+        left, center, right = take(-1), take(0), take(1)
+        denominator = left - 2 * center + right
+        shift = np.where(denominator != 0, 0.5 * (left - right) / np.where(denominator != 0, denominator, 1), 0.0)
+        shift = np.where(index == inner, shift, 0.0)
+        return index - max_lag + shift, np.take_along_axis(correlation, index[..., None], -1)[..., 0]
+
+    def estimate(self, reference: EnergySignal, corrected: EnergySignal,
+                 reference_name: str = 'depth_cam', corrected_name: str = 'default_cam') -> ClockCorrection:
+        """Оценка поправки часов corrected -> reference"""
+        start = min(reference[0][0], corrected[0][0])
+        end = max(reference[0][-1], corrected[0][-1])
+        grid = np.arange(start, end + self.step_ms, self.step_ms)
+        max_lag = int(self.max_lag_ms / self.step_ms)
+
+        x_reference = self._resample(reference, grid)
+        x_corrected = self._resample(corrected, grid)
+
+        # Общий сдвиг по всей записи
+        lag, peak = self._peak(self._correlate(x_reference, x_corrected, max_lag), max_lag)
+        norm = np.sqrt((x_reference ** 2).sum() * (x_corrected ** 2).sum())
+        global_offset = float(lag) * self.step_ms
+        logger.info(f"Общий сдвиг часов: {global_offset:.1f} ms "
+                    f"(уверенность {peak / norm if norm > 0 else 0.0:.2f})")
+
+        # Сегменты: окна сетки, все сразу (двумерный rfft)
+        segment = int(self.segment_ms / self.step_ms)
+        starts = np.arange(0, len(grid) - segment + 1, segment // 2) if len(grid) >= segment else np.array([0])
+        segment = min(segment, len(grid))
+        windows = starts[:, None] + np.arange(segment)[None, :]
+        segments_reference = x_reference[windows]
+        segments_corrected = x_corrected[windows]
+
+        lags, peaks = self._peak(self._correlate(segments_reference, segments_corrected, max_lag), max_lag)
+        energy = np.sqrt((segments_reference ** 2).sum(axis=1) * (segments_corrected ** 2).sum(axis=1))
+        confidence = np.where(energy > 0, peaks / np.where(energy > 0, energy, 1), 0.0)
+        centers = grid[starts + segment // 2]
+        offsets = lags * self.step_ms
+
+        correction = ClockCorrection(reference=reference_name, corrected=corrected_name,
+                                     offset_ms=global_offset, reference_time_ms=float(centers.mean()))
+        correction.segments = [[float(t), float(o), float(c)]
+                               for t, o, c in zip(centers, offsets, confidence)]
+
+        # Линейная аппроксимация надежных сегментов
+        good = confidence >= self.min_confidence
+        count = np.count_nonzero(good)
+        if count >= 2:
+            times = centers[good]
+            weights = confidence[good]
+            reference_time = float(np.average(times, weights=weights))
+            correction.offset_ms = float(np.average(offsets[good], weights=weights))
+            correction.reference_time_ms = reference_time
+
+            # Ошибка наклона по разбросу сегментов (нужно не меньше 4 точек)
+            if count >= 4:
+                (drift, offset), covariance = np.polyfit(times - reference_time, offsets[good], 1,
+                                                         w=weights, cov=True)
+                drift_error = float(np.sqrt(covariance[0, 0]))
+                if abs(drift) > self.drift_sigma * drift_error:
+                    correction.offset_ms = float(offset)
+                    correction.drift = float(drift)
+                else:
+                    logger.info(f"Дрейф {drift * 1e6:.1f} ± {drift_error * 1e6:.1f} ppm "
+                                f"не отличается от нуля, не учитывается")
+            else:
+                logger.warning(f"Надежных сегментов: {count}, дрейф не оценивается")
+        else:
+            logger.warning(f"Надежных сегментов: {count}, дрейф не оценивается")
+
+        logger.info(f"Поправка часов: сдвиг {correction.offset_ms:.1f} ms, "
+                    f"дрейф {correction.drift * 1e6:.1f} ppm "
+                    f"({count}/{len(good)} сегментов)")
+        return correction
@@ -0,0 +1,87 @@
+import argparse
+import json
+import logging
+import tempfile
+from os import path
+
+from src.classes.default_cam.FFmpegVideoSource import FFmpegVideoSource
+from src.classes.default_cam.MaskCache import MaskCache
+from src.classes.default_cam.VideoProcessor import VideoProcessor
+from src.classes.general.SyntheticSource import SyntheticSource
+from src.helpers.evaluation.ParameterSweep import ParameterSweep
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def parse_param(text: str):
+    """'min_area=10,15,20' -> ('min_area', [10, 15, 20])"""
+    key, _, values = text.partition('=')
+    if not values:
+        raise argparse.ArgumentTypeError(f"Ожидается имя=значение1,значение2,...: {text}")
+    return key.strip(), [json.loads(value) for value in values.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Перебор параметров DetectionFilter/Tracker по кэшу масок движения")
+    parser.add_argument('--video', help="Видео обычной камеры")
+    parser.add_argument('--synthetic', type=int, default=0, metavar='FRAMES',
+                        help="Синтетическое видео (разметка генерируется)")
+    parser.add_argument('--ground-truth', help="Разметка для видео (CSV), без нее - только счетчики")
+    parser.add_argument('--param', type=parse_param, action='append', default=[],
+                        metavar='NAME=V1,V2', help=f"Значения параметра; один из {ParameterSweep.SWEEP_KEYS}")
+    parser.add_argument('--config', help="JSON с параметрами конфигурации (стадия движения и база)")
+    parser.add_argument('--decoder', choices=('opencv', 'ffmpeg'), default='opencv',
+                        help="Декодер видео для построения масок (ffmpeg - серые кадры без cvtColor)")
+    parser.add_argument('--cache-dir', default='data/cache/masks', help="Корневой каталог кэша масок")
+    parser.add_argument('--processes', type=int, default=None, help="Число процессов (по умолчанию - все ядра)")
+    parser.add_argument('--match-radius', type=float, default=15.0, help="Радиус совпадения, px")
+    parser.add_argument('--sort', default=None, help="Колонка сортировки (по умолчанию tracks_f1 при разметке)")
+    parser.add_argument('--top', type=int, default=20, help="Строк в таблице")
+    parser.add_argument('--output', default='data/output/sweep/results.csv')
+    args = parser.parse_args()
+
+    if not args.video and not args.synthetic:
+        parser.error("Укажите --video или --synthetic")
+    if not args.param:
+        parser.error("Укажите хотя бы один --param")
+
+    config = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as file:
+            config = json.load(file)
+
+    param_sets = ParameterSweep.grid(dict(args.param))
+    cache = MaskCache(args.cache_dir)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        ground_truth = args.ground_truth
+        if args.synthetic:
+            source = SyntheticSource(frame_total=args.synthetic)
+            source_key = f"synthetic_{args.synthetic}_{source.seed}"
+            ground_truth = path.join(workdir, 'ground_truth.csv')
+            source.write_ground_truth(ground_truth)
+        else:
+            if args.decoder == 'ffmpeg':
+                source = FFmpegVideoSource.create(args.video, pixel_format='gray')
+            else:
+                source = VideoProcessor(args.video)
+            source_key = cache.video_key(args.video)
+            # Маски по серым кадрам отличаются от масок по BGR (модель фона mog2)
+            if isinstance(source, FFmpegVideoSource):
+                source_key += '_gray'
+
+        # Маски строятся один раз на видео и параметры движения
+        cache_dir = cache.build(source, source_key, config)
+
+        sweep = ParameterSweep(cache_dir, ground_truth, args.match_radius, config)
+        results = sweep.run(param_sets, args.processes)
+
+    ParameterSweep.save(results, args.output)
+    sort_by = args.sort or ('tracks_f1' if ground_truth else None)
+    print(ParameterSweep.format_table(results, sort_by, args.top))
+
+
+if __name__ == '__main__':
+    main()